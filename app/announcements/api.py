@@ -0,0 +1,216 @@
+# app/announcements/api.py
+"""
+Structured announcement feeds (JSON APIs and RSS) — the AnnouncementAdapter
+implementations the reconciler prefers over HTML scraping.
+
+Each poll walks the newest-first listing announcements page by page
+(cursor or page number) and stops at the first item not newer than the
+previous poll's high-water mark, so steady-state polling costs one request.
+The first poll backfills ANN_BACKFILL_PAGES pages.
+"""
+import asyncio
+import calendar
+import os
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from app.announcements.common import SeenIds, guess_symbol, is_listing, markets, ms_to_dt
+from app.exchanges.base import Announcement
+from app.ratelimit import budget
+from app.utils.logging import logger
+
+ANN_BACKFILL_PAGES = int(os.getenv("ANN_BACKFILL_PAGES", "1"))
+ANN_MAX_PAGES = int(os.getenv("ANN_MAX_PAGES", "5"))
+ANN_GIVE_UP_AFTER = int(os.getenv("ANN_GIVE_UP_AFTER", "3"))  # consecutive errors before a fallback takes over
+
+
+class ApiFeed:
+    """Subclasses set name/url and implement `_page(cx, cursor) -> (items, next_cursor)`.
+
+    Items are normalised dicts: {"id", "title", "ts" (epoch ms), "url"}, newest first.
+    """
+    name: str = ""
+    url: str = ""
+    default_market: str = "SPOT"
+
+    def __init__(self, interval_sec: int = 600):
+        self.interval_sec = interval_sec
+        self._since: Optional[int] = None   # newest ts (ms) yielded so far
+        self._seen = SeenIds()
+        self.failures = 0
+
+    async def _get_json(self, cx: httpx.AsyncClient, params: dict) -> dict:
+        key = budget.key_for(self.name, self.url)
+        await budget.acquire(key)
+        r = await cx.get(self.url, params=params)
+        budget.observe(key, r.headers, r.status_code)
+        r.raise_for_status()
+        return r.json()
+
+    async def _page(self, cx: httpx.AsyncClient, cursor) -> tuple[list[dict], object]:
+        raise NotImplementedError
+
+    def _announcements(self, it: dict) -> list[Announcement]:
+        title = it["title"] or ""
+        if not is_listing(title):
+            return []
+        symbol = guess_symbol(title)
+        if not symbol:
+            return []
+        return [
+            Announcement(
+                exchange=self.name,
+                market_type=market,
+                symbol=symbol,
+                official_time=ms_to_dt(it["ts"]),
+                notice_url=it["url"],
+                dedupe_hint=str(it["id"]),
+            )
+            for market in markets(title, self.default_market)
+        ]
+
+    async def poll(self, cx: httpx.AsyncClient) -> list[Announcement]:
+        out: list[Announcement] = []
+        newest = self._since
+        cursor = None
+        for _ in range(ANN_MAX_PAGES if self._since is not None else ANN_BACKFILL_PAGES):
+            items, cursor = await self._page(cx, cursor)
+            reached_known = False
+            for it in items:
+                ts = int(it["ts"])
+                if self._since is not None and ts < self._since:
+                    reached_known = True
+                    break
+                if it["id"] in self._seen:
+                    continue
+                self._seen.add(it["id"])
+                newest = max(newest or ts, ts)
+                out.extend(self._announcements(it))
+            if reached_known or not items or cursor is None:
+                break
+        self._since = newest
+        return out
+
+    async def stream(self) -> AsyncIterator[Announcement]:
+        async with httpx.AsyncClient(timeout=15, headers={"Accept": "application/json"}) as cx:
+            while True:
+                try:
+                    anns = await self.poll(cx)
+                    self.failures = 0
+                except Exception as e:
+                    self.failures += 1
+                    if self.failures >= ANN_GIVE_UP_AFTER:
+                        raise
+                    logger.warning("[ANN] {name} poll failed ({failures}/{limit}): {error}", name=self.name, key=self.name,
+                                   failures=self.failures, limit=ANN_GIVE_UP_AFTER, error=e)
+                    anns = []
+                for ann in anns:
+                    yield ann
+                await asyncio.sleep(self.interval_sec)
+
+
+class BitgetFeed(ApiFeed):
+    name = "BITGET"
+    url = os.getenv("BITGET_ANN_URL", "https://api.bitget.com/api/v2/public/annoucements")  # sic
+
+    async def _page(self, cx, cursor):
+        params = {"language": "en_US", "annType": "coin_listings", "limit": 10}
+        if cursor:
+            params["cursor"] = cursor  # annId of the last item of the previous page
+        data = (await self._get_json(cx, params)).get("data") or []
+        items = [{"id": d["annId"], "title": d.get("annTitle"), "ts": d["cTime"], "url": d.get("annUrl", "")}
+                 for d in data]
+        return items, (items[-1]["id"] if len(items) == params["limit"] else None)
+
+
+class KuCoinFeed(ApiFeed):
+    name = "KUCOIN"
+    url = os.getenv("KUCOIN_ANN_URL", "https://api.kucoin.com/api/v3/announcements")
+
+    async def _page(self, cx, cursor):
+        page = cursor or 1
+        data = (await self._get_json(cx, {"annType": "new-listings", "lang": "en_US",
+                                          "pageSize": 20, "currentPage": page})).get("data") or {}
+        items = [{"id": d["annId"], "title": d.get("annTitle"), "ts": d["cTime"], "url": d.get("annUrl", "")}
+                 for d in data.get("items") or []]
+        return items, (page + 1 if page < int(data.get("totalPage") or 0) else None)
+
+
+class OkxFeed(ApiFeed):
+    name = "OKX"
+    url = os.getenv("OKX_ANN_URL", "https://www.okx.com/api/v5/support/announcements")
+
+    async def _page(self, cx, cursor):
+        page = cursor or 1
+        data = (await self._get_json(cx, {"annType": "announcements-new-listings", "page": page})).get("data") or []
+        block = data[0] if data else {}
+        # OKX has no ids; the article URL is stable
+        items = [{"id": d.get("url"), "title": d.get("title"), "ts": d["pTime"], "url": d.get("url", "")}
+                 for d in block.get("details") or []]
+        return items, (page + 1 if page < int(block.get("totalPage") or 0) else None)
+
+
+class BinanceFeed(ApiFeed):
+    name = "BINANCE"
+    url = os.getenv("BINANCE_ANN_URL", "https://www.binance.com/bapi/composite/v1/public/cms/article/list/query")
+
+    async def _page(self, cx, cursor):
+        page = cursor or 1
+        # catalog 48 = "New Cryptocurrency Listing"
+        data = (await self._get_json(cx, {"type": 1, "catalogId": 48, "pageNo": page, "pageSize": 20})).get("data") or {}
+        catalogs = data.get("catalogs") or [{}]
+        items = [{"id": a["id"], "title": a.get("title"), "ts": a["releaseDate"],
+                  "url": f"https://www.binance.com/en/support/announcement/{a.get('code', '')}"}
+                 for a in catalogs[0].get("articles") or []]
+        return items, (page + 1 if len(items) == 20 else None)
+
+
+class BybitFeed(ApiFeed):
+    name = "BYBIT"
+    url = os.getenv("BYBIT_ANN_URL", "https://api.bybit.com/v5/announcements/index")
+
+    async def _page(self, cx, cursor):
+        page = cursor or 1
+        result = (await self._get_json(cx, {"locale": "en-US", "type": "new_crypto", "page": page, "limit": 20})).get("result") or {}
+        items = [{"id": d.get("url"), "title": d.get("title"), "ts": d["dateTimestamp"], "url": d.get("url", "")}
+                 for d in result.get("list") or []]
+        total = int(result.get("total") or 0)
+        return items, (page + 1 if page * 20 < total else None)
+
+
+class RssFeed(ApiFeed):
+    """Any exchange announcement RSS/Atom feed, e.g. ANN_SOURCES="FOO=rss:https://foo/feed"."""
+
+    def __init__(self, name: str, url: str, interval_sec: int = 600):
+        super().__init__(interval_sec)
+        self.name = name
+        self.url = url
+
+    async def _page(self, cx, cursor):
+        import feedparser  # only needed when an RSS source is configured
+
+        key = budget.key_for(self.name, self.url)
+        await budget.acquire(key)
+        r = await cx.get(self.url, headers={"Accept": "application/rss+xml, application/atom+xml"})
+        budget.observe(key, r.headers, r.status_code)
+        r.raise_for_status()
+        feed = feedparser.parse(r.content)
+        items = []
+        for e in feed.entries:
+            parsed = e.get("published_parsed") or e.get("updated_parsed")
+            if not parsed:
+                continue
+            ts = calendar.timegm(parsed) * 1000
+            items.append({"id": e.get("id") or e.get("link"), "title": e.get("title"), "ts": ts, "url": e.get("link", "")})
+        items.sort(key=lambda it: it["ts"], reverse=True)
+        return items, None  # feeds carry their newest entries only
+
+
+FEEDS: dict[str, type[ApiFeed]] = {
+    "BITGET": BitgetFeed,
+    "KUCOIN": KuCoinFeed,
+    "OKX": OkxFeed,
+    "BINANCE": BinanceFeed,
+    "BYBIT": BybitFeed,
+}
@@ -1,9 +1,9 @@
 # app/announcements/bingx.py
 import os, httpx, urllib.parse, asyncio
-from bs4 import BeautifulSoup
-from dateutil import parser as dateparse
 from typing import AsyncIterator
+from app.announcements.common import guess_symbol, is_listing
 from app.exchanges.base import Announcement
+from app.ratelimit import budget
 
 SPOT_URL = os.getenv(
     "BINGX_SPOT_NOTICE_URL",
@@ -18,24 +18,25 @@ SCRAPER = os.getenv("SCRAPER_URL", "")
 def _wrap(url: str) -> str:
     return f"{SCRAPER}={urllib.parse.quote(url)}" if SCRAPER else url
 
-def _guess_symbol(title: str) -> str | None:
-    import re
-    # catch patterns like "List XXX/USDT", "Listing XXX", "Launch XXX ..."
-    m = re.search(r"\b([A-Z0-9]{2,10})\b(?:/USDT)?", title)
-    return m.group(1).upper() if m else None
-
 async def _fetch(url: str, market_type: str, interval_sec: int) -> AsyncIterator[Announcement]:
+    # scraping deps are only needed once the feed runs; keep them off the startup path
+    from bs4 import BeautifulSoup
+    from dateutil import parser as dateparse
+
     async with httpx.AsyncClient(timeout=20) as cx:
         while True:
+            key = budget.key_for("BINGX", url)
+            await budget.acquire(key)
             r = await cx.get(_wrap(url), headers={"Accept": "text/html"})
+            budget.observe(key, r.headers, r.status_code)
             r.raise_for_status()
             soup = BeautifulSoup(r.text, "html.parser")
             # Titles are <a> entries; adjust selectors if BingX changes layout
             for a in soup.select("a[href*='/support/articles/']"):
                 title = (a.get_text(strip=True) or "").strip()
-                if "list" not in title.lower() and "listing" not in title.lower():
+                if not is_listing(title):
                     continue
-                sym = _guess_symbol(title)
+                sym = guess_symbol(title)
                 if not sym:
                     continue
                 href = a.get("href")
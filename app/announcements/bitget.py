@@ -1,9 +1,9 @@
 # app/announcements/bitget.py
-import os, httpx, urllib.parse
-from bs4 import BeautifulSoup
-from dateutil import parser as dateparse
+import os, httpx, urllib.parse, asyncio
 from typing import AsyncIterator
+from app.announcements.common import guess_symbol, is_listing
 from app.exchanges.base import Announcement
+from app.ratelimit import budget
 
 SECT_URL = os.getenv("BITGET_SECTION_URL",
                      "https://www.bitget.com/support/sections/5955813039257")
@@ -12,17 +12,17 @@ SCRAPER = os.getenv("SCRAPER_URL", "")  # e.g. https://app.scrapingbee.com/api/v
 def _fetch_url():
     return f"{SCRAPER}={urllib.parse.quote(SECT_URL)}" if SCRAPER else SECT_URL
 
-def _guess_symbol_from_title(t: str) -> str | None:
-    # very tolerant; improve as needed
-    # Examples: "Bitget to List WLF", "Listing of ABC on Spot"
-    import re
-    m = re.search(r"\b([A-Z0-9]{2,10})\b(?=.*list|listing|spot)", t, re.I)
-    return m.group(1).upper() if m else None
-
 async def stream(interval_sec: int = 600) -> AsyncIterator[Announcement]:
+    # scraping deps are only needed once the feed runs; keep them off the startup path
+    from bs4 import BeautifulSoup
+    from dateutil import parser as dateparse
+
     async with httpx.AsyncClient(timeout=20) as cx:
         while True:
+            key = budget.key_for("BITGET", SECT_URL)
+            await budget.acquire(key)
             r = await cx.get(_fetch_url(), headers={"Accept": "text/html"})
+            budget.observe(key, r.headers, r.status_code)
             r.raise_for_status()
             soup = BeautifulSoup(r.text, "html.parser")
 
@@ -30,9 +30,9 @@ async def stream(interval_sec: int = 600) -> AsyncIterator[Announcement]:
             for a in soup.select("a[href*='/support/articles/']"):
                 title = (a.get_text(strip=True) or "").strip()
                 url = "https://www.bitget.com" + a.get("href")
-                if not ("list" in title.lower() or "listing" in title.lower()):
+                if not is_listing(title):
                     continue
-                sym = _guess_symbol_from_title(title)
+                sym = guess_symbol(title)
                 if not sym:
                     continue
 
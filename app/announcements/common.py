@@ -0,0 +1,87 @@
+# app/announcements/common.py
+"""Helpers shared by the announcement feeds (API, RSS and HTML)."""
+import asyncio
+import re
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+
+_LISTING = re.compile(r"\b(will list|to list|lists|listing|will launch|launches|launched)\b", re.I)
+_FUTURES = re.compile(r"\b(futures|perpetual|perp|swap|contract|usdt-m|usdⓈ-m)\b", re.I)
+_SPOT = re.compile(r"\bspot\b", re.I)
+_PAREN = re.compile(r"\(([A-Z0-9]{2,15})\)")
+_PAIR = re.compile(r"\b([A-Z0-9]{2,15})[/_-]?USDT\b")
+_TOKEN = re.compile(r"\b([A-Z][A-Z0-9]{1,14})\b")
+_NOT_SYMBOLS = {
+    "USDT", "USDC", "USD", "NEW", "SPOT", "FUTURES", "PERPETUAL", "PERP", "SWAP", "UTC", "API", "APR",
+    "BINGX", "BITGET", "KUCOIN", "OKX", "BYBIT", "BINANCE", "MEXC", "GATE", "HODLER", "LAUNCHPOOL",
+}
+
+
+def is_listing(title: str) -> bool:
+    return bool(_LISTING.search(title))
+
+
+def guess_symbol(title: str) -> Optional[str]:
+    """'Bitget Will List Pepe (PEPE)' / 'New listing: ABC/USDT' / 'Listing XYZ' -> ticker."""
+    for rx in (_PAREN, _PAIR):
+        m = rx.search(title)
+        if m and m.group(1) not in _NOT_SYMBOLS:
+            return m.group(1)
+    for m in _TOKEN.finditer(title):
+        if m.group(1) not in _NOT_SYMBOLS:
+            return m.group(1)
+    return None
+
+
+def markets(title: str, default: str = "SPOT") -> list[str]:
+    """Markets a listing title refers to; both when it names spot and futures."""
+    fut, spot = bool(_FUTURES.search(title)), bool(_SPOT.search(title))
+    if fut and spot:
+        return ["SPOT", "FUTURES"]
+    if fut:
+        return ["FUTURES"]
+    return ["SPOT"] if spot else [default]
+
+
+def ms_to_dt(ms) -> datetime:
+    return datetime.fromtimestamp(int(ms) / 1000, tz=timezone.utc)
+
+
+class SeenIds:
+    """Bounded memory of announcement ids already yielded."""
+
+    def __init__(self, size: int = 2000):
+        self.size = size
+        self._ids: OrderedDict[str, None] = OrderedDict()
+
+    def __contains__(self, key) -> bool:
+        return str(key) in self._ids
+
+    def add(self, key) -> None:
+        self._ids[str(key)] = None
+        while len(self._ids) > self.size:
+            self._ids.popitem(last=False)
+
+
+async def merge(*streams: AsyncIterator) -> AsyncIterator:
+    """Interleave several async iterators; the first error is re-raised."""
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def pump(stream):
+        try:
+            async for item in stream:
+                await queue.put(item)
+        except Exception as e:
+            await queue.put(e)
+
+    tasks = [asyncio.create_task(pump(s)) for s in streams]
+    try:
+        while True:
+            item = await queue.get()
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        for t in tasks:
+            t.cancel()
@@ -0,0 +1,59 @@
+# app/announcements/sources.py
+"""
+Per-exchange announcement source selection.
+
+    ANN_SOURCES="BITGET=api|html,BINGX=html,KUCOIN=api,FOO=rss:https://foo/feed"
+
+Sources of one exchange are tried in order: when a feed gives up (see
+ANN_GIVE_UP_AFTER) the next one takes over, and every ANN_PRIMARY_RETRY_SEC
+the first one is tried again, so a recovered API wins back. HTML scraping is only kept for
+exchanges without a structured feed and as a fallback.
+"""
+from typing import AsyncIterator
+
+from app.announcements.api import FEEDS, RssFeed
+from app.announcements.common import merge
+from app.exchanges.base import Announcement
+
+
+class HtmlFeed:
+    """The support-center scrapers behind the AnnouncementAdapter interface."""
+
+    def __init__(self, name: str, streams: list, interval_sec: int = 600):
+        self.name = name
+        self.streams = streams
+        self.interval_sec = interval_sec
+
+    def stream(self) -> AsyncIterator[Announcement]:
+        return merge(*(s(self.interval_sec) for s in self.streams))
+
+
+def _html_scrapers() -> dict[str, list]:
+    from app.announcements import bingx, bitget
+    return {"BITGET": [bitget.stream], "BINGX": [bingx.stream_spot, bingx.stream_futures]}
+
+
+def parse_sources(raw: str) -> dict[str, list[str]]:
+    out = {}
+    for part in raw.split(","):
+        name, _, spec = part.partition("=")
+        if spec.strip():
+            out[name.strip().upper()] = [s.strip() for s in spec.split("|") if s.strip()]
+    return out
+
+
+def build_feeds(sources: dict[str, list[str]], interval_sec: int = 600) -> dict[str, list]:
+    """exchange -> [feed, fallback feed, ...]; unknown or 'off' entries are skipped."""
+    chains = {}
+    for name, options in sources.items():
+        chain = []
+        for opt in options:
+            if opt == "api" and name in FEEDS:
+                chain.append(FEEDS[name](interval_sec))
+            elif opt.startswith("rss:"):
+                chain.append(RssFeed(name, opt[4:], interval_sec))
+            elif opt == "html" and name in _html_scrapers():
+                chain.append(HtmlFeed(name, _html_scrapers()[name], interval_sec))
+        if chain:
+            chains[name] = chain
+    return chains
@@ -0,0 +1,207 @@
+# app/archive.py
+"""
+Hot/cold split of seen_items.
+
+The hot path (dedupe checks, reconciler lookups, index warm-up) only needs
+recent or still-provisional rows. Every ARCHIVE_INTERVAL_SEC the archiver
+moves finalized rows older than ARCHIVE_AFTER_DAYS (and any row older than
+ARCHIVE_MAX_AGE_DAYS, when the reconciler has long given up on it) into
+gzip JSONL files partitioned by day:
+
+    ARCHIVE_DIR/seen_items/2026-10-19.jsonl.gz
+
+Their dedupe keys stay behind as 8-byte hashes in `archived_keys`, which
+handle_listing checks when a key is not in the hot table, so archived
+listings are never re-alerted. First alerts also keep exchange, market,
+symbol and first-seen time there, so the cross-exchange index still warms
+from them. Rows are written to the archive before they
+are deleted; a crash in between leaves a duplicate line, never a lost row.
+SQLite files are VACUUMed after each run that moved rows. `search()`
+reads both tiers.
+
+In cluster mode only the leader (oldest live node) archives, and only once
+every live node's marker file shows up in its ARCHIVE_DIR, i.e. the
+directory is shared storage and every node's /history sees the same files.
+"""
+import asyncio
+import gzip
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import and_, delete, or_, select
+
+from app.cluster import cluster
+from app.metrics import inc
+from app.store import ArchivedKey, OutboxItem, SeenItem, key_hash
+from app.utils.logging import logger
+from app.utils.time import now_utc
+
+ARCHIVE_DIR = Path(os.getenv("ARCHIVE_DIR", "./archive"))
+ARCHIVE_AFTER_DAYS = float(os.getenv("ARCHIVE_AFTER_DAYS", "7"))       # 0 disables the job
+ARCHIVE_MAX_AGE_DAYS = float(os.getenv("ARCHIVE_MAX_AGE_DAYS", "30"))   # provisional rows too
+ARCHIVE_INTERVAL_SEC = float(os.getenv("ARCHIVE_INTERVAL_SEC", "86400"))
+ARCHIVE_BATCH = int(os.getenv("ARCHIVE_BATCH", "5000"))
+
+_FIELDS = ("dedupe_key", "exchange", "market_type", "symbol", "source_time", "provisional",
+           "message_id", "source_url", "seen_at")
+
+
+def _utc(dt: Optional[datetime]) -> Optional[datetime]:
+    return dt if dt is None or dt.tzinfo else dt.replace(tzinfo=timezone.utc)  # SQLite drops tzinfo
+
+
+def _row(item: SeenItem) -> dict:
+    out = {f: getattr(item, f) for f in _FIELDS}
+    for f in ("source_time", "seen_at"):
+        out[f] = _utc(out[f]).isoformat() if out[f] else None
+    return out
+
+
+def _archived_key(h: int, item: SeenItem) -> ArchivedKey:
+    ak = ArchivedKey(key_hash=h, day=_utc(item.seen_at).strftime("%Y-%m-%d"))
+    if item.dedupe_key.count(":") == 2:
+        # first alert of a venue: SymbolIndex.warm still needs it for "Already on" attribution
+        ak.exchange, ak.market_type, ak.symbol, ak.first_seen = item.exchange, item.market_type, item.symbol, item.seen_at
+    return ak
+
+
+class Archive:
+    def __init__(self, db_sessionmaker, root: Path = ARCHIVE_DIR):
+        self.db_sessionmaker = db_sessionmaker
+        self.dir = Path(root) / "seen_items"
+
+    def _path(self, day: str) -> Path:
+        return self.dir / f"{day}.jsonl.gz"
+
+    def _write(self, parts: dict[str, list[dict]]) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        for day, rows in parts.items():
+            # appending adds a gzip member; readers see one continuous stream
+            with gzip.open(self._path(day), "at", encoding="utf-8") as f:
+                f.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in rows)
+
+    async def _batch(self, now: datetime, after_days: float, max_age_days: float) -> int:
+        done = now - timedelta(days=after_days)
+        stale = now - timedelta(days=max_age_days)
+        async with self.db_sessionmaker() as db:
+            unsent = select(OutboxItem.dedupe_key).where(OutboxItem.status.in_(("pending", "sending")))
+            items = (await db.execute(
+                select(SeenItem)
+                .where(or_(and_(SeenItem.seen_at < done, SeenItem.provisional.is_(False)), SeenItem.seen_at < stale))
+                .where(SeenItem.dedupe_key.not_in(unsent))
+                .order_by(SeenItem.id)
+                .limit(ARCHIVE_BATCH)
+            )).scalars().all()
+            if not items:
+                return 0
+            parts: dict[str, list[dict]] = {}
+            for it in items:
+                parts.setdefault(_utc(it.seen_at).strftime("%Y-%m-%d"), []).append(_row(it))
+            await asyncio.to_thread(self._write, parts)
+
+            keys = {key_hash(it.dedupe_key): it for it in items}
+            known = set((await db.execute(
+                select(ArchivedKey.key_hash).where(ArchivedKey.key_hash.in_(list(keys)))
+            )).scalars())
+            db.add_all(_archived_key(h, it) for h, it in keys.items() if h not in known)
+            await db.execute(delete(SeenItem).where(SeenItem.id.in_([it.id for it in items])))
+            await db.commit()
+            return len(items)
+
+    async def run_once(self, after_days: float = ARCHIVE_AFTER_DAYS, max_age_days: float = ARCHIVE_MAX_AGE_DAYS,
+                       vacuum: bool = True) -> int:
+        """Archive every eligible row; returns how many were moved."""
+        now = now_utc()
+        moved = 0
+        while True:
+            n = await self._batch(now, after_days, max_age_days)
+            moved += n
+            if n < ARCHIVE_BATCH:
+                break
+        inc("archive.rows", moved)
+        if moved and vacuum:
+            await self.vacuum()
+        return moved
+
+    async def vacuum(self) -> None:
+        engine = self.db_sessionmaker.kw["bind"]
+        if engine.dialect.name != "sqlite":
+            return
+        # VACUUM cannot run inside a transaction
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.exec_driver_sql("VACUUM")
+
+    # ---------- cluster mode ----------
+    def _marker(self, node_id: str) -> Path:
+        return self.dir / f".node-{node_id}"
+
+    async def blocked(self) -> Optional[str]:
+        """Why this node must not archive right now (cluster mode), or None."""
+        if not cluster.enabled:
+            return None
+        # every node leaves a marker; the leader only archives when it sees them all,
+        # i.e. ARCHIVE_DIR is storage every node (and so every /history) reads
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._marker(cluster.node_id).touch()
+        alive = await cluster.alive(self.db_sessionmaker)
+        if not alive or alive[0] != cluster.node_id:
+            return f"archival runs on the leader node {alive[0] if alive else '?'}"
+        missing = [n for n in alive if not self._marker(n).exists()]
+        if missing:
+            return f"{self.dir} is not shared with node(s) {', '.join(missing)}"
+        return None
+
+    async def run(self, interval: float = ARCHIVE_INTERVAL_SEC) -> None:
+        while True:
+            try:
+                why = await self.blocked()
+                if why is not None:
+                    logger.info("[ARCHIVE] skipped: {reason}", reason=why)
+                    await asyncio.sleep(interval)
+                    continue
+                moved = await self.run_once()
+                if moved:
+                    logger.info("[ARCHIVE] moved {moved} seen_items rows to {path}", moved=moved, path=self.dir)
+            except Exception as e:
+                logger.exception("[ARCHIVE] run failed: {error}", error=e)
+            await asyncio.sleep(interval)
+
+    # ---------- query ----------
+    def _scan(self, symbol: str, since: Optional[datetime]) -> list[dict]:
+        out = []
+        for path in sorted(self.dir.glob("*.jsonl.gz")):
+            if since is not None and path.name[:10] < since.strftime("%Y-%m-%d"):
+                continue
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if f'"symbol": "{symbol}"' not in line:  # cheap pre-filter before parsing
+                        continue
+                    row = json.loads(line)
+                    if row["symbol"] == symbol:
+                        out.append(row)
+        return out
+
+    async def search(self, symbol: str, since: Optional[datetime] = None, limit: int = 50) -> list[dict]:
+        """seen_items rows for a symbol from the hot table and the archive, newest first."""
+        q = select(SeenItem).where(SeenItem.symbol == symbol)
+        if since is not None:
+            q = q.where(SeenItem.seen_at >= since)
+        async with self.db_sessionmaker() as db:
+            hot = [dict(_row(it), tier="hot") for it in (await db.execute(q)).scalars()]
+        keys = {r["dedupe_key"] for r in hot}
+        cold = []
+        for r in await asyncio.to_thread(self._scan, symbol, since):
+            if r["dedupe_key"] not in keys:
+                keys.add(r["dedupe_key"])  # also drops duplicates from an interrupted run
+                cold.append(dict(r, tier="archive"))
+        rows = hot + [r for r in cold if since is None or r["seen_at"] >= since.isoformat()]
+        rows.sort(key=lambda r: r["seen_at"] or "", reverse=True)
+        return rows[:limit]
+
+    def stats(self) -> dict:
+        files = list(self.dir.glob("*.jsonl.gz"))
+        return {"files": len(files), "bytes": sum(p.stat().st_size for p in files)}
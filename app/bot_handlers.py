@@ -1,15 +1,217 @@
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
 from telegram.ext import Application, CommandHandler
 from telegram import Update
 from telegram.constants import ParseMode
 from telegram.ext import ContextTypes
 from app.utils.time import now_utc
+from app.metrics import startup
+from app.ratelimit import budget
+from app.config import EXCHANGES_FILE, config_mtime
+from app.loopmon import monitor
+from app import profiling
+from app.clock import clocks
+from app.proxies import pool
+from app.cluster import cluster
+from app.utils.logging import logger, sampler, tail
+from app.store import ArchivedKey, ListingTiming, SeenItem
+from sqlalchemy import func, select
+
+OWNER_CHAT_ID = os.getenv("OWNER_CHAT_ID", "")
 
 async def cmd_ping(update: Update, _: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text("pong")
 
 async def cmd_status(update: Update, _: ContextTypes.DEFAULT_TYPE):
-    await update.message.reply_text(f"OK {now_utc().isoformat()}")
+    ready = f"ready in {startup.ready_after:.2f}s" if startup.ready_after is not None else "warming up"
+    lag = monitor.snapshot()
+    await update.message.reply_text(
+        f"OK {now_utc().isoformat()} ({ready})\nloop lag p99={lag['p99_ms']}ms max={lag['max_ms']}ms tasks={lag['tasks']}"
+    )
+
+async def cmd_limits(update: Update, _: ContextTypes.DEFAULT_TYPE):
+    rows = [
+        f"{key}: {v['limit']} tokens={v['tokens']} demand={v['demand']} interval={v['interval']}s"
+        + (f" paused={v['paused']}s" if v["paused"] else "")
+        for key, v in budget.snapshot().items()
+    ]
+    await update.message.reply_text("\n".join(rows) or "no budgets in use")
+
+async def cmd_outbox(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    outbox = context.application.bot_data.get("outbox")
+    if outbox is None:
+        await update.message.reply_text("outbox not running")
+        return
+    counts = await outbox.backlog()
+    await update.message.reply_text(" ".join(f"{k}={v}" for k, v in sorted(counts.items())) or "outbox empty")
+
+async def cmd_config(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/config — owner only; the active exchange set and where it was loaded from."""
+    if not _is_owner(update):
+        await update.message.reply_text("owner only")
+        return
+    settings = context.application.bot_data.get("settings")
+    if settings is None:
+        await update.message.reply_text("not started yet")
+        return
+    source = EXCHANGES_FILE if config_mtime() is not None else "built-in defaults"
+    rows = [f"source: {source}"] + [
+        f"{ex.name} {ex.key.rsplit('.', 1)[-1]} poll={ex.poll_seconds}s" + ("" if ex.enabled else " (disabled)")
+        for ex in settings.exchanges
+    ]
+    await update.message.reply_text("\n".join(rows))
+
+async def cmd_loop(update: Update, _: ContextTypes.DEFAULT_TYPE):
+    snap = monitor.snapshot()
+    rows = [" ".join(f"{k}={v}" for k, v in snap.items())]
+    rows += [f"{name}: {n}" for name, n in monitor.inventory().most_common()]
+    for ts, ms, task, where in list(monitor.slow)[-5:]:
+        rows.append(f"{datetime.fromtimestamp(ts, tz=timezone.utc):%H:%M:%S} {ms:.0f}ms {task} @ {where}")
+    await update.message.reply_text("\n".join(rows))
+
+def _is_owner(update: Update) -> bool:
+    ids = {str(update.effective_user.id) if update.effective_user else "", str(update.effective_chat.id)}
+    return bool(OWNER_CHAT_ID) and OWNER_CHAT_ID in ids
+
+async def cmd_profile(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/profile [seconds] — owner only; profiles every process watching PROFILE_DIR."""
+    if not _is_owner(update):
+        await update.message.reply_text("owner only")
+        return
+    try:
+        seconds = float(context.args[0]) if context.args else 10.0
+    except ValueError:
+        await update.message.reply_text("usage: /profile [seconds]")
+        return
+    seconds = min(max(seconds, 1.0), profiling.PROFILE_MAX_SEC)
+    session = profiling.request(seconds)
+    await update.message.reply_text(f"profiling {seconds:.0f}s, session {session} ...")
+    # watchers pick the request up within a second, then profile and dump
+    await asyncio.sleep(seconds + 3)
+    stats, processes, path = profiling.merge(session)
+    if stats is None:
+        await update.message.reply_text(f"no profile dumps for {session} in {profiling.PROFILE_DIR}")
+        return
+    rows = [f"{session}: {processes} process(es) -> {path}", "   cum      own   calls  function"]
+    rows += profiling.top(stats)
+    await update.message.reply_text("\n".join(rows)[:4000])
+    with open(path, "rb") as f:
+        await update.message.reply_document(f, filename=path.name)
+
+def _ms(v) -> str:
+    return f"{v:.0f}ms" if v is not None else "-"
+
+async def cmd_clock(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Clock offsets (remote - ours) and per-exchange detection/delivery on the corrected timeline."""
+    rows = [f"{name}: {v['offset_ms']:+.1f}ms ±{v['error_ms']:.1f} ({v['samples']} samples, {v['age_s']:.0f}s ago)"
+            for name, v in clocks.snapshot().items()]
+    sessionmaker = context.application.bot_data.get("sessionmaker")
+    if sessionmaker is not None:
+        async with sessionmaker() as db:
+            stats = await db.execute(
+                select(ListingTiming.exchange, func.count(), func.avg(ListingTiming.poll_gap_ms),
+                       func.avg(ListingTiming.detect_ms), func.avg(ListingTiming.deliver_ms))
+                .group_by(ListingTiming.exchange)
+            )
+            for exchange, n, gap, detect, deliver in stats:
+                rows.append(f"{exchange}: n={n} poll_gap={_ms(gap)} detect={_ms(detect)} deliver={_ms(deliver)}")
+    await update.message.reply_text("\n".join(rows) or "no clock samples yet")
+
+async def cmd_proxies(update: Update, _: ContextTypes.DEFAULT_TYPE):
+    rows = [
+        f"{label}: {v['state']} latency={_ms(v['latency_ms'])} requests={v['requests']} errors={v['errors']}"
+        for label, v in pool.snapshot().items()
+    ]
+    await update.message.reply_text("\n".join(rows) or "no proxies configured (PROXY_URLS)")
+
+async def cmd_logs(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/logs [n] [level] — owner only; tail of the in-memory log ring buffer."""
+    if not _is_owner(update):
+        await update.message.reply_text("owner only")
+        return
+    n, level = 20, "INFO"
+    for arg in context.args or []:
+        if arg.isdigit():
+            n = min(int(arg), 200)
+        else:
+            level = arg.upper()
+    try:
+        min_level = logger.level(level).no
+    except ValueError:
+        await update.message.reply_text("usage: /logs [n] [debug|info|warning|error]")
+        return
+    rows = [f"{datetime.fromtimestamp(e['ts'], tz=timezone.utc):%H:%M:%S} {e['level'][0]} {e['msg']}"
+            + (f" [{e['exc']}]" if "exc" in e else "")
+            for e in tail.recent(n, min_level)]
+    rows.append(f"({sampler.suppressed} repeated events suppressed since start)")
+    # keep the newest lines when over Telegram's message limit
+    await update.message.reply_text("\n".join(rows)[-4000:])
+
+async def cmd_history(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/history SYMBOL [days] — alerts for a symbol from the hot table and the archive."""
+    archive = context.application.bot_data.get("archive")
+    if archive is None or not context.args:
+        await update.message.reply_text("usage: /history SYMBOL [days]")
+        return
+    since = None
+    if len(context.args) > 1 and context.args[1].isdigit():
+        since = now_utc() - timedelta(days=int(context.args[1]))
+    rows = [
+        f"{r['seen_at'][:16]} {r['exchange']} {r['market_type']} {r['dedupe_key']}"
+        + (f" msg_id={r['message_id']}" if r["message_id"] else "") + (" (archive)" if r["tier"] == "archive" else "")
+        for r in await archive.search(context.args[0].upper(), since)
+    ]
+    await update.message.reply_text("\n".join(rows) or "no alerts for that symbol")
+
+async def cmd_archive(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/archive — owner only; run the seen_items archival job now."""
+    if not _is_owner(update):
+        await update.message.reply_text("owner only")
+        return
+    archive = context.application.bot_data.get("archive")
+    sessionmaker = context.application.bot_data.get("sessionmaker")
+    if archive is None or sessionmaker is None:
+        await update.message.reply_text("not started yet")
+        return
+    why = await archive.blocked()
+    if why is not None:
+        await update.message.reply_text(f"not archiving: {why}")
+        return
+    moved = await archive.run_once()
+    async with sessionmaker() as db:
+        hot = (await db.execute(select(func.count()).select_from(SeenItem))).scalar()
+        keys = (await db.execute(select(func.count()).select_from(ArchivedKey))).scalar()
+    st = archive.stats()
+    await update.message.reply_text(
+        f"moved {moved} rows; hot={hot} archived_keys={keys} files={st['files']} ({st['bytes'] / 1024:.0f} KiB)"
+    )
+
+async def cmd_nodes(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Cluster nodes sharing this database: liveness, claim win rate, lag behind the winner."""
+    if not cluster.enabled:
+        await update.message.reply_text("single-node mode (set NODE_ID to join a cluster)")
+        return
+    rows = []
+    for node_id, v in (await cluster.stats(context.application.bot_data["sessionmaker"])).items():
+        rate = f"{v['win_rate']:.0%}" if v["win_rate"] is not None else "-"
+        me = " (this node)" if node_id == cluster.node_id else ""
+        rows.append(f"{node_id}{me} @{v['host']}: {'up' if v['alive'] else 'DOWN'} hb={v['heartbeat_age_s']}s "
+                    f"won={v['won']} lost={v['lost']} win_rate={rate} behind={_ms(v['median_behind_ms'])}")
+    await update.message.reply_text("\n".join(rows) or "no nodes yet")
 
 async def register_admin(app: Application):
     app.add_handler(CommandHandler("ping", cmd_ping))
-    app.add_handler(CommandHandler("status", cmd_status))
\ No newline at end of file
+    app.add_handler(CommandHandler("status", cmd_status))
+    app.add_handler(CommandHandler("limits", cmd_limits))
+    app.add_handler(CommandHandler("outbox", cmd_outbox))
+    app.add_handler(CommandHandler("config", cmd_config))
+    app.add_handler(CommandHandler("loop", cmd_loop))
+    app.add_handler(CommandHandler("clock", cmd_clock))
+    app.add_handler(CommandHandler("proxies", cmd_proxies))
+    app.add_handler(CommandHandler("logs", cmd_logs))
+    app.add_handler(CommandHandler("history", cmd_history))
+    app.add_handler(CommandHandler("nodes", cmd_nodes))
+    app.add_handler(CommandHandler("archive", cmd_archive, block=False))
+    # runs for N seconds; don't hold up other updates meanwhile
+    app.add_handler(CommandHandler("profile", cmd_profile, block=False))
\ No newline at end of file
@@ -0,0 +1,121 @@
+# app/breaker.py
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+from app.metrics import inc
+from app.utils.logging import logger
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After header value (delta seconds or HTTP date) in seconds; None if absent or unparseable."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """
+    Seconds requested by a 429/418 response (Retry-After as delta or HTTP date).
+    Returns 0.0 for a rate-limit status without the header, None for other errors.
+    """
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if status not in (429, 418):
+        return None
+    value = parse_retry_after((getattr(response, "headers", None) or {}).get("Retry-After"))
+    return value if value is not None else 0.0
+
+
+class CircuitBreaker:
+    """
+    closed → open after `threshold` consecutive failures (or at once on 429),
+    open → half-open when the jittered exponential cooldown expires,
+    half-open → closed on the probe's success, back to open on its failure.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        threshold: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        rnd: Callable[[], float] = random.random,
+    ):
+        self.name = name
+        self.threshold = threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.rnd = rnd
+        self.state = CLOSED
+        self.failures = 0      # consecutive
+        self.opens = 0         # consecutive trips, drives the backoff exponent
+        self.open_until = 0.0
+        self.last_error = ""
+
+    def _set(self, state: str, note: str = "") -> None:
+        if state == self.state:
+            return
+        logger.warning("[BREAKER] {name} {old} → {new}{note}", name=self.name, key=self.name,
+                       old=self.state, new=state, note=note)
+        inc(f"breaker.{self.name}.{state}")
+        self.state = state
+
+    def backoff(self) -> float:
+        """Equal-jitter exponential backoff: half fixed, half random."""
+        cap = min(self.max_delay, self.base_delay * (2 ** self.opens))
+        return cap / 2 + self.rnd() * cap / 2
+
+    def delay(self) -> float:
+        """Seconds to wait before the next attempt; 0 means go (a probe when half-open)."""
+        if self.state != OPEN:
+            return 0.0
+        remaining = self.open_until - self.clock()
+        if remaining > 0:
+            return remaining
+        self._set(HALF_OPEN)
+        return 0.0
+
+    def success(self) -> None:
+        self.failures = 0
+        self.opens = 0
+        if self.state != CLOSED:
+            self._set(CLOSED)
+
+    def failure(self, exc: BaseException | None = None) -> float:
+        """Record a failed attempt; returns the cooldown if the breaker (re)opened, else 0."""
+        self.failures += 1
+        self.last_error = f"{type(exc).__name__}: {exc}" if exc is not None else "error"
+        inc(f"breaker.{self.name}.failures")
+        retry_after = retry_after_seconds(exc) if exc is not None else None
+        if retry_after is not None:
+            inc(f"breaker.{self.name}.rate_limited")
+
+        if self.state == CLOSED and self.failures < self.threshold and retry_after is None:
+            logger.debug("[BREAKER] {name} failure {failures}/{threshold}: {error}", name=self.name, key=self.name,
+                         failures=self.failures, threshold=self.threshold, error=self.last_error)
+            return 0.0
+
+        cooldown = max(self.backoff(), retry_after or 0.0)
+        self.opens += 1
+        self.open_until = self.clock() + cooldown
+        why = f"Retry-After {retry_after:.0f}s" if retry_after else f"{self.failures} failures"
+        if self.state == OPEN:
+            logger.warning("[BREAKER] {name} open extended {cooldown:.1f}s ({why}): {error}", name=self.name, key=self.name,
+                           cooldown=cooldown, why=why, error=self.last_error)
+        self._set(OPEN, f" for {cooldown:.1f}s ({why}): {self.last_error}")
+        return cooldown
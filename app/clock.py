@@ -0,0 +1,154 @@
+# app/clock.py
+"""
+Clock-offset estimation per exchange (and Telegram).
+
+Every timed request gives an interval for `offset = remote clock - our clock`:
+the remote stamped its time somewhere between our send (t0) and receive
+(t1), so
+
+    offset ∈ [remote - t1, remote + resolution - t0]
+
+with resolution 1 s for `Date` headers / Telegram message dates and 1 ms for
+server-time endpoints. Intersecting the intervals of recent samples narrows
+the bound well below the RTT; the estimate is its midpoint. Date headers
+come for free with every adapter poll, the server-time endpoints are polled
+every CLOCK_SYNC_SEC. `to_local()` maps a remote timestamp onto our clock,
+which is the one timeline listing timings are stored on.
+"""
+import asyncio
+import os
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+import httpx
+
+from app.metrics import inc
+from app.ratelimit import budget
+from app.utils.logging import logger
+
+CLOCK_SYNC_SEC = float(os.getenv("CLOCK_SYNC_SEC", "300"))
+CLOCK_WINDOW_SEC = float(os.getenv("CLOCK_WINDOW_SEC", "900"))   # samples older than this are dropped
+_MAX_SAMPLES = 256
+
+# server-time endpoints: exchange -> (url, response json -> epoch ms);
+# <EXCHANGE>_TIME_ENDPOINT overrides the url (mirrors, testnets)
+SERVER_TIME: dict[str, tuple[str, Callable[[dict], float]]] = {
+    "BINANCE": (os.getenv("BINANCE_TIME_ENDPOINT", "https://api.binance.com/api/v3/time"),
+               lambda j: j["serverTime"]),
+    "OKX": (os.getenv("OKX_TIME_ENDPOINT", "https://www.okx.com/api/v5/public/time"),
+           lambda j: j["data"][0]["ts"]),
+    "BYBIT": (os.getenv("BYBIT_TIME_ENDPOINT", "https://api.bybit.com/v5/market/time"),
+             lambda j: j["time"]),
+    "GATE": (os.getenv("GATE_TIME_ENDPOINT", "https://api.gateio.ws/api/v4/spot/time"),
+            lambda j: j["server_time"]),
+    "KUCOIN": (os.getenv("KUCOIN_TIME_ENDPOINT", "https://api.kucoin.com/api/v1/timestamp"),
+              lambda j: j["data"]),
+    "BITGET": (os.getenv("BITGET_TIME_ENDPOINT", "https://api.bitget.com/api/v2/public/time"),
+              lambda j: j["data"]["serverTime"]),
+    "MEXC": (os.getenv("MEXC_TIME_ENDPOINT", "https://api.mexc.com/api/v3/time"),
+            lambda j: j["serverTime"]),
+    "BINGX": (os.getenv("BINGX_TIME_ENDPOINT", "https://open-api.bingx.com/openApi/swap/v2/server/time"),
+             lambda j: j["data"]["serverTime"]),
+}
+
+
+class _Source:
+    __slots__ = ("samples", "lo", "hi", "updated")
+
+    def __init__(self):
+        self.samples: deque[tuple[float, float, float]] = deque(maxlen=_MAX_SAMPLES)  # (t1, lo, hi)
+        self.lo = float("-inf")
+        self.hi = float("inf")
+        self.updated = 0.0
+
+
+class ClockSync:
+    def __init__(self, window: float = CLOCK_WINDOW_SEC):
+        self.window = window
+        self._sources: dict[str, _Source] = {}
+
+    def track(self, source: str) -> None:
+        """Mark a source for active server-time syncing."""
+        self._sources.setdefault(source, _Source())
+
+    def observe(self, source: str, remote: float, t0: float, t1: float, resolution: float = 0.0) -> None:
+        """One timed sample: remote epoch seconds seen in a response sent at t0, received at t1 (ours)."""
+        src = self._sources.setdefault(source, _Source())
+        src.samples.append((t1, remote - t1, remote + resolution - t0))
+        while src.samples and src.samples[0][0] < t1 - self.window:
+            src.samples.popleft()
+        lo = max(s[1] for s in src.samples)
+        hi = min(s[2] for s in src.samples)
+        if lo > hi:
+            # disjoint bounds: one side's clock stepped; start over from this sample
+            inc(f"clock.{source}.reset")
+            logger.warning("[CLOCK] {source} offset bounds diverged, resetting ({lo:.3f} > {hi:.3f})",
+                           source=source, key=source, lo=lo, hi=hi)
+            src.samples.clear()
+            src.samples.append((t1, remote - t1, remote + resolution - t0))
+            lo, hi = remote - t1, remote + resolution - t0
+        src.lo, src.hi, src.updated = lo, hi, t1
+
+    def observe_date(self, source: str, header: Optional[str], t0: float, t1: float) -> None:
+        if not header:
+            return
+        try:
+            remote = parsedate_to_datetime(header).timestamp()
+        except (TypeError, ValueError):
+            return
+        self.observe(source, remote, t0, t1, resolution=1.0)
+
+    def offset(self, source: str) -> Optional[tuple[float, float]]:
+        """(estimate, ± error) in seconds, remote minus ours; None until sampled."""
+        src = self._sources.get(source)
+        if src is None or not src.samples:
+            return None
+        return (src.lo + src.hi) / 2, (src.hi - src.lo) / 2
+
+    def to_local(self, source: str, dt: Optional[datetime]) -> Optional[datetime]:
+        """Remote timestamp → our clock (unchanged when the offset is unknown)."""
+        if dt is None:
+            return None
+        off = self.offset(source)
+        return dt - timedelta(seconds=off[0]) if off else dt
+
+    def snapshot(self) -> dict[str, dict]:
+        out = {}
+        for name, src in sorted(self._sources.items()):
+            off = self.offset(name)
+            if off:
+                out[name] = {
+                    "offset_ms": round(off[0] * 1000, 1),
+                    "error_ms": round(off[1] * 1000, 1),
+                    "samples": len(src.samples),
+                    "age_s": round(time.time() - src.updated, 1),
+                }
+        return out
+
+    # ---------- active sync ----------
+    async def sync(self, cx: httpx.AsyncClient, source: str) -> None:
+        url, extract = SERVER_TIME[source]
+        key = budget.key_for(source, url)
+        await budget.acquire(key)
+        t0 = time.time()
+        r = await cx.get(url)
+        t1 = time.time()
+        budget.observe(key, r.headers, r.status_code)
+        r.raise_for_status()
+        self.observe(source, float(extract(r.json())) / 1000, t0, t1, resolution=0.001)
+
+    async def run(self, interval: float = CLOCK_SYNC_SEC) -> None:
+        async with httpx.AsyncClient(timeout=10) as cx:
+            while True:
+                for source in [s for s in self._sources if s in SERVER_TIME]:
+                    try:
+                        await self.sync(cx, source)
+                    except Exception as e:
+                        logger.debug("[CLOCK] {source} server-time sync failed: {error}", source=source, key=source, error=e)
+                await asyncio.sleep(interval)
+
+
+clocks = ClockSync()
@@ -0,0 +1,160 @@
+# app/cluster.py
+"""
+Active-active mode: several bot instances (e.g. one per region) share one
+DATABASE_URL and race each other.
+
+    NODE_ID=eu-1          # enables cluster mode; unique per instance
+
+The alert claim is the atomic insert of the SeenItem (unique dedupe_key)
+together with its outbox row, so exactly one node's transaction commits:
+that node owns the alert and one outbox worker (of any node) sends it. Status
+transitions are keyed by their number in the symbol's shared history
+(`GATE:SPOT:ABC:TRADING_OPEN:2`, see poller._sequenced), never by local time,
+so nodes that see one transition seconds apart race for the same key. Every
+node records its own first sighting in `detections`, the loser after its
+claim failed, so per-node win rates and how far behind the winner the losers
+were can be compared (`/nodes`; assumes NTP-synced hosts).
+
+Nodes heartbeat into `nodes`. Outbox rows left `sending` by a node whose
+heartbeat is older than NODE_DEAD_SEC are handed back to `pending`, so a
+crashed node's in-flight alerts are delivered by the others (at least once:
+a node that was only partitioned may have sent them already). Jobs that
+must run once per cluster (archival) run on the oldest live node. Grouped
+listings fold into the head found in the shared outbox, whichever node
+posted it.
+"""
+import asyncio
+import os
+import socket
+import statistics
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
+
+from app.metrics import inc
+from app.store import Detection, Node, OutboxItem
+from app.utils.logging import logger
+from app.utils.time import now_utc
+
+NODE_ID = os.getenv("NODE_ID", "")
+NODE_HEARTBEAT_SEC = float(os.getenv("NODE_HEARTBEAT_SEC", "10"))
+NODE_DEAD_SEC = float(os.getenv("NODE_DEAD_SEC", "60"))
+NODE_STATS_DAYS = float(os.getenv("NODE_STATS_DAYS", "30"))
+
+
+def _utc(dt: datetime) -> datetime:
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)  # SQLite drops tzinfo
+
+
+class Cluster:
+    def __init__(self, node_id: str = NODE_ID):
+        self.node_id = node_id
+        self.started_at = now_utc()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.node_id)
+
+    # ---------- claims ----------
+    def won(self, dedupe_key: str, detected_at: datetime) -> Detection:
+        """Detection row to add inside the claim transaction (count it with claimed() once committed)."""
+        return Detection(dedupe_key=dedupe_key, node_id=self.node_id, detected_at=detected_at, won=True)
+
+    def claimed(self) -> None:
+        inc("cluster.won")
+
+    async def lost(self, db, dedupe_key: str, detected_at: datetime) -> None:
+        """Another node (or an earlier run of ours) holds the claim; keep our sighting for comparison."""
+        db.add(Detection(dedupe_key=dedupe_key, node_id=self.node_id, detected_at=detected_at, won=False))
+        try:
+            await db.commit()
+            inc("cluster.lost")
+        except IntegrityError:
+            await db.rollback()  # already recorded a sighting of this key
+
+    # ---------- liveness ----------
+    async def heartbeat(self, db_sessionmaker) -> None:
+        async with db_sessionmaker() as db:
+            await db.merge(Node(node_id=self.node_id, host=socket.gethostname(), pid=os.getpid(),
+                                started_at=self.started_at, heartbeat_at=now_utc()))
+            await db.commit()
+
+    async def reap(self, db_sessionmaker, dead_sec: float = NODE_DEAD_SEC) -> int:
+        """Return outbox rows held by dead nodes to `pending`; returns how many."""
+        cutoff = now_utc() - timedelta(seconds=dead_sec)
+        async with db_sessionmaker() as db:
+            alive = select(Node.node_id).where(Node.heartbeat_at >= cutoff)
+            res = await db.execute(
+                update(OutboxItem)
+                .where(OutboxItem.status == "sending", OutboxItem.claimed_by.is_not(None),
+                       OutboxItem.claimed_by.not_in(alive))
+                .values(status="pending", next_attempt_at=now_utc(), claimed_by=None)
+            )
+            await db.commit()
+        if res.rowcount:
+            inc("cluster.reaped", res.rowcount)
+            logger.warning("[CLUSTER] took over {count} in-flight alerts from dead nodes", count=res.rowcount)
+        return res.rowcount or 0
+
+    async def alive(self, db_sessionmaker, dead_sec: float = NODE_DEAD_SEC) -> list[str]:
+        """Live node ids, oldest first; the first one is the leader for singleton jobs (archival)."""
+        cutoff = now_utc() - timedelta(seconds=dead_sec)
+        async with db_sessionmaker() as db:
+            return list((await db.execute(
+                select(Node.node_id).where(Node.heartbeat_at >= cutoff).order_by(Node.started_at, Node.node_id)
+            )).scalars())
+
+    def recoverable(self):
+        """Outbox filter for rows this node may reset on startup: its own, unowned or a dead node's."""
+        cutoff = now_utc() - timedelta(seconds=NODE_DEAD_SEC)
+        alive = select(Node.node_id).where(Node.heartbeat_at >= cutoff, Node.node_id != self.node_id)
+        return or_(OutboxItem.claimed_by.is_(None), OutboxItem.claimed_by.not_in(alive))
+
+    async def run(self, db_sessionmaker, interval: float = NODE_HEARTBEAT_SEC) -> None:
+        while True:
+            try:
+                await self.heartbeat(db_sessionmaker)
+                await self.reap(db_sessionmaker)
+            except Exception as e:
+                logger.warning("[CLUSTER] heartbeat failed: {error}", error=e)
+            await asyncio.sleep(interval)
+
+    # ---------- stats ----------
+    async def stats(self, db_sessionmaker, days: float = NODE_STATS_DAYS) -> dict[str, dict]:
+        """Per node: liveness, wins/losses and how far behind the winner its lost sightings were."""
+        now = now_utc()
+        since = now - timedelta(days=days)
+        out: dict[str, dict] = {}
+        async with db_sessionmaker() as db:
+            for node in (await db.execute(select(Node).order_by(Node.node_id))).scalars():
+                age = (now - _utc(node.heartbeat_at)).total_seconds()
+                out[node.node_id] = {"alive": age < NODE_DEAD_SEC, "heartbeat_age_s": round(age, 1),
+                                     "host": node.host, "won": 0, "lost": 0, "behind_ms": []}
+            rows = await db.execute(
+                select(Detection.node_id, Detection.won, func.count())
+                .where(Detection.detected_at >= since)
+                .group_by(Detection.node_id, Detection.won)
+            )
+            for node_id, won, n in rows:
+                entry = out.setdefault(node_id, {"alive": False, "heartbeat_age_s": None, "host": "?",
+                                                 "won": 0, "lost": 0, "behind_ms": []})
+                entry["won" if won else "lost"] += n
+            winner = aliased(Detection)
+            lags = await db.execute(
+                select(Detection.node_id, Detection.detected_at, winner.detected_at)
+                .join(winner, (winner.dedupe_key == Detection.dedupe_key) & winner.won.is_(True))
+                .where(Detection.won.is_(False), Detection.detected_at >= since)
+            )
+            for node_id, lost_at, won_at in lags:
+                out[node_id]["behind_ms"].append((_utc(lost_at) - _utc(won_at)).total_seconds() * 1000)
+        for entry in out.values():
+            total = entry["won"] + entry["lost"]
+            entry["win_rate"] = entry["won"] / total if total else None
+            behind = entry.pop("behind_ms")
+            entry["median_behind_ms"] = statistics.median(behind) if behind else None
+        return out
+
+
+cluster = Cluster()
@@ -1,12 +1,32 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional, Union
 import os
 
+import yaml
+
+# Adapter set + poll intervals; watched at runtime (see poller.run_all)
+EXCHANGES_FILE = os.getenv("EXCHANGES_FILE", "exchanges.yaml")
+CONFIG_WATCH_SEC = float(os.getenv("CONFIG_WATCH_SEC", "5"))
+# announcement source per exchange, "|" = fallback order (see announcements/sources.py)
+ANN_SOURCES = os.getenv("ANN_SOURCES", "BITGET=api|html,BINGX=html,KUCOIN=api,OKX=api,BINANCE=api,BYBIT=api")
+# while on a fallback source, retry the primary this often (0 = stay on the fallback)
+ANN_PRIMARY_RETRY_SEC = float(os.getenv("ANN_PRIMARY_RETRY_SEC", "3600"))
+
 class ExchangeCfg(BaseModel):
     name: str               # canonical, e.g., KUCOIN, BINGX
-    module: str             # python import path to adapter
+    module: str = ""        # python import path to adapter ...
+    spec: Union[str, dict, None] = None   # ... or a declarative spec (built-in key or inline, see exchanges/spec.py)
     enabled: bool = True
-    poll_seconds: float = 2.0
+    poll_seconds: float = 2.0      # floor; 0 = as fast as the shared exchange budget allows
+
+    @property
+    def key(self) -> str:
+        """Identity of a running adapter across config reloads."""
+        if self.module:
+            return self.module
+        if isinstance(self.spec, str):
+            return f"spec:{self.spec}"
+        return f"spec:{self.name}:{(self.spec or {}).get('market_type', 'SPOT')}"
 
 class Settings(BaseModel):
     bot_token: str = Field(..., alias="BOT_TOKEN")
@@ -17,13 +37,21 @@ class Settings(BaseModel):
         3: ("Tier 3", "RSS/HTML"),
     }
     exchanges: List[ExchangeCfg] = [
-        # Requested set — all enabled by default
+        # Requested set — enabled by default; the spec-based venues below are opt-in
         ExchangeCfg(name="GATE",   module="app.exchanges.gate_spot",     enabled=True,  poll_seconds=2.0),
         ExchangeCfg(name="BINGX",  module="app.exchanges.bingx_spot",    enabled=True,  poll_seconds=2.0),
         ExchangeCfg(name="BINGX",  module="app.exchanges.bingx_futures", enabled=True,  poll_seconds=2.0),
         ExchangeCfg(name="BITGET", module="app.exchanges.bitget_spot",   enabled=True,  poll_seconds=2.0),
         ExchangeCfg(name="KUCOIN", module="app.exchanges.kucoin_spot",   enabled=True,  poll_seconds=2.0),
         ExchangeCfg(name="KUCOIN", module="app.exchanges.kucoin_futures",enabled=True,  poll_seconds=2.0),
+        ExchangeCfg(name="BINANCE", spec="binance_spot",     enabled=False, poll_seconds=2.0),
+        ExchangeCfg(name="BINANCE", spec="binance_futures",  enabled=False, poll_seconds=2.0),
+        ExchangeCfg(name="OKX",     spec="okx_spot",         enabled=False, poll_seconds=2.0),
+        ExchangeCfg(name="OKX",     spec="okx_futures",      enabled=False, poll_seconds=2.0),
+        ExchangeCfg(name="MEXC",    spec="mexc_spot",        enabled=False, poll_seconds=2.0),
+        ExchangeCfg(name="MEXC",    spec="mexc_futures",     enabled=False, poll_seconds=2.0),
+        ExchangeCfg(name="BYBIT",   spec="bybit_spot",       enabled=False, poll_seconds=2.0),
+        ExchangeCfg(name="BYBIT",   spec="bybit_futures",    enabled=False, poll_seconds=2.0),
     ]
     database_url: str = Field(default=os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./bot.db"))
 
@@ -31,8 +59,40 @@ class Settings(BaseModel):
         populate_by_name = True
 
 
+def config_mtime(path: str = EXCHANGES_FILE) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def load_exchanges(path: str = EXCHANGES_FILE) -> Optional[List[ExchangeCfg]]:
+    """
+    Read the adapter list from YAML; None if the file does not exist.
+
+        exchanges:
+          - {name: GATE, module: app.exchanges.gate_spot, poll_seconds: 2}
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+    except FileNotFoundError:
+        return None
+    items = data.get("exchanges", []) if isinstance(data, dict) else data
+    cfgs = [ExchangeCfg(**it) for it in items or []]
+    keys = [c.key for c in cfgs]
+    dupes = {k for k in keys if keys.count(k) > 1}
+    if dupes:
+        raise ValueError(f"{path}: duplicate adapters {sorted(dupes)}")
+    return cfgs
+
+
 def load_settings() -> Settings:
-    return Settings(
+    settings = Settings(
         BOT_TOKEN=os.getenv("BOT_TOKEN", ""),
         TARGET_CHAT_ID=os.getenv("TARGET_CHAT_ID", ""),
-    )
\ No newline at end of file
+    )
+    exchanges = load_exchanges()
+    if exchanges is not None:
+        settings.exchanges = exchanges
+    return settings
\ No newline at end of file
@@ -0,0 +1,107 @@
+# app/edit_queue.py
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+
+from app.metrics import inc
+from app.utils.logging import logger
+
+EDIT_DEBOUNCE_SEC = float(os.getenv("EDIT_DEBOUNCE_SEC", "2.0"))
+# Telegram allows ~20 messages/minute into one group/channel; edits count too
+EDIT_MIN_INTERVAL = float(os.getenv("EDIT_MIN_INTERVAL", "3.0"))
+_HASH_CACHE = 10_000
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+class EditQueue:
+    """
+    Debounced, content-hashed Telegram message edits.
+
+    submit() returns at once. Edits of the same message arriving within
+    `window` seconds are merged (last text wins); a flush skips text whose
+    hash matches what was last sent for that message, spaces edits by
+    `min_interval` and waits out RetryAfter instead of dropping the edit.
+    """
+
+    def __init__(self, bot, window: float = EDIT_DEBOUNCE_SEC, min_interval: float = EDIT_MIN_INTERVAL):
+        self.bot = bot
+        self.window = window
+        self.min_interval = min_interval
+        self._pending: dict[tuple, tuple[str, float]] = {}   # (chat, msg) -> (text, due)
+        self._sent: OrderedDict[tuple, bytes] = OrderedDict()  # last sent hash, LRU-bounded
+        self._wake = asyncio.Event()
+        self._last_edit = 0.0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(self, message_id: int, text: str, chat_id=None) -> None:
+        key = (chat_id or self.bot._default_chat_id, message_id)
+        if key in self._pending:
+            inc("edits.merged")
+            due = self._pending[key][1]
+        else:
+            due = time.monotonic() + self.window
+        self._pending[key] = (text, due)
+        self._wake.set()
+
+    def _remember(self, key: tuple, digest: bytes) -> None:
+        self._sent[key] = digest
+        self._sent.move_to_end(key)
+        while len(self._sent) > _HASH_CACHE:
+            self._sent.popitem(last=False)
+
+    async def _send(self, key: tuple, text: str) -> None:
+        digest = _digest(text)
+        if self._sent.get(key) == digest:
+            inc("edits.skipped_same")
+            return
+        wait = self._last_edit + self.min_interval - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        chat_id, message_id = key
+        try:
+            await self.bot.edit_message_text(
+                chat_id=chat_id, message_id=message_id, text=text, disable_web_page_preview=True,
+            )
+            inc("edits.sent")
+            self._remember(key, digest)
+        except Exception as e:
+            retry_after = getattr(e, "retry_after", None)
+            if retry_after is not None:
+                delay = retry_after.total_seconds() if hasattr(retry_after, "total_seconds") else float(retry_after)
+                logger.warning("[EDIT] flood control, retrying msg_id={message_id} in {delay:.0f}s", message_id=message_id, delay=delay)
+                inc("edits.retry_after")
+                if key not in self._pending:  # a newer text submitted meanwhile wins
+                    self._pending[key] = (text, time.monotonic() + delay)
+            elif "not modified" in str(e).lower():
+                inc("edits.not_modified")
+                self._remember(key, digest)
+            else:
+                inc("edits.failed")
+                logger.error("[EDIT] msg_id={message_id} failed: {error}", message_id=message_id, error=e)
+        finally:
+            self._last_edit = time.monotonic()
+
+    async def run(self) -> None:
+        while True:
+            if not self._pending:
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+            now = time.monotonic()
+            key, (text, due) = min(self._pending.items(), key=lambda kv: kv[1][1])
+            if due > now:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=due - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            del self._pending[key]
+            await self._send(key, text)
@@ -1,7 +1,15 @@
 # app/exchanges/base.py
+import asyncio
+import os
+import time
 from typing import AsyncIterator, Protocol, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from pydantic import BaseModel
+from app.breaker import CircuitBreaker
+from app.clock import clocks
+from app.metrics import inc, startup
+from app.proxies import pool
+from app.ratelimit import budget
 
 class Listing(BaseModel):
     exchange: str                # e.g., KUCOIN
@@ -13,6 +21,39 @@ class Listing(BaseModel):
     source_url: str
     speed_tier: int              # 1/2/3
     dedupe_key: str              # stable unique key across polls
+    event: str = "LISTED"        # LISTED | TRADING_OPEN | SUSPENDED | DELISTED
+    trading: bool = True         # tradable when the event was detected
+    first_seen: Optional[datetime] = None
+    open_after: Optional[float] = None  # s from first sight to trading open (TRADING_OPEN only)
+    poll_gap: Optional[float] = None    # s since the previous poll: the change happened within it
+
+# symbol statuses tracked by PollingAdapter
+PRE, TRADING, SUSPENDED, DELISTED = "PRE", "TRADING", "SUSPENDED", "DELISTED"
+EVENTS = ("LISTED", "TRADING_OPEN", "SUSPENDED", "DELISTED")
+STATUS_MIN_DWELL_SEC = float(os.getenv("STATUS_MIN_DWELL_SEC", "300"))
+
+
+def epoch_seconds(value) -> Optional[float]:
+    """Exchange timestamp field (epoch s or ms, number or string) → epoch seconds; None if unset."""
+    try:
+        t = float(value)
+    except (TypeError, ValueError):
+        return None
+    if t <= 0:
+        return None
+    return t / 1000 if t > 1e11 else t
+
+
+class SymbolState:
+    __slots__ = ("status", "first_seen", "last_change", "announced", "last_event", "open_at")
+
+    def __init__(self, status: str, now: float):
+        self.status = status
+        self.first_seen = now      # epoch seconds; seed time for symbols present at startup
+        self.last_change = now
+        self.announced = status    # status as of the last emitted event
+        self.last_event = float("-inf")
+        self.open_at: Optional[float] = None  # exchange-reported list/open time, epoch s (exchange clock)
 
 class ExchangeAdapter(Protocol):
     name: str
@@ -32,3 +73,244 @@ class AnnouncementAdapter(Protocol):
     name: str
     async def stream(self) -> AsyncIterator[Announcement]:
         ...
+
+
+class PollingAdapter:
+    """
+    Shared seed + poll loop for the symbol-list adapters.
+
+    Subclasses set name/market_type/source_name/endpoint/trade_url and implement
+    `_fetch()` (raw item list, requests via `_get`) and
+    `_parse(item) -> (base | None, tradable)`, or override `_extract(raw)`
+    to turn the whole response into (base, tradable) pairs (see spec.py).
+    Where the API reports when a symbol was listed or opens for trading, a
+    third element (epoch_seconds of it) becomes the events' source_time.
+
+    Each poll diffs the response against a per-symbol state map and emits
+    typed events: LISTED (new symbol, tradable or not), TRADING_OPEN
+    (pre-trading/suspended → tradable), SUSPENDED and DELISTED.
+
+    A symbol emits at most one status event per STATUS_MIN_DWELL_SEC: flips
+    inside that window are only tracked, and once it has passed the symbol's
+    current status is reported if it differs from the last one announced. A
+    symbol's first LISTED and its first TRADING_OPEN are never held back.
+    """
+    name: str = ""
+    market_type: str = "SPOT"
+    source_name: str = ""
+    endpoint: str = ""
+    trade_url: str = ""
+    rate_cost: float = 1.0       # request weight against the exchange budget
+
+    def __init__(self, poll_seconds: float = 2.0):
+        self.poll_seconds = poll_seconds
+        self._state: dict[str, SymbolState] = {}  # base -> status, first-seen, last-change
+        self.events = set(os.getenv("STATUS_EVENTS", ",".join(EVENTS)).split(","))
+        self.status_dwell = STATUS_MIN_DWELL_SEC
+        self._unsettled: set[str] = set()  # bases whose flips were held back
+        # >>> seed toggle <<<
+        self.seed_on_start = os.getenv("API_SEED_ON_START", "1") == "1"
+        self._seeded = False
+        self.polls = 0
+        self._last_poll: Optional[float] = None
+        clocks.track(self.name)
+        self.breaker = CircuitBreaker(
+            self.label,
+            threshold=int(os.getenv("BREAKER_THRESHOLD", "3")),
+            max_delay=float(os.getenv("BREAKER_MAX_DELAY", "300")),
+        )
+
+    @property
+    def label(self) -> str:
+        return f"{self.name}:{self.market_type}"
+
+    async def _fetch(self) -> list[dict]:
+        raise NotImplementedError
+
+    def _parse(self, it: dict) -> tuple[Optional[str], bool]:
+        raise NotImplementedError
+
+    def _extract(self, items) -> list[tuple]:
+        out = []
+        for it in items:
+            parsed = self._parse(it)
+            if parsed[0]:
+                out.append(parsed)
+        return out
+
+    @property
+    def rate_key(self) -> str:
+        return budget.key_for(self.name, self.endpoint)
+
+    def interval(self) -> float:
+        """poll_seconds, stretched when the shared exchange budget cannot sustain it."""
+        # each healthy egress proxy brings its own copy of the exchange's IP budget
+        shared = budget.interval(self.rate_key) / max(1, len(pool.healthy())) if pool else budget.interval(self.rate_key)
+        return max(self.poll_seconds, shared) or 1.0
+
+    async def _get(self, cx, url: str, **kwargs):
+        key = budget.key_for(self.name, url)
+        t0 = time.time()
+        if pool:
+            kwargs.setdefault("headers", cx.headers)  # the adapter's client settings, via the proxy's client
+            r, key = await pool.get(url, key, self.rate_cost, **kwargs)
+        else:
+            await budget.acquire(key, self.rate_cost)
+            t0 = time.time()
+            r = await cx.get(url, **kwargs)
+        t1 = time.time()
+        budget.observe(key, r.headers, r.status_code)
+        clocks.observe_date(self.name, r.headers.get("date"), t0, t1)
+        r.raise_for_status()
+        return r
+
+    def _key(self, base: str) -> str:
+        return f"{self.name}:{self.market_type}:{base}"
+
+    async def _seed(self) -> None:
+        now = time.time()
+        for base, tradable, *open_at in self._extract(await self._fetch()):
+            st = self._state[base] = SymbolState(TRADING if tradable else PRE, now)
+            st.open_at = open_at[0] if open_at else None
+        self._seeded = True
+        self._last_poll = now
+
+    async def seed(self) -> bool:
+        """One-time snapshot of the current symbols to avoid legacy spam."""
+        if not self._seeded and self.seed_on_start:
+            try:
+                await self._seed()
+                self.breaker.success()
+            except Exception as e:
+                self.breaker.failure(e)
+        return self._seeded or not self.seed_on_start
+
+    def _event(self, event: str, base: str, st: SymbolState, now: float, first: bool = False) -> Listing:
+        dedupe_key = self._key(base)
+        if not first:
+            # later transitions of an already-alerted symbol: handle_listing appends the
+            # transition's sequence number from the shared store, the same on every node
+            dedupe_key = f"{dedupe_key}:{event}"
+        open_after = None
+        if event == "TRADING_OPEN" and st.status == PRE:
+            open_after = now - st.first_seen
+        source_time = None
+        if st.open_at and (event == "LISTED" or open_after is not None):
+            # the API's list/open time; still provisional until an announcement confirms it
+            source_time = datetime.fromtimestamp(st.open_at, tz=timezone.utc)
+        return Listing(
+            exchange=self.name,
+            market_type=self.market_type,
+            symbol=base,
+            source_time=source_time,
+            provisional=True,
+            source_name=self.source_name,
+            source_url=self.trade_url.format(base=base),
+            speed_tier=2,
+            dedupe_key=dedupe_key,
+            event=event,
+            trading=event == "TRADING_OPEN" or (event == "LISTED" and st.status == TRADING),
+            first_seen=datetime.fromtimestamp(st.first_seen, tz=timezone.utc),
+            open_after=open_after,
+            poll_gap=now - self._last_poll if self._last_poll is not None else None,
+        )
+
+    def _announce(self, base: str, st: SymbolState, ev: Listing, now: float, damp: bool = True) -> Optional[Listing]:
+        """Hysteresis: within status_dwell of the symbol's last event a flip is only tracked."""
+        if damp and now - st.last_event < self.status_dwell:
+            self._unsettled.add(base)
+            inc("status.damped")
+            return None
+        st.announced, st.last_event = st.status, now
+        self._unsettled.discard(base)
+        return ev
+
+    def _settle(self, now: float) -> list[Listing]:
+        """Report the status of damped symbols whose window has passed, unless they flipped back."""
+        out = []
+        for base in list(self._unsettled):
+            st = self._state[base]
+            if now - st.last_event < self.status_dwell:
+                continue
+            self._unsettled.discard(base)
+            if st.status == st.announced:
+                continue
+            if st.status in (TRADING, PRE) and st.announced == DELISTED:
+                event = "LISTED"
+            else:
+                event = "TRADING_OPEN" if st.status == TRADING else st.status
+            out.append(self._event(event, base, st, now))
+            st.announced, st.last_event = st.status, now
+        return out
+
+    def _transition(self, base: str, tradable: bool, now: float, open_at: Optional[float] = None) -> Optional[Listing]:
+        st = self._state.get(base)
+        if st is None:
+            st = self._state[base] = SymbolState(TRADING if tradable else PRE, now)
+            st.open_at = open_at
+            return self._announce(base, st, self._event("LISTED", base, st, now, first=True), now, damp=False)
+        if open_at is not None:
+            st.open_at = open_at
+        if st.status == DELISTED:
+            st.status, st.last_change = (TRADING if tradable else PRE), now
+            return self._announce(base, st, self._event("LISTED", base, st, now), now)
+        if tradable and st.status != TRADING:
+            ev = self._event("TRADING_OPEN", base, st, now)
+            opening = st.status == PRE
+            st.status, st.last_change = TRADING, now
+            return self._announce(base, st, ev, now, damp=not opening)
+        if not tradable and st.status == TRADING:
+            st.status, st.last_change = SUSPENDED, now
+            return self._announce(base, st, self._event("SUSPENDED", base, st, now), now)
+        return None
+
+    async def poll(self) -> list[Listing]:
+        pairs = self._extract(await self._fetch())
+        now = time.time()
+        out: list[Listing] = []
+        present: set[str] = set()
+        for base, tradable, *open_at in pairs:
+            present.add(base)
+            ev = self._transition(base, tradable, now, open_at[0] if open_at else None)
+            if ev is not None and ev.event in self.events:
+                out.append(ev)
+
+        # vanished symbols; skip on truncated/partial responses
+        if len(present) * 2 >= len(self._state):
+            for base, st in self._state.items():
+                if base not in present and st.status != DELISTED:
+                    st.status, st.last_change = DELISTED, now
+                    ev = self._announce(base, st, self._event("DELISTED", base, st, now), now)
+                    if ev is not None and "DELISTED" in self.events:
+                        out.append(ev)
+        out += [ev for ev in self._settle(now) if ev.event in self.events]
+
+        self._last_poll = now
+        self.polls += 1
+        if self.polls == 1:
+            startup.first_poll(self.label)
+        return out
+
+    async def stream(self) -> AsyncIterator[Listing]:
+        budget.register(self.rate_key, self.rate_cost)
+        try:
+            while True:
+                # open breaker: one sleep per cooldown instead of a request every poll
+                delay = self.breaker.delay()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    continue
+                listings: list[Listing] = []
+                try:
+                    # a failed seed is retried instead of alerting every existing pair
+                    if not self._seeded and self.seed_on_start:
+                        await self._seed()
+                    listings = await self.poll()
+                    self.breaker.success()
+                except Exception as e:
+                    self.breaker.failure(e)
+                for listing in listings:
+                    yield listing
+                await asyncio.sleep(self.interval())
+        finally:
+            budget.unregister(self.rate_key, self.rate_cost)
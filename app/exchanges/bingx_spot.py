@@ -1,8 +1,7 @@
 import os
 import httpx
-from typing import AsyncIterator
-from app.exchanges.base import Listing
-from app.utils.time import now_utc
+from typing import Optional
+from app.exchanges.base import PollingAdapter, epoch_seconds
 
 name = "BINGX"
 
@@ -16,62 +15,27 @@ ENDPOINT = os.getenv(
 TRADE_URL = os.getenv("BINGX_SPOT_TRADE_URL", "https://bingx.com/en-us/spot/{base}USDT")
 
 
-class BingXSpot:
-    def __init__(self, poll_seconds: float = 2.0):
-        self.poll_seconds = poll_seconds
-        self._known: set[str] = set()
-        self.seed_on_start = os.getenv("API_SEED_ON_START", "1") == "1"
-        self._seeded = False
+class BingXSpot(PollingAdapter):
+    name = name
+    market_type = "SPOT"
+    source_name = "BingX spot symbols API"
+    endpoint = ENDPOINT
+    trade_url = TRADE_URL
 
     async def _fetch(self) -> list[dict]:
         async with httpx.AsyncClient(timeout=10, headers=HEADERS) as cx:
-            r = await cx.get(ENDPOINT)
-            r.raise_for_status()
+            r = await self._get(cx, ENDPOINT)
             data = r.json()
-            return (data.get("data") or data.get("symbols") or [])
-
-    async def stream(self) -> AsyncIterator[Listing]:
-        import asyncio
-
-        if not self._seeded and self.seed_on_start:
-            try:
-                for it in await self._fetch():
-                    sym = it.get("symbol") or it.get("s") or ""
-                    if not sym.endswith("USDT"):
-                        continue
-                    base = sym[:-5]  # strip 'USDT'
-                    dedupe_key = f"BINGX:SPOT:{base}"
-                    self._known.add(dedupe_key)
-                self._seeded = True
-            except Exception:
-                await asyncio.sleep(1)
-
-        while True:
-            try:
-                for it in await self._fetch():
-                    sym = it.get("symbol") or it.get("s") or ""
-                    if not sym.endswith("USDT"):
-                        continue
-                    base = sym[:-5]
-                    dedupe_key = f"BINGX:SPOT:{base}"
-                    if dedupe_key in self._known:
-                        continue
-                    self._known.add(dedupe_key)
-
-                    yield Listing(
-                        exchange=name,
-                        market_type="SPOT",
-                        symbol=base,
-                        source_time=None,
-                        provisional=True,
-                        source_name="BingX spot symbols API",
-                        source_url=TRADE_URL.format(base=base),
-                        speed_tier=2,
-                        dedupe_key=dedupe_key,
-                    )
-            except Exception:
-                await asyncio.sleep(1)
-            await asyncio.sleep(self.poll_seconds)
+            payload = data.get("data") or data.get("symbols") or []
+            # v1 wraps the list: {"data": {"symbols": [...]}}
+            return payload.get("symbols", []) if isinstance(payload, dict) else payload
+
+    def _parse(self, it: dict) -> tuple[Optional[str], bool, Optional[float]]:
+        sym = it.get("symbol") or it.get("s") or ""
+        if not sym.endswith("USDT"):
+            return None, False, None
+        # status 1 = online; other codes are pre-open / suspended / offline; timeOnline = listing time (ms)
+        return sym[:-5], it.get("status") in {1, None}, epoch_seconds(it.get("timeOnline"))  # strip '-USDT'
 
 
 Adapter = BingXSpot
@@ -0,0 +1,189 @@
+# app/exchanges/spec.py
+"""
+Declarative symbol-list adapters.
+
+A venue is described by an AdapterSpec (endpoint, path to the item list,
+base/symbol field, quote filter, status field + tradable values, trade URL)
+instead of a hand-written module. Each spec is compiled once into a plain
+Python function, so extraction is a single flat loop with the field names
+and filter sets baked in as constants:
+
+    exchanges.yaml
+      - {name: BINANCE, spec: binance_spot}
+      - name: FOO
+        spec: {market_type: SPOT, endpoint: "https://api.foo/symbols",
+               items: data, base: baseCcy, quote_field: quoteCcy,
+               status: state, tradable: [live], open_time: listTime,
+               trade_url: "https://foo/{base}"}
+"""
+import os
+from typing import Callable, Optional, Union
+
+import httpx
+from pydantic import BaseModel
+
+from app.exchanges.base import PollingAdapter, epoch_seconds
+
+
+class AdapterSpec(BaseModel):
+    name: str = ""
+    market_type: str = "SPOT"
+    source_name: str = ""
+    endpoint: str
+    items: str = ""                     # dotted path to the item list; "" = document root
+    base: Optional[str] = None          # field holding the base asset ...
+    symbol: Optional[str] = None        # ... or the pair field, base = symbol minus `suffix`
+    suffix: str = "USDT"
+    quote_field: Optional[str] = None   # keep items whose quote_field == quote
+    quote: str = "USDT"
+    where: dict[str, list] = {}         # extra equality filters: field -> allowed values
+    status: Optional[str] = None        # None = every listed item is tradable
+    tradable: list = []
+    open_time: Optional[str] = None     # list/open time field (epoch s or ms) -> Listing.source_time
+    trade_url: str = ""
+    rate_cost: float = 1.0
+
+
+def compile_extractor(spec: AdapterSpec) -> Callable[[object], list[tuple[str, bool]]]:
+    """Generate `extract(doc) -> [(base, tradable), ...]` specialised for one spec."""
+    if not spec.base and not spec.symbol:
+        raise ValueError(f"{spec.name} {spec.market_type}: spec needs `base` or `symbol`")
+    consts: dict[str, object] = {}
+
+    def const(value) -> str:
+        name = f"_c{len(consts)}"
+        consts[name] = value
+        return name
+
+    src = ["def extract(doc):", "    items = doc"]
+    for part in filter(None, spec.items.split(".")):
+        src.append(f"    items = (items or {{}}).get({part!r})")
+    src += [
+        "    out = []",
+        "    append = out.append",
+        "    for it in items or ():",
+        "        get = it.get",
+    ]
+    if spec.quote_field:
+        src.append(f"        if get({spec.quote_field!r}) != {spec.quote!r}: continue")
+    for field, allowed in spec.where.items():
+        src.append(f"        if get({field!r}) not in {const(frozenset(allowed))}: continue")
+    if spec.base:
+        src.append(f"        b = get({spec.base!r})")
+    else:
+        n = len(spec.suffix)
+        src += [
+            f"        s = get({spec.symbol!r}) or ''",
+            f"        if not s.endswith({spec.suffix!r}): continue",
+            f"        b = s[:-{n}]" if n else "        b = s",
+        ]
+    src.append("        if not b: continue")
+    tradable = f"get({spec.status!r}) in {const(frozenset(spec.tradable))}" if spec.status else "True"
+    if spec.open_time:
+        src.append(f"        append((b, {tradable}, {const(epoch_seconds)}(get({spec.open_time!r}))))")
+    else:
+        src.append(f"        append((b, {tradable}))")
+    src.append("    return out")
+
+    namespace = dict(consts)
+    exec(compile("\n".join(src), f"<spec {spec.name} {spec.market_type}>", "exec"), namespace)
+    return namespace["extract"]
+
+
+class SpecAdapter(PollingAdapter):
+    """PollingAdapter driven by an AdapterSpec; `_fetch` returns the raw document."""
+    spec: AdapterSpec
+
+    async def _fetch(self):
+        async with httpx.AsyncClient(timeout=10, headers={"Accept": "application/json"}) as cx:
+            r = await self._get(cx, self.endpoint)
+            return r.json()
+
+
+def adapter_for(spec: AdapterSpec) -> type:
+    """Build an adapter class (usable as an `Adapter` factory) for a spec."""
+    return type(f"{spec.name.title()}{spec.market_type.title()}Spec", (SpecAdapter,), {
+        "spec": spec,
+        "name": spec.name,
+        "market_type": spec.market_type,
+        "source_name": spec.source_name or f"{spec.name} {spec.market_type.lower()} API",
+        "endpoint": spec.endpoint,
+        "trade_url": spec.trade_url,
+        "rate_cost": spec.rate_cost,
+        "_extract": staticmethod(compile_extractor(spec)),
+    })
+
+
+def resolve(spec: Union[str, dict], name: str = "") -> AdapterSpec:
+    """Built-in spec by key, or an inline mapping from the config file."""
+    if isinstance(spec, str):
+        if spec not in SPECS:
+            raise KeyError(f"unknown adapter spec {spec!r}; built-in: {', '.join(sorted(SPECS))}")
+        out = SPECS[spec]
+    else:
+        out = AdapterSpec(**{"name": name, **spec})
+    return out.model_copy(update={"name": name}) if name else out
+
+
+SPECS: dict[str, AdapterSpec] = {
+    "binance_spot": AdapterSpec(
+        name="BINANCE", market_type="SPOT", source_name="Binance exchangeInfo API",
+        endpoint=os.getenv("BINANCE_SPOT_ENDPOINT", "https://api.binance.com/api/v3/exchangeInfo"),
+        items="symbols", base="baseAsset", quote_field="quoteAsset",
+        status="status", tradable=["TRADING"],
+        trade_url=os.getenv("BINANCE_TRADE_URL", "https://www.binance.com/en/trade/{base}_USDT"),
+        rate_cost=20,  # full exchangeInfo weight
+    ),
+    "binance_futures": AdapterSpec(
+        name="BINANCE", market_type="FUTURES", source_name="Binance USDⓈ-M exchangeInfo API",
+        endpoint=os.getenv("BINANCE_FUTURES_ENDPOINT", "https://fapi.binance.com/fapi/v1/exchangeInfo"),
+        items="symbols", base="baseAsset", quote_field="quoteAsset", where={"contractType": ["PERPETUAL"]},
+        status="status", tradable=["TRADING"], open_time="onboardDate",
+        trade_url=os.getenv("BINANCE_FUTURES_TRADE_URL", "https://www.binance.com/en/futures/{base}USDT"),
+    ),
+    "okx_spot": AdapterSpec(
+        name="OKX", market_type="SPOT", source_name="OKX instruments API",
+        endpoint=os.getenv("OKX_SPOT_ENDPOINT", "https://www.okx.com/api/v5/public/instruments?instType=SPOT"),
+        items="data", base="baseCcy", quote_field="quoteCcy",
+        status="state", tradable=["live"], open_time="listTime",
+        trade_url=os.getenv("OKX_TRADE_URL", "https://www.okx.com/trade-spot/{base}-USDT"),
+    ),
+    "okx_futures": AdapterSpec(
+        name="OKX", market_type="FUTURES", source_name="OKX instruments API",
+        endpoint=os.getenv("OKX_FUTURES_ENDPOINT", "https://www.okx.com/api/v5/public/instruments?instType=SWAP"),
+        items="data", base="ctValCcy", quote_field="settleCcy",
+        status="state", tradable=["live"], open_time="listTime",
+        trade_url=os.getenv("OKX_FUTURES_TRADE_URL", "https://www.okx.com/trade-swap/{base}-USDT-SWAP"),
+    ),
+    "mexc_spot": AdapterSpec(
+        name="MEXC", market_type="SPOT", source_name="MEXC exchangeInfo API",
+        endpoint=os.getenv("MEXC_SPOT_ENDPOINT", "https://api.mexc.com/api/v3/exchangeInfo"),
+        items="symbols", base="baseAsset", quote_field="quoteAsset",
+        status="status", tradable=["1", "ENABLED"],
+        trade_url=os.getenv("MEXC_TRADE_URL", "https://www.mexc.com/exchange/{base}_USDT"),
+        rate_cost=10,
+    ),
+    "mexc_futures": AdapterSpec(
+        name="MEXC", market_type="FUTURES", source_name="MEXC contract detail API",
+        endpoint=os.getenv("MEXC_FUTURES_ENDPOINT", "https://contract.mexc.com/api/v1/contract/detail"),
+        items="data", base="baseCoin", quote_field="settleCoin",
+        status="state", tradable=[0],
+        trade_url=os.getenv("MEXC_FUTURES_TRADE_URL", "https://futures.mexc.com/exchange/{base}_USDT"),
+    ),
+    "bybit_spot": AdapterSpec(
+        name="BYBIT", market_type="SPOT", source_name="Bybit instruments-info API",
+        endpoint=os.getenv("BYBIT_SPOT_ENDPOINT", "https://api.bybit.com/v5/market/instruments-info?category=spot"),
+        items="result.list", base="baseCoin", quote_field="quoteCoin",
+        status="status", tradable=["Trading"],
+        trade_url=os.getenv("BYBIT_TRADE_URL", "https://www.bybit.com/en/trade/spot/{base}/USDT"),
+    ),
+    "bybit_futures": AdapterSpec(
+        name="BYBIT", market_type="FUTURES", source_name="Bybit instruments-info API",
+        # linear instruments are paginated; 1000 per page covers every USDT perpetual
+        endpoint=os.getenv("BYBIT_FUTURES_ENDPOINT",
+                      "https://api.bybit.com/v5/market/instruments-info?category=linear&limit=1000"),
+        items="result.list", base="baseCoin", quote_field="settleCoin", where={"contractType": ["LinearPerpetual"]},
+        status="status", tradable=["Trading"], open_time="launchTime",
+        trade_url=os.getenv("BYBIT_FUTURES_TRADE_URL", "https://www.bybit.com/trade/usdt/{base}USDT"),
+    ),
+}
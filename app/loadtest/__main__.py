@@ -0,0 +1,171 @@
+# app/loadtest/__main__.py
+"""
+Load test: run many adapter instances against the local mock upstream and
+report detection latency percentiles and event-loop lag.
+
+    python -m app.loadtest --instances 300 --poll 2 --duration 120 --latency-ms 80
+
+The mock server runs in a child process so its CPU does not skew the
+measured loop lag. Adapters are pointed at it through their *_ENDPOINT env
+vars, which must be set before the adapter modules are imported.
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import sys
+import time
+import urllib.request
+
+from app.loadtest.mock_server import ENDPOINT_ENV, VENUES
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return float("nan")
+    s = sorted(values)
+    k = (len(s) - 1) * p / 100
+    lo, hi = int(k), min(int(k) + 1, len(s) - 1)
+    return s[lo] + (s[hi] - s[lo]) * (k - lo)
+
+
+def _summary(label: str, values: list[float], unit: str = "ms") -> str:
+    if not values:
+        return f"{label:<28} n=0"
+    return (
+        f"{label:<28} n={len(values):<6} p50={percentile(values, 50):8.1f}{unit} "
+        f"p90={percentile(values, 90):8.1f}{unit} p99={percentile(values, 99):8.1f}{unit} "
+        f"max={max(values):8.1f}{unit}"
+    )
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Adapter load test against the mock upstream")
+    p.add_argument("--instances", type=int, default=120, help="total adapter instances (spread over venues)")
+    p.add_argument("--venues", default=",".join(VENUES), help="comma-separated subset of " + ",".join(VENUES))
+    p.add_argument("--poll", type=float, default=2.0, help="poll_seconds per adapter")
+    p.add_argument("--duration", type=float, default=60.0)
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--scale", type=float, default=1.0)
+    p.add_argument("--latency-ms", type=float, default=50.0)
+    p.add_argument("--jitter-ms", type=float, default=20.0)
+    p.add_argument("--error-rate", type=float, default=0.0)
+    p.add_argument("--rate-429", type=float, default=0.0)
+    p.add_argument("--inject-start", type=float, default=10.0)
+    p.add_argument("--inject-every", type=float, default=5.0)
+    p.add_argument("--pre-open", type=float, default=0.0, help="inject as pre-trading, open N seconds later")
+    p.add_argument("--lag-interval", type=float, default=0.05, help="loop lag sampling period, seconds")
+    p.add_argument("--budget", action="store_true", help="keep the shared per-exchange rate budget on (paces adapters)")
+    p.add_argument("--telegram", action="store_true", help="also send each detection to the stub Bot API")
+    return p.parse_args(argv)
+
+
+async def _start_server(args) -> asyncio.subprocess.Process:
+    inject_count = max(0, int((args.duration - args.inject_start) // args.inject_every))
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "app.loadtest.mock_server",
+        "--port", str(args.port), "--scale", str(args.scale),
+        "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+        "--error-rate", str(args.error_rate), "--rate-429", str(args.rate_429),
+        "--inject-start", str(args.inject_start), "--inject-every", str(args.inject_every),
+        "--inject-count", str(inject_count), "--pre-open", str(args.pre_open),
+        stdout=asyncio.subprocess.PIPE,
+    )
+    line = await asyncio.wait_for(proc.stdout.readline(), timeout=30)
+    if not line.startswith(b"READY"):
+        proc.kill()
+        raise SystemExit(f"mock server failed to start: {line!r}")
+    return proc
+
+
+def _get_json(url: str):
+    with urllib.request.urlopen(url, timeout=10) as r:
+        return json.loads(r.read())
+
+
+async def _lag_sampler(interval: float, out: list[float]):
+    loop = asyncio.get_running_loop()
+    while True:
+        t0 = loop.time()
+        await asyncio.sleep(interval)
+        out.append(max(0.0, (loop.time() - t0 - interval) * 1000))
+
+
+async def run(args) -> int:
+    base_url = f"http://127.0.0.1:{args.port}"
+    venues = [v.strip() for v in args.venues.split(",") if v.strip()]
+    for venue in venues:
+        os.environ[ENDPOINT_ENV[venue]] = base_url + VENUES[venue][0]
+    os.environ.setdefault("API_SEED_ON_START", "1")
+    # hundreds of instances of one venue would otherwise share (and be paced by) one IP budget
+    os.environ["RATE_BUDGET"] = "1" if args.budget else "0"
+
+    proc = await _start_server(args)
+    bot = None
+    if args.telegram:
+        from telegram import Bot
+        bot = Bot("123:mock", base_url=f"{base_url}/bot")
+        await bot.initialize()
+
+    detections: list[tuple[str, str, str, float]] = []  # (venue, base, event, wall time)
+    lag_ms: list[float] = []
+
+    async def drive(venue: str, adapter):
+        async for listing in adapter.stream():
+            detections.append((venue, listing.symbol, listing.event, time.time()))
+            if bot is not None:
+                await bot.send_message(chat_id=-100, text=f"{venue} {listing.symbol}")
+
+    tasks = [asyncio.create_task(_lag_sampler(args.lag_interval, lag_ms))]
+    for i in range(args.instances):
+        venue = venues[i % len(venues)]
+        module = importlib.import_module(f"app.exchanges.{venue}")
+        tasks.append(asyncio.create_task(drive(venue, module.Adapter(poll_seconds=args.poll))))
+
+    print(f"running {args.instances} adapters over {len(venues)} venues for {args.duration:.0f}s ...", flush=True)
+    try:
+        await asyncio.sleep(args.duration)
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        state = await asyncio.to_thread(_get_json, f"{base_url}/_mock/state")
+        proc.terminate()
+        await proc.wait()
+
+    listed_at = state["listed_at"]
+    opened_at = state["opened_at"] if args.pre_open > 0 else {}
+    per_venue: dict[str, list[float]] = {v: [] for v in venues}
+    spurious = 0
+    for venue, base, event, t in detections:
+        ref = opened_at if event == "TRADING_OPEN" else listed_at
+        at = ref.get(venue, {}).get(base)
+        if at is None:
+            spurious += 1  # e.g. a full re-emit after a failed seed
+            continue
+        per_venue[venue].append((t - at) * 1000)
+
+    injected = sum(len(listed_at.get(v, {})) for v in venues)
+    expected = sum(
+        (len(listed_at.get(v, {})) + len(opened_at.get(v, {}))) * sum(1 for i in range(args.instances) if venues[i % len(venues)] == v)
+        for v in venues
+    )
+    all_latency = [x for xs in per_venue.values() for x in xs]
+
+    print()
+    print(f"upstream requests: {sum(state['requests'].values())}  statuses: {state['statuses']}  telegram sends: {state['sends']}")
+    print(f"injected listings: {injected}  detections: {len(all_latency)}/{expected}  spurious: {spurious}")
+    print(_summary("detection latency (all)", all_latency))
+    for venue, xs in per_venue.items():
+        print(_summary(f"  {venue}", xs))
+    print(_summary("event-loop lag", lag_ms))
+    return 0 if len(all_latency) >= expected else 1
+
+
+def main(argv=None):
+    raise SystemExit(asyncio.run(run(parse_args(argv))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# app/loadtest/extract_bench.py
+"""
+Micro-benchmark: spec-compiled extractor vs a hand-written `_parse` loop.
+
+    python -m app.loadtest.extract_bench --items 3000 --repeat 2000
+
+Both turn the same KuCoin-shaped symbol list into (base, tradable) pairs;
+reports the best-of-5 time per call of each.
+"""
+import argparse
+import timeit
+
+from app.exchanges.kucoin_spot import KuCoinSpot
+from app.exchanges.spec import AdapterSpec, compile_extractor
+
+
+def _items(n: int) -> list[dict]:
+    return [
+        {"baseCurrency": f"C{i}", "quoteCurrency": "USDT" if i % 4 else "BTC", "enableTrading": i % 7 != 0}
+        for i in range(n)
+    ]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=3000)
+    ap.add_argument("--repeat", type=int, default=2000)
+    args = ap.parse_args()
+
+    items = _items(args.items)
+    compiled = compile_extractor(AdapterSpec(
+        name="KUCOIN", endpoint="-", base="baseCurrency", quote_field="quoteCurrency",
+        status="enableTrading", tradable=[True],
+    ))
+    hand = KuCoinSpot(poll_seconds=0)
+    assert compiled(items) == hand._extract(items)
+
+    for label, fn in (("compiled spec", lambda: compiled(items)), ("hand-written _parse", lambda: hand._extract(items))):
+        best = min(timeit.repeat(fn, number=args.repeat, repeat=5)) / args.repeat
+        print(f"{label:<22} {best * 1000:.3f} ms per call ({args.items} items)")
+
+
+if __name__ == "__main__":
+    main()
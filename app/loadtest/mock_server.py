@@ -0,0 +1,325 @@
+# app/loadtest/mock_server.py
+"""
+Local mock upstream for load testing.
+
+Serves the symbol endpoints polled by the Gate / BingX / Bitget / KuCoin
+adapters with realistic payload sizes, a stub Telegram Bot API that records
+every send, and a small control API:
+
+    GET  /_mock/state                      listed_at/opened_at, request/status counters
+    GET  /_mock/sends                      recorded Telegram calls
+    POST /_mock/inject?base=XYZ[&venue=gate_spot][&delay=5][&tradable=0]
+
+Run standalone:
+
+    python -m app.loadtest.mock_server --port 8765 --latency-ms 80 --rate-429 0.01
+"""
+import argparse
+import asyncio
+import heapq
+import json
+import random
+import string
+import time
+import zlib
+from email.utils import formatdate
+from urllib.parse import parse_qs, urlsplit
+
+
+# ---------- payload builders (field sets mirror the real APIs) ----------
+
+def _gate_item(base: str, tradable: bool) -> dict:
+    return {
+        "id": f"{base}_USDT", "base": base, "quote": "USDT", "fee": "0.2",
+        "min_base_amount": "0.001", "min_quote_amount": "3", "max_quote_amount": "5000000",
+        "amount_precision": 3, "precision": 6,
+        "trade_status": "tradable" if tradable else "untradable",
+        "sell_start": 0, "buy_start": 0,
+    }
+
+
+def _bingx_spot_item(base: str, tradable: bool) -> dict:
+    return {
+        "symbol": f"{base}-USDT", "minQty": 0.01, "maxQty": 100000, "minNotional": 5,
+        "maxNotional": 100000, "status": 1 if tradable else 0, "tickSize": 0.0001,
+        "stepSize": 0.01, "apiStateSell": tradable, "apiStateBuy": tradable, "timeOnline": 0,
+    }
+
+
+def _bingx_futures_item(base: str, tradable: bool) -> dict:
+    return {
+        "contractId": str(zlib.crc32(base.encode())), "symbol": f"{base}-USDT", "asset": base,
+        "size": "0.0001", "quantityPrecision": 4, "pricePrecision": 2, "feeRate": 0.0005,
+        "tradeMinLimit": 1, "currency": "USDT", "status": 1 if tradable else 0,
+    }
+
+
+def _bitget_item(base: str, tradable: bool) -> dict:
+    return {
+        "symbol": f"{base}USDT", "baseCoin": base, "quoteCoin": "USDT",
+        "minTradeAmount": "0", "maxTradeAmount": "999999999", "takerFeeRate": "0.001",
+        "makerFeeRate": "0.001", "pricePrecision": "4", "quantityPrecision": "2",
+        "quotePrecision": "4", "status": "online" if tradable else "gray",
+        "minTradeUSDT": "1", "buyLimitPriceRatio": "0.05", "sellLimitPriceRatio": "0.05",
+    }
+
+
+def _kucoin_spot_item(base: str, tradable: bool) -> dict:
+    return {
+        "symbol": f"{base}-USDT", "name": f"{base}-USDT", "baseCurrency": base,
+        "quoteCurrency": "USDT", "feeCurrency": "USDT", "market": "USDS",
+        "baseMinSize": "0.1", "quoteMinSize": "0.1", "baseMaxSize": "10000000000",
+        "quoteMaxSize": "99999999", "baseIncrement": "0.0001", "quoteIncrement": "0.000001",
+        "priceIncrement": "0.000001", "priceLimitRate": "0.1", "minFunds": "0.1",
+        "isMarginEnabled": False, "enableTrading": tradable,
+    }
+
+
+def _kucoin_futures_item(base: str, tradable: bool) -> dict:
+    return {
+        "symbol": f"{base}USDTM", "rootSymbol": "USDT", "type": "FFWCSX",
+        "baseCurrency": base, "quoteCurrency": "USDT", "settleCurrency": "USDT",
+        "maxOrderQty": 1000000, "maxPrice": 1000000.0, "lotSize": 1, "tickSize": 0.0001,
+        "multiplier": 1.0, "initialMargin": 0.05, "maintainMargin": 0.025,
+        "makerFeeRate": 0.0002, "takerFeeRate": 0.0006, "fundingFeeRate": 0.0001,
+        "isInverse": False, "status": "Open" if tradable else "Paused",
+    }
+
+
+# venue -> (path, symbols at scale=1.0, item builder, envelope)
+VENUES = {
+    "gate_spot": ("/api/v4/spot/currency_pairs", 2400, _gate_item, lambda items: items),
+    "bingx_spot": ("/openApi/spot/v1/common/symbols", 900, _bingx_spot_item,
+                   lambda items: {"code": 0, "msg": "", "debugMsg": "", "data": {"symbols": items}}),
+    "bingx_futures": ("/api/v1/contract/symbols", 400, _bingx_futures_item,
+                      lambda items: {"code": 0, "msg": "", "data": items}),
+    "bitget_spot": ("/api/v2/spot/public/symbols", 800, _bitget_item,
+                    lambda items: {"code": "00000", "msg": "success", "requestTime": int(time.time() * 1000), "data": items}),
+    "kucoin_spot": ("/api/v1/symbols", 1200, _kucoin_spot_item,
+                    lambda items: {"code": "200000", "data": items}),
+    "kucoin_futures": ("/api/v1/contracts/active", 450, _kucoin_futures_item,
+                       lambda items: {"code": "200000", "data": items}),
+}
+
+# env var each adapter module reads its endpoint from
+ENDPOINT_ENV = {
+    "gate_spot": "GATE_SPOT_ENDPOINT",
+    "bingx_spot": "BINGX_SPOT_SYMBOLS_ENDPOINT",
+    "bingx_futures": "BINGX_FUTURES_CONTRACTS_ENDPOINT",
+    "bitget_spot": "BITGET_SYMBOLS_ENDPOINT",
+    "kucoin_spot": "KUCOIN_SPOT_ENDPOINT",
+    "kucoin_futures": "KUCOIN_FUTURES_ENDPOINT",
+}
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 429: "Too Many Requests", 500: "Internal Server Error"}
+
+
+def _bases(n: int, rnd: random.Random) -> list[str]:
+    out: set[str] = set()
+    while len(out) < n:
+        out.add("".join(rnd.choices(string.ascii_uppercase, k=rnd.randint(3, 6))))
+    return sorted(out)
+
+
+class MockExchange:
+    def __init__(
+        self,
+        scale: float = 1.0,
+        latency_ms: float = 50.0,
+        jitter_ms: float = 20.0,
+        error_rate: float = 0.0,
+        rate_429: float = 0.0,
+        retry_after: int = 1,
+        seed: int = 7,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self._rnd = random.Random(seed)
+
+        self.symbols: dict[str, dict[str, bool]] = {}
+        for venue, (_, count, _, _) in VENUES.items():
+            self.symbols[venue] = {b: True for b in _bases(max(1, int(count * scale)), self._rnd)}
+        self.listed_at: dict[str, dict[str, float]] = {v: {} for v in VENUES}
+        self.opened_at: dict[str, dict[str, float]] = {v: {} for v in VENUES}
+        self.requests: dict[str, int] = {}
+        self.statuses: dict[int, int] = {}
+        self.sends: list[dict] = []
+
+        self._by_path = {path: venue for venue, (path, *_rest) in VENUES.items()}
+        self._pending: list[tuple[float, str, str, bool]] = []  # (at, venue, base, tradable)
+        self._payload: dict[str, bytes] = {}
+        self._server: asyncio.AbstractServer | None = None
+
+    # ---------- listings ----------
+    def inject(self, base: str, venues=None, at: float | None = None, tradable: bool = True):
+        """Schedule `base` to appear on `venues` (default: all) at wall time `at` (default: now)."""
+        at = time.time() if at is None else at
+        for venue in venues or VENUES:
+            heapq.heappush(self._pending, (at, venue, base.upper(), tradable))
+
+    def _apply_due(self):
+        now = time.time()
+        while self._pending and self._pending[0][0] <= now:
+            at, venue, base, tradable = heapq.heappop(self._pending)
+            self.symbols[venue][base] = tradable
+            self.listed_at[venue].setdefault(base, at)
+            if tradable:
+                self.opened_at[venue].setdefault(base, at)
+            self._payload.pop(venue, None)
+
+    def payload(self, venue: str) -> bytes:
+        body = self._payload.get(venue)
+        if body is None:
+            _, _, build, envelope = VENUES[venue]
+            items = [build(b, t) for b, t in self.symbols[venue].items()]
+            body = json.dumps(envelope(items), separators=(",", ":")).encode()
+            self._payload[venue] = body
+        return body
+
+    # ---------- telegram stub ----------
+    def _telegram(self, method: str, params: dict) -> dict:
+        self.sends.append({"method": method, "params": params, "t": time.time()})
+        if method == "getMe":
+            return {"id": 1, "is_bot": True, "first_name": "mock", "username": "mock_bot"}
+        if method in {"sendMessage", "editMessageText"}:
+            return {
+                "message_id": int(params.get("message_id") or len(self.sends)),
+                "date": int(time.time()),
+                "chat": {"id": int(params.get("chat_id") or 0), "type": "channel"},
+                "text": params.get("text", ""),
+            }
+        return True
+
+    # ---------- http ----------
+    async def _route(self, method: str, target: str, headers: dict, body: bytes):
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        path = url.path
+
+        if path.startswith("/_mock/"):
+            if path == "/_mock/state":
+                return 200, {}, {
+                    "listed_at": self.listed_at, "opened_at": self.opened_at, "requests": self.requests,
+                    "statuses": self.statuses, "sends": len(self.sends),
+                }
+            if path == "/_mock/sends":
+                return 200, {}, self.sends
+            if path == "/_mock/inject" and method == "POST" and query.get("base"):
+                venues = [query["venue"]] if query.get("venue") else None
+                self.inject(
+                    query["base"], venues,
+                    at=time.time() + float(query.get("delay", 0)),
+                    tradable=query.get("tradable", "1") != "0",
+                )
+                return 200, {}, {"ok": True}
+            return 404, {}, {"error": "unknown control path"}
+
+        if path.startswith("/bot") and path.count("/") == 2:
+            if "json" in headers.get("content-type", ""):
+                params = json.loads(body or b"{}")
+            else:
+                params = {k: v[-1] for k, v in parse_qs(body.decode(errors="replace")).items()}
+            return 200, {}, {"ok": True, "result": self._telegram(path.rsplit("/", 1)[1], params)}
+
+        venue = self._by_path.get(path)
+        if venue is None:
+            return 404, {}, {"error": "not found"}
+        self.requests[venue] = self.requests.get(venue, 0) + 1
+
+        delay = max(0.0, self.latency_ms + self._rnd.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+        await asyncio.sleep(delay)
+        roll = self._rnd.random()
+        if roll < self.rate_429:
+            return 429, {"Retry-After": str(self.retry_after)}, {"code": 429, "msg": "Too many requests"}
+        if roll < self.rate_429 + self.error_rate:
+            return 500, {}, {"code": 500, "msg": "Internal error"}
+        self._apply_due()
+        return 200, {}, self.payload(venue)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, target, _ = line.decode("latin-1").split(" ", 2)
+                headers: dict[str, str] = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    k, _, v = h.decode("latin-1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                length = int(headers.get("content-length", 0) or 0)
+                body = await reader.readexactly(length) if length else b""
+
+                status, extra, payload = await self._route(method, target, headers, body)
+                self.statuses[status] = self.statuses.get(status, 0) + 1
+                data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+                head = [
+                    f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}",
+                    "Content-Type: application/json",
+                    f"Content-Length: {len(data)}",
+                    f"Date: {formatdate(usegmt=True)}",
+                ]
+                head += [f"{k}: {v}" for k, v in extra.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + data)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        self._server = await asyncio.start_server(self._handle, host, port, backlog=1024)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Mock exchange + Telegram upstream")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--scale", type=float, default=1.0, help="payload size multiplier")
+    p.add_argument("--latency-ms", type=float, default=50.0)
+    p.add_argument("--jitter-ms", type=float, default=20.0)
+    p.add_argument("--error-rate", type=float, default=0.0)
+    p.add_argument("--rate-429", type=float, default=0.0)
+    p.add_argument("--retry-after", type=int, default=1)
+    p.add_argument("--inject-start", type=float, default=15.0, help="seconds before the first injected listing")
+    p.add_argument("--inject-every", type=float, default=10.0)
+    p.add_argument("--inject-count", type=int, default=0)
+    p.add_argument("--pre-open", type=float, default=0.0,
+                   help="list injected symbols as not tradable, opening trading this many seconds later")
+    return p.parse_args(argv)
+
+
+async def serve(args) -> None:
+    mock = MockExchange(
+        scale=args.scale, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, rate_429=args.rate_429, retry_after=args.retry_after,
+    )
+    t0 = time.time() + args.inject_start
+    for i in range(args.inject_count):
+        at = t0 + i * args.inject_every
+        if args.pre_open > 0:
+            mock.inject(f"NEW{i:04d}", at=at, tradable=False)
+            mock.inject(f"NEW{i:04d}", at=at + args.pre_open)
+        else:
+            mock.inject(f"NEW{i:04d}", at=at)
+    port = await mock.start(args.host, args.port)
+    print(f"READY {port}", flush=True)
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(serve(parse_args()))
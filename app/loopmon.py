@@ -0,0 +1,151 @@
+# app/loopmon.py
+"""
+Event-loop health monitor.
+
+A sampler coroutine sleeps LOOP_LAG_INTERVAL and records how late it wakes
+up (loop lag). A daemon watchdog thread checks the sampler's heartbeat; when
+it goes stale for longer than LOOP_SLOW_MS the loop is blocked, so the
+watchdog grabs the loop thread's current frame while the stall is still in
+progress and walks it up to a task's coroutine frame to name the culprit
+(`[ADAPTER] GATE:SPOT`, ...). Tasks are registered by a task factory the
+monitor installs (those already running when it starts are picked up from
+asyncio.all_tasks()). The sampler then reports the stall with that culprit.
+Nothing runs per callback, so the cost when nothing is slow is one wake-up
+per interval and a dict insert per task created.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from typing import Optional
+
+from app.metrics import counters, inc
+from app.utils.logging import logger
+
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.25"))
+LOOP_SLOW_MS = float(os.getenv("LOOP_SLOW_MS", "200"))
+_HISTORY = 240   # lag samples kept (~1 min at the default interval)
+_SLOW_KEPT = 50
+
+
+def _where(frame, depth: int = 3) -> str:
+    stack = traceback.extract_stack(frame)[-depth:]
+    return " < ".join(f"{os.path.basename(f.filename)}:{f.lineno} {f.name}" for f in reversed(stack))
+
+
+def _group(name: str) -> str:
+    if name.startswith("["):
+        return name.split("]", 1)[0] + "]"
+    if name.startswith("Task-"):
+        return "(unnamed)"
+    return name.split(":", 1)[0]
+
+
+class LoopMonitor:
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL, slow_ms: float = LOOP_SLOW_MS):
+        self.interval = interval
+        self.slow_ms = slow_ms
+        self.lag_ms: deque[float] = deque(maxlen=_HISTORY)
+        self.slow: deque[tuple[float, float, str, str]] = deque(maxlen=_SLOW_KEPT)  # (ts, ms, task, where)
+        self.max_lag_ms = 0.0
+        self._loop = None
+        self._thread_id = None
+        self._beat = time.monotonic()
+        self._culprit: Optional[tuple[str, str]] = None
+        self._stop = threading.Event()
+        self._frames: dict = {}   # coroutine frame -> task
+        self._prev_factory = None
+
+    # ---------- task tracking ----------
+    def _track(self, task: asyncio.Task) -> None:
+        frame = getattr(task.get_coro(), "cr_frame", None)
+        if frame is None:
+            return
+        self._frames[frame] = task
+        task.add_done_callback(lambda _: self._frames.pop(frame, None))
+
+    def _task_factory(self, loop, coro, **kwargs):
+        if self._prev_factory is not None:
+            task = self._prev_factory(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        self._track(task)
+        return task
+
+    def _task_name(self, frame) -> Optional[str]:
+        while frame is not None:
+            task = self._frames.get(frame)
+            if task is not None:
+                return task.get_name()
+            frame = frame.f_back
+        return None
+
+    # ---------- watchdog (separate thread) ----------
+    def _watchdog(self) -> None:
+        period = min(self.interval, self.slow_ms / 1000) / 2
+        while not self._stop.wait(period):
+            stalled = time.monotonic() - self._beat - self.interval
+            if stalled * 1000 < self.slow_ms or self._culprit is not None:
+                continue
+            frame = sys._current_frames().get(self._thread_id)
+            task = self._task_name(frame) or "(callback)"
+            self._culprit = (task, _where(frame) if frame is not None else "?")
+
+    # ---------- sampler ----------
+    async def run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._prev_factory = self._loop.get_task_factory()
+        self._loop.set_task_factory(self._task_factory)
+        for task in asyncio.all_tasks(self._loop):
+            self._track(task)
+        self._beat = time.monotonic()
+        self._stop.clear()
+        threading.Thread(target=self._watchdog, name="loopmon-watchdog", daemon=True).start()
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                now = time.monotonic()
+                # measured from the last beat, i.e. the same span the watchdog sees
+                lag = max(0.0, (now - self._beat - self.interval) * 1000)
+                self._beat = now
+                self.lag_ms.append(lag)
+                self.max_lag_ms = max(self.max_lag_ms, lag)
+                if lag >= self.slow_ms:
+                    self._report(lag)
+                self._culprit = None
+        finally:
+            self._stop.set()
+            if self._loop.get_task_factory() == self._task_factory:
+                self._loop.set_task_factory(self._prev_factory)
+
+    def _report(self, lag: float) -> None:
+        task, where = self._culprit or ("?", "stall ended before the watchdog looked")
+        self.slow.append((time.time(), lag, task, where))
+        inc("loop.slow")
+        logger.warning("[LOOP] blocked {lag:.0f} ms by {task} at {where}", lag=lag, task=task, where=where)
+
+    # ---------- views ----------
+    def snapshot(self) -> dict:
+        lags = sorted(self.lag_ms)
+        p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))] if lags else 0.0
+        return {
+            "lag_ms": round(self.lag_ms[-1], 1) if self.lag_ms else 0.0,
+            "avg_ms": round(sum(lags) / len(lags), 1) if lags else 0.0,
+            "p99_ms": round(p99, 1),
+            "max_ms": round(self.max_lag_ms, 1),
+            "slow": counters.get("loop.slow", 0),
+            "tasks": len(asyncio.all_tasks(self._loop)) if self._loop else 0,
+        }
+
+    def inventory(self) -> Counter:
+        """Live tasks grouped by name prefix, e.g. {'[ADAPTER]': 14, '[OUTBOX]': 4}."""
+        if self._loop is None:
+            return Counter()
+        return Counter(_group(t.get_name()) for t in asyncio.all_tasks(self._loop))
+
+
+monitor = LoopMonitor()
@@ -11,16 +11,28 @@ try:
 except Exception:
     pass
 
-from telegram import Update
-from telegram.ext import Application, CommandHandler
-from telegram.request import HTTPXRequest
-
-from app.config import load_settings
-from app.store import init_db
-from app.bot_handlers import register_admin
-from app.poller import run_all
-from app.reconciler import run_announcements
-from app.utils.logging import logger
+from app.metrics import startup
+
+with startup.phase("imports"):
+    from telegram import Update
+    from telegram.ext import Application, CommandHandler
+    from telegram.request import HTTPXRequest
+
+    from app.config import load_settings
+    from app.store import init_db
+    from app.bot_handlers import register_admin
+    from app.poller import build_adapters, seed_adapters, run_all
+    from app.symbol_index import index
+    from app.edit_queue import EditQueue
+    from app.outbox import Outbox
+    from app.archive import ARCHIVE_AFTER_DAYS, Archive
+    from app.loopmon import monitor
+    from app import profiling
+    from app.clock import clocks
+    from app.proxies import pool
+    from app.cluster import cluster
+    from app.utils.logging import logger
+    # app.reconciler / app.announcements (bs4, dateutil) are imported lazily in on_startup
 
 
 # ---------- simple /start for sanity check ----------
@@ -31,8 +43,10 @@ async def cmd_start(update: Update, _):
 async def on_startup(app: Application):
     """
     - Validates envs
-    - Initializes DB (creates tables)
+    - Runs DB init (create_all only on schema change), Telegram setup and
+      adapter seeding concurrently
     - Starts pollers + announcements reconciler as background tasks
+    - Logs a per-phase startup timeline; readiness = every adapter polled once
     """
     # Load settings (env-based)
     settings = load_settings()
@@ -44,32 +58,86 @@ async def on_startup(app: Application):
         logger.error("TARGET_CHAT_ID is empty. Set TARGET_CHAT_ID in env.")
         raise SystemExit(1)
 
-    # DB (auto-creates SQLite file/tables; parent dir ensured in store.py)
-    sessionmaker = await init_db(settings.database_url)
-    logger.info("Database initialized at %s", settings.database_url)
+    with startup.phase("adapters"):
+        adapters = build_adapters(settings)
+    startup.expect(a.label for _, _, a in adapters if hasattr(a, "label"))
+
+    # Log enabled adapters
+    enabled = [f"{ex.name}<{ex.key}>" for ex, _, _ in adapters]
+    logger.info("Enabled exchanges: {exchanges}", exchanges=", ".join(enabled) or "(none)")
+
+    async def db_phase():
+        # DB (auto-creates SQLite file/tables; parent dir ensured in store.py)
+        with startup.phase("db"):
+            return await init_db(settings.database_url)
+
+    async def telegram_phase():
+        with startup.phase("telegram"):
+            # Handlers (/ping, /status, etc.)
+            await register_admin(app)
+            # Convenience for background tasks
+            app.bot._default_chat_id = settings.target_chat_id  # type: ignore[attr-defined]
+
+    async def seed_phase():
+        with startup.phase("seed"):
+            await seed_adapters(adapters)
+
+    # Loop lag sampler + blocked-loop watchdog; started first so startup stalls show up too
+    app.bot_data["loopmon_task"] = asyncio.create_task(monitor.run(), name="[LOOPMON]")
+    # serves /profile requests (shared PROFILE_DIR, so other processes can join)
+    app.bot_data["profile_task"] = asyncio.create_task(profiling.watch(), name="[PROFILE]")
+
+    sessionmaker, _, _ = await asyncio.gather(db_phase(), telegram_phase(), seed_phase())
+    logger.info("Database initialized at {url}", url=settings.database_url)
+
+    with startup.phase("index"):
+        warmed = await index.warm(sessionmaker)
+    logger.info("Cross-exchange index warmed: {listings} listings, {symbols} symbols", listings=warmed, symbols=len(index))
 
     # Save for shutdown
     app.bot_data["settings"] = settings
     app.bot_data["sessionmaker"] = sessionmaker
+    bot = app.bot
 
-    # Handlers (/ping, /status, etc.)
-    await register_admin(app)
+    # Debounced edit pipeline shared by the reconciler and grouped listings
+    edits = EditQueue(bot)
+    app.bot_data["edits"] = edits
+    app.bot_data["edits_task"] = asyncio.create_task(edits.run(), name="[EDITS]")
 
-    # Convenience for background tasks
-    bot = app.bot
-    bot._default_chat_id = settings.target_chat_id  # type: ignore[attr-defined]
+    # Exchange clock offsets from server-time endpoints (Date headers are sampled on every poll)
+    app.bot_data["clock_task"] = asyncio.create_task(clocks.run(), name="[CLOCK]")
 
-    # Log enabled adapters
-    enabled = [f"{ex.name}<{ex.module}>" for ex in settings.exchanges if ex.enabled]
-    logger.info("Enabled exchanges: %s", ", ".join(enabled) or "(none)")
+    # Egress proxy health checks (PROXY_URLS); adapters rotate through the pool
+    if pool:
+        app.bot_data["proxies_task"] = asyncio.create_task(pool.run(), name="[PROXIES]")
+        logger.info("Proxy pool: {proxies} ({strategy})", proxies=", ".join(pool.snapshot()), strategy=pool.strategy)
+
+    # Active-active mode (NODE_ID): heartbeat first, so startup recovery sees this node alive
+    if cluster.enabled:
+        await cluster.heartbeat(sessionmaker)
+        app.bot_data["cluster_task"] = asyncio.create_task(cluster.run(sessionmaker), name="[CLUSTER]")
+        logger.info("Cluster mode: node {node} sharing {url}", node=cluster.node_id, url=settings.database_url)
+
+    # Durable alert delivery; resends whatever a previous run left pending
+    outbox = Outbox(bot, sessionmaker)
+    app.bot_data["outbox"] = outbox
+    app.bot_data["outbox_task"] = asyncio.create_task(outbox.run(), name="[OUTBOX]")
+
+    # Hot/cold split: old finalized seen_items rows go to gzip archives, keys stay as hashes
+    archive = Archive(sessionmaker)
+    app.bot_data["archive"] = archive
+    if ARCHIVE_AFTER_DAYS > 0:
+        app.bot_data["archive_task"] = asyncio.create_task(archive.run(), name="[ARCHIVE]")
 
     # Launch exchange pollers (concurrent)
-    pollers_task = asyncio.create_task(run_all(settings, bot, sessionmaker))
+    pollers_task = asyncio.create_task(run_all(settings, bot, sessionmaker, adapters, edits, outbox), name="[POLLERS]")
     app.bot_data["pollers_task"] = pollers_task
 
-    # Launch announcements reconciler (Phase B)
+    # Launch announcements reconciler (Phase B) — off the critical path
+    with startup.phase("reconciler"):
+        from app.reconciler import run_announcements
     ann_interval = int(os.getenv("ANN_INTERVAL_SEC", "600"))
-    ann_task = asyncio.create_task(run_announcements(bot, sessionmaker, ann_interval))
+    ann_task = asyncio.create_task(run_announcements(bot, sessionmaker, ann_interval, edits), name="[ANN]")
     app.bot_data["ann_task"] = ann_task
 
     logger.info("Telegram polling started.")
@@ -78,12 +146,14 @@ async def on_startup(app: Application):
 async def on_shutdown(app: Application):
     """Graceful shutdown: cancel background tasks and wait for them."""
     logger.info("Shutdown initiated.")
-    for key in ("pollers_task", "ann_task"):
+    for key in ("pollers_task", "ann_task", "outbox_task", "edits_task", "loopmon_task", "profile_task", "clock_task", "proxies_task",
+                "archive_task", "cluster_task"):
         task = app.bot_data.pop(key, None)
         if task:
             task.cancel()
             with suppress(asyncio.CancelledError):
                 await task
+    await pool.aclose()
     logger.info("Shutdown complete.")
 
 
@@ -0,0 +1,73 @@
+# app/metrics.py
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from app.utils.logging import logger
+
+# process-wide event counters, e.g. "breaker.GATE:SPOT.open"
+counters: dict[str, int] = {}
+
+
+def inc(name: str, n: int = 1) -> None:
+    counters[name] = counters.get(name, 0) + n
+
+
+class StartupTimeline:
+    """
+    Per-phase startup timings plus the readiness signal: the process is
+    ready once every launched adapter has completed its first real poll.
+    """
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.phases: list[tuple[str, float, float]] = []  # (name, start, end) offsets in s
+        self.first_polls: dict[str, float] = {}
+        self.expected: set[str] = set()
+        self.ready_after: float | None = None
+        self.ready = asyncio.Event()
+
+    def _now(self) -> float:
+        return time.perf_counter() - self.t0
+
+    @contextmanager
+    def phase(self, name: str):
+        start = self._now()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start, self._now()))
+
+    def expect(self, labels) -> None:
+        self.expected = set(labels)
+        if not self.expected:
+            self._mark_ready()
+
+    def first_poll(self, label: str) -> None:
+        if label in self.first_polls:
+            return
+        self.first_polls[label] = self._now()
+        if self.ready_after is None and self.expected and self.expected <= self.first_polls.keys():
+            self._mark_ready()
+
+    def _mark_ready(self) -> None:
+        self.ready_after = self._now()
+        self.ready.set()
+        logger.info("[STARTUP] ready: time-to-first-poll={ready:.2f}s\n{summary}",
+                    ready=self.ready_after, summary=self.summary())
+        ready_file = os.getenv("READY_FILE", "")
+        if ready_file:
+            try:
+                Path(ready_file).write_text(f"{self.ready_after:.3f}\n")
+            except OSError as e:
+                logger.warning("[STARTUP] cannot write READY_FILE {path}: {error}", path=ready_file, error=e)
+
+    def summary(self) -> str:
+        lines = [f"  {name:<12} {start:7.3f}s → {end:7.3f}s ({(end - start) * 1000:7.1f} ms)" for name, start, end in self.phases]
+        lines += [f"  first poll   {label:<18} at {t:7.3f}s" for label, t in sorted(self.first_polls.items(), key=lambda kv: kv[1])]
+        return "\n".join(lines)
+
+
+startup = StartupTimeline()
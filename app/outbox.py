@@ -0,0 +1,222 @@
+# app/outbox.py
+"""
+Durable alert delivery.
+
+handle_listing writes the rendered alert into the `outbox` table in the same
+transaction as the SeenItem dedupe claim, so a crash or a failed send can no
+longer leave a listing marked seen but never posted. A pool of workers drains
+the table: each claims a due row atomically (pending → sending), sends it,
+and records the Telegram message_id on both the outbox row and the SeenItem.
+Failures are retried with jittered exponential backoff (RetryAfter honoured).
+On startup rows stuck in `sending` are reset and every pending row is due now.
+"""
+import asyncio
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select, update
+
+from app.clock import clocks
+from app.cluster import cluster
+from app.metrics import inc
+from app.store import ListingTiming, Metric, OutboxItem, SeenItem
+from app.symbol_index import index
+from app.utils.logging import logger
+from app.utils.time import now_utc
+
+OUTBOX_WORKERS = int(os.getenv("OUTBOX_WORKERS", "4"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+OUTBOX_IDLE_SEC = 1.0  # safety poll in case a wake-up is missed
+
+
+def _utc(dt: datetime) -> datetime:
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)  # SQLite drops tzinfo
+
+
+def _ms(td: timedelta) -> int:
+    return int(td.total_seconds() * 1000)
+
+
+def retry_delay(attempts: int, base: float = 2.0, cap: float = 300.0) -> float:
+    d = min(cap, base * (2 ** max(0, attempts - 1)))
+    return d / 2 + random.random() * d / 2
+
+
+class Outbox:
+    def __init__(self, bot, db_sessionmaker, workers: int = OUTBOX_WORKERS):
+        self.bot = bot
+        self.db_sessionmaker = db_sessionmaker
+        self.workers = workers
+        self._wake = asyncio.Event()
+
+    def notify(self) -> None:
+        """Wake idle workers: a new alert was committed."""
+        self._wake.set()
+
+    async def recover(self) -> int:
+        """Make interrupted and pending rows due immediately; returns the backlog size."""
+        async with self.db_sessionmaker() as db:
+            now = now_utc()
+            interrupted = update(OutboxItem).where(OutboxItem.status == "sending")
+            if cluster.enabled:
+                # rows another live node is sending right now are not ours to reset
+                interrupted = interrupted.where(cluster.recoverable())
+            await db.execute(interrupted.values(status="pending", claimed_by=None))
+            res = await db.execute(
+                update(OutboxItem).where(OutboxItem.status == "pending").values(next_attempt_at=now)
+            )
+            await db.commit()
+        return res.rowcount or 0
+
+    async def backlog(self) -> dict[str, int]:
+        async with self.db_sessionmaker() as db:
+            rows = await db.execute(
+                select(OutboxItem.status, func.count()).group_by(OutboxItem.status)
+            )
+            return {status: n for status, n in rows}
+
+    async def _claim(self):
+        async with self.db_sessionmaker() as db:
+            row = (await db.execute(
+                select(OutboxItem)
+                .where(OutboxItem.status == "pending", OutboxItem.next_attempt_at <= now_utc())
+                .order_by(OutboxItem.id)
+                .limit(1)
+            )).scalar_one_or_none()
+            if row is None:
+                return None
+            res = await db.execute(
+                update(OutboxItem)
+                .where(OutboxItem.id == row.id, OutboxItem.status == "pending")
+                .values(status="sending", attempts=OutboxItem.attempts + 1, claimed_by=cluster.node_id or None)
+            )
+            await db.commit()
+            if res.rowcount != 1:
+                return False  # another worker won the row
+            return row  # ORM update synchronised status/attempts on the instance
+
+    async def _delivered(self, row: OutboxItem, sent, t0: float, t1: float) -> None:
+        if sent.date is not None:
+            clocks.observe("TELEGRAM", sent.date.timestamp(), t0, t1, resolution=1.0)
+        async with self.db_sessionmaker() as db:
+            await db.execute(
+                update(OutboxItem).where(OutboxItem.id == row.id)
+                .values(status="sent", message_id=sent.message_id, sent_at=now_utc(), last_error=None)
+            )
+            # Save message id for future edits
+            await db.execute(
+                update(SeenItem).where(SeenItem.dedupe_key == row.dedupe_key).values(message_id=sent.message_id)
+            )
+            # Timeline on our clock: the ack is when the response arrived, Telegram's date is mapped
+            # through its own offset; end-to-end latency only when the exchange time is an event we detected
+            timing = (await db.execute(
+                select(ListingTiming).where(ListingTiming.dedupe_key == row.dedupe_key)
+            )).scalar_one_or_none()
+            if timing is not None:
+                ack_at = datetime.fromtimestamp(t1, tz=timezone.utc)
+                timing.ack_at = ack_at
+                timing.telegram_at = clocks.to_local("TELEGRAM", sent.date)
+                timing.deliver_ms = _ms(ack_at - _utc(timing.detected_at))
+                if timing.detect_ms is not None:
+                    db.add(Metric(exchange=row.exchange, latency_ms=_ms(ack_at - _utc(timing.exchange_at)),
+                                  created_at=now_utc()))
+            await db.commit()
+        if row.event in ("LISTED", "TRADING_OPEN"):
+            index.set_head(row.symbol, sent.message_id, row.text, row.created_at)
+        inc("outbox.sent")
+        logger.info("Sent {exchange} {market} {symbol} {event} msg_id={message_id}", exchange=row.exchange,
+                    market=row.market_type, symbol=row.symbol, event=row.event, message_id=sent.message_id)
+
+    async def _mark_sent(self, row: OutboxItem, message_id: int) -> None:
+        """Minimal 'sent' bookkeeping in fresh sessions, retried until the DB takes it."""
+        attempts = 0
+        while True:
+            try:
+                async with self.db_sessionmaker() as db:
+                    await db.execute(
+                        update(OutboxItem).where(OutboxItem.id == row.id)
+                        .values(status="sent", message_id=message_id, sent_at=now_utc())
+                    )
+                    await db.execute(
+                        update(SeenItem).where(SeenItem.dedupe_key == row.dedupe_key).values(message_id=message_id)
+                    )
+                    await db.commit()
+                inc("outbox.sent")
+                return
+            except Exception as e:
+                attempts += 1
+                delay = retry_delay(attempts, base=0.5, cap=30.0)
+                logger.warning("[OUTBOX] cannot mark {dedupe_key} sent (attempt {attempts}), retry in {delay:.1f}s: {error}",
+                               dedupe_key=row.dedupe_key, key=row.dedupe_key, attempts=attempts, delay=delay, error=e)
+                await asyncio.sleep(delay)
+
+    async def _failed(self, row: OutboxItem, e: Exception) -> None:
+        retry_after = getattr(e, "retry_after", None)
+        if retry_after is not None:
+            delay = retry_after.total_seconds() if hasattr(retry_after, "total_seconds") else float(retry_after)
+        else:
+            delay = retry_delay(row.attempts)
+        give_up = row.attempts >= OUTBOX_MAX_ATTEMPTS
+        async with self.db_sessionmaker() as db:
+            await db.execute(
+                update(OutboxItem).where(OutboxItem.id == row.id).values(
+                    status="failed" if give_up else "pending",
+                    next_attempt_at=now_utc() + timedelta(seconds=delay),
+                    last_error=str(e)[:500],
+                )
+            )
+            await db.commit()
+        if give_up:
+            inc("outbox.failed")
+            logger.error("[OUTBOX] giving up on {dedupe_key} after {attempts} attempts: {error}",
+                         dedupe_key=row.dedupe_key, attempts=row.attempts, error=e)
+        else:
+            inc("outbox.retried")
+            logger.warning("[OUTBOX] send {dedupe_key} failed (attempt {attempts}), retry in {delay:.0f}s: {error}",
+                           dedupe_key=row.dedupe_key, attempts=row.attempts, delay=delay, error=e)
+
+    async def _worker(self, n: int) -> None:
+        while True:
+            # cleared before the claim query: a notify() landing during it still wakes us below
+            self._wake.clear()
+            try:
+                row = await self._claim()
+            except Exception as e:
+                logger.exception("[OUTBOX] worker {worker} claim error: {error}", worker=n, error=e)
+                row = None
+            if row is False:
+                continue
+            if row is None:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=OUTBOX_IDLE_SEC)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                t0 = time.time()
+                sent = await self.bot.send_message(chat_id=row.chat_id, text=row.text)
+                t1 = time.time()
+            except Exception as e:
+                try:
+                    await self._failed(row, e)
+                except Exception as db_err:
+                    logger.exception("[OUTBOX] cannot reschedule {dedupe_key}: {error}",
+                                     dedupe_key=row.dedupe_key, key=row.exchange, error=db_err)
+                continue
+            try:
+                await self._delivered(row, sent, t0, t1)
+            except Exception as e:
+                # the message is out: never leave the row 'sending' (a restart or reaper would resend it)
+                logger.exception("[OUTBOX] sent {dedupe_key} msg_id={message_id} but failed to record it: {error}",
+                                 dedupe_key=row.dedupe_key, key=row.exchange, message_id=sent.message_id, error=e)
+                await self._mark_sent(row, sent.message_id)
+
+    async def run(self) -> None:
+        pending = await self.recover()
+        if pending:
+            logger.info("[OUTBOX] resending {pending} pending alerts after restart", pending=pending)
+        await asyncio.gather(*(
+            asyncio.create_task(self._worker(i), name=f"[OUTBOX] worker {i}") for i in range(self.workers)
+        ))
@@ -1,29 +1,137 @@
 import asyncio
 import importlib
+from datetime import datetime, timedelta, timezone
+from contextlib import suppress
 from typing import Callable
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from telegram import Bot
-from app.store import SeenItem, Metric
-from app.templates import spot_message, futures_message
+from app.clock import clocks
+from app.cluster import cluster
+from app.config import CONFIG_WATCH_SEC, EXCHANGES_FILE, config_mtime, load_exchanges
+from app.edit_queue import EditQueue
+from app.exchanges.base import STATUS_MIN_DWELL_SEC
+from app.outbox import Outbox
+from app.store import ArchivedKey, SeenItem, OutboxItem, ListingTiming, key_hash
+from app.symbol_index import index, normalize_base, GROUP_LISTINGS, GROUP_WINDOW_SEC
+from app.templates import listing_message, cross_line, follow_up_line
 from app.utils.time import now_utc
 from app.utils.logging import logger
 
-async def _render_and_send(bot: Bot, listing, db: AsyncSession):
-    msg_text = (
-        spot_message(listing.exchange, listing.symbol, listing.source_time, listing.speed_tier, listing.source_name, listing.source_url, provisional=listing.provisional)
-        if listing.market_type == "SPOT"
-        else futures_message(listing.exchange, listing.symbol, listing.source_time, listing.speed_tier, listing.source_name, listing.source_url, provisional=listing.provisional)
+def _utc(dt: datetime) -> datetime:
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)  # SQLite drops tzinfo
+
+
+# events that mean "this venue lists the coin" for the cross-exchange index
+_LISTING_EVENTS = ("LISTED", "TRADING_OPEN")
+
+
+async def _fold_into_group(bot: Bot, db: AsyncSession, listing, head, seen_at, edits: EditQueue | None) -> None:
+    """Grouping mode: append a follow-up listing to the symbol's first alert instead of posting."""
+    text = head.text + "\n" + follow_up_line(listing.exchange, listing.market_type, seen_at, head.posted_at)
+    # the outbox row holds the message as posted; later edits (reconciler) start from it
+    await db.execute(update(OutboxItem).where(OutboxItem.message_id == head.message_id).values(text=text))
+    await db.commit()
+    if edits is not None:
+        edits.submit(head.message_id, text)
+    else:
+        await bot.edit_message_text(
+            chat_id=bot._default_chat_id, message_id=head.message_id, text=text, disable_web_page_preview=True,
+        )
+    head.text = text
+    logger.info("[GROUPED] {exchange} {market} {symbol} into msg_id={message_id}",
+                exchange=listing.exchange, market=listing.market_type, symbol=listing.symbol,
+                message_id=head.message_id)
+
+
+def _timing(listing, detected_at) -> ListingTiming:
+    """Detection on our clock; the official time (if any) is mapped through the exchange's offset."""
+    off = clocks.offset(listing.exchange)
+    timing = ListingTiming(
+        dedupe_key=listing.dedupe_key,
+        exchange=listing.exchange,
+        market_type=listing.market_type,
+        event=listing.event,
+        detected_at=detected_at,
+        offset_ms=off[0] * 1000 if off else None,
+        offset_err_ms=off[1] * 1000 if off else None,
+        poll_gap_ms=int(listing.poll_gap * 1000) if listing.poll_gap is not None else None,
     )
-    sent = await bot.send_message(chat_id=bot._default_chat_id, text=msg_text)
-    return sent
+    timing.set_exchange_time(clocks.to_local(listing.exchange, listing.source_time))
+    return timing
+
+
+async def _lost_claim(db: AsyncSession, listing, detected_at) -> None:
+    """Cluster mode: another node alerted first; record our sighting and keep the index in step."""
+    await cluster.lost(db, listing.dedupe_key, detected_at)
+    if listing.event in _LISTING_EVENTS:
+        index.add(listing.exchange, listing.market_type, listing.symbol, detected_at)
 
-async def handle_listing(bot: Bot, db: AsyncSession, listing) -> None:
+
+async def _shared_head(db: AsyncSession, listing, now) -> None:
+    """Cluster mode: the group head may have been posted by another node; load it from the shared outbox."""
+    head = (await db.execute(
+        select(OutboxItem.message_id, OutboxItem.text, OutboxItem.created_at)
+        .where(OutboxItem.symbol.in_({listing.symbol, normalize_base(listing.symbol)}),
+               OutboxItem.event.in_(_LISTING_EVENTS), OutboxItem.message_id.is_not(None),
+               OutboxItem.created_at >= now - timedelta(seconds=GROUP_WINDOW_SEC))
+        .order_by(OutboxItem.created_at)
+        .limit(1)
+    )).first()
+    if head is not None:
+        index.set_head(listing.symbol, head.message_id, head.text, head.created_at)
+        index.set_text(listing.symbol, head.message_id, head.text)  # folds by other nodes
+
+
+async def _sequenced(db: AsyncSession, listing, now):
+    """
+    A status transition (EX:MARKET:BASE:EVENT) is keyed by its place in the symbol's transition
+    history in the shared store, so every node that sees the same transition claims the same key.
+    """
+    prefix = listing.dedupe_key.rsplit(":", 1)[0] + ":"
+    prior = (await db.execute(
+        select(SeenItem.dedupe_key, SeenItem.seen_at)
+        .where(SeenItem.exchange == listing.exchange, SeenItem.market_type == listing.market_type,
+               SeenItem.symbol == listing.symbol, SeenItem.dedupe_key.startswith(prefix, autoescape=True))
+        .order_by(SeenItem.seen_at.desc(), SeenItem.id.desc())
+    )).all()
+
+    def number(key: str) -> int:
+        n = key.rsplit(":", 1)[1]
+        return int(n) if n.isdigit() else 0
+
+    seq = number(prior[0].dedupe_key) + 1 if prior else 1
+    recent = now - timedelta(seconds=STATUS_MIN_DWELL_SEC)
+    for key, seen_at in prior:
+        if _utc(seen_at) < recent:
+            break
+        if key.rsplit(":", 1)[0] == listing.dedupe_key:
+            # another node already claimed this transition (a symbol emits one event per dwell window)
+            seq = number(key)
+            break
+    # transitions moved to the archive keep their numbers claimed
+    while await db.get(ArchivedKey, key_hash(f"{listing.dedupe_key}:{seq}")) is not None:
+        seq += 1
+    return listing.model_copy(update={"dedupe_key": f"{listing.dedupe_key}:{seq}"})
+
+
+async def handle_listing(bot: Bot, db: AsyncSession, listing, edits: EditQueue | None = None,
+                         outbox: Outbox | None = None) -> None:
+    detected_at = now_utc()
+    if listing.dedupe_key.count(":") == 3:
+        listing = await _sequenced(db, listing, detected_at)
     # DB idempotency
     exists = await db.execute(
         SeenItem.__table__.select().where(SeenItem.dedupe_key == listing.dedupe_key)
     )
     row = exists.first()
     if row:
+        if cluster.enabled:
+            await _lost_claim(db, listing, detected_at)
+        return
+    # keys moved to the cold archive (app/archive.py) stay claimed via their hash
+    if await db.get(ArchivedKey, key_hash(listing.dedupe_key)) is not None:
         return
 
     # Persist first-seen (possibly without official time)
@@ -35,57 +143,186 @@ async def handle_listing(bot: Bot, db: AsyncSession, listing) -> None:
         source_time=listing.source_time,
         provisional=listing.provisional,
         source_url=listing.source_url,
-        seen_at=now_utc(),
+        seen_at=detected_at,
     )
     db.add(record)
-    await db.commit()
+    db.add(_timing(listing, record.seen_at))
+    if cluster.enabled:
+        db.add(cluster.won(listing.dedupe_key, detected_at))
 
-    sent = await _render_and_send(bot, listing, db)
-
-    # Save message id for future edits
-    await db.execute(
-        SeenItem.__table__.update()
-        .where(SeenItem.dedupe_key == listing.dedupe_key)
-        .values(message_id=sent.message_id)
-    )
-    await db.commit()
+    cross = None
+    head = None
+    if listing.event in _LISTING_EVENTS:
+        others = index.others(listing.symbol, listing.exchange, listing.market_type)
+        fold = GROUP_LISTINGS and others and listing.event == "LISTED"
+        if fold and cluster.enabled:
+            await _shared_head(db, listing, record.seen_at)
+        head = index.group_head(listing.symbol, record.seen_at) if fold else None
+        cross = cross_line(others, record.seen_at)
 
-    # Latency metric: if we do have source_time, compute; else skip
-    if listing.source_time:
-        latency = int((sent.date - listing.source_time).total_seconds() * 1000)
-        db.add(Metric(exchange=listing.exchange, latency_ms=latency, created_at=now_utc()))
+    if head is None:
+        # the alert is claimed and queued atomically; Outbox workers deliver it
+        db.add(OutboxItem(
+            dedupe_key=listing.dedupe_key,
+            exchange=listing.exchange,
+            market_type=listing.market_type,
+            symbol=listing.symbol,
+            event=listing.event,
+            chat_id=str(bot._default_chat_id),
+            text=listing_message(listing, cross),
+            next_attempt_at=record.seen_at,
+            created_at=record.seen_at,
+        ))
+    try:
         await db.commit()
-    logger.info(f"Sent {listing.exchange} {listing.market_type} {listing.symbol} msg_id={sent.message_id}")
+    except IntegrityError:
+        await db.rollback()  # lost a race on the same dedupe_key
+        if cluster.enabled:
+            await _lost_claim(db, listing, detected_at)
+        return
+
+    if cluster.enabled:
+        cluster.claimed()
+    if listing.event in _LISTING_EVENTS:
+        index.add(listing.exchange, listing.market_type, listing.symbol, record.seen_at)
+    if head is not None:
+        await _fold_into_group(bot, db, listing, head, record.seen_at, edits)
+    elif outbox is not None:
+        outbox.notify()
 
 
-async def run_adapter(adapter_factory: Callable, poll_seconds: float, bot: Bot, db: AsyncSession, name: str):
-    """Run one exchange adapter with robust logging/backoff."""
+async def run_adapter(adapter_factory: Callable, poll_seconds: float, bot: Bot, db: AsyncSession, name: str, adapter=None,
+                      edits: EditQueue | None = None, outbox: Outbox | None = None):
+    """Run one exchange adapter with robust logging/backoff. `adapter` may be a pre-seeded instance."""
     while True:
         try:
-            logger.info(f"[ADAPTER START] {name} poll_seconds={poll_seconds}")
-            adapter = adapter_factory(poll_seconds=poll_seconds)
+            logger.info("[ADAPTER START] {name} poll_seconds={poll_seconds}", name=name, poll_seconds=poll_seconds)
+            if adapter is None:
+                adapter = adapter_factory(poll_seconds=poll_seconds)
             async for listing in adapter.stream():
                 try:
-                    await handle_listing(bot, db, listing)
+                    await handle_listing(bot, db, listing, edits, outbox)
                 except Exception as e:
-                    logger.exception(f"[ADAPTER HANDLE ERROR] {name} symbol={getattr(listing,'symbol', '?')}: {e}")
+                    logger.exception("[ADAPTER HANDLE ERROR] {name} symbol={symbol}: {error}",
+                                     name=name, key=name, symbol=getattr(listing, 'symbol', '?'), error=e)
             # If stream ends (shouldn’t), restart after short pause
-            logger.warning(f"[ADAPTER STOPPED] {name} stream ended unexpectedly; restarting in 3s")
+            logger.warning("[ADAPTER STOPPED] {name} stream ended unexpectedly; restarting in 3s", name=name, key=name)
             await asyncio.sleep(3)
         except Exception as e:
-            logger.exception(f"[ADAPTER CRASH] {name}: {e}")
+            logger.exception("[ADAPTER CRASH] {name}: {error}", name=name, key=name, error=e)
+            adapter = None
             await asyncio.sleep(5)  # backoff and try again
 
 
-async def run_all(settings, bot: Bot, db_sessionmaker):
-    tasks = []
+def _build(ex) -> tuple:
+    if ex.spec is not None:
+        from app.exchanges.spec import adapter_for, resolve
+        adapter_factory = adapter_for(resolve(ex.spec, ex.name))
+    else:
+        module = importlib.import_module(ex.module)
+        adapter_factory = getattr(module, "Adapter")
+    return ex, adapter_factory, adapter_factory(poll_seconds=ex.poll_seconds)
+
+
+def build_adapters(settings) -> list[tuple]:
+    """Import and instantiate the enabled adapters: [(cfg, factory, adapter), ...]."""
+    out = []
     for ex in settings.exchanges:
         if not ex.enabled:
-            logger.info(f"[ADAPTER SKIP] {ex.name} ({ex.module}) disabled")
+            logger.info("[ADAPTER SKIP] {name} ({adapter}) disabled", name=ex.name, adapter=ex.key)
             continue
-        module = importlib.import_module(ex.module)
-        adapter_factory = getattr(module, "Adapter")
+        out.append(_build(ex))
+    return out
+
+
+async def seed_adapters(adapters: list[tuple]) -> None:
+    """Seed all adapters concurrently so the first real poll starts right after startup."""
+    seeders = [a.seed() for _, _, a in adapters if hasattr(a, "seed")]
+    results = await asyncio.gather(*seeders, return_exceptions=True)
+    failed = sum(1 for r in results if r is not True)
+    if failed:
+        logger.warning("[ADAPTER SEED] {failed}/{total} adapters not seeded yet; they retry before polling",
+                       failed=failed, total=len(results))
+
+
+async def run_all(settings, bot: Bot, db_sessionmaker, adapters: list[tuple] | None = None,
+                  edits: EditQueue | None = None, outbox: Outbox | None = None):
+    """
+    Run the adapters and follow EXCHANGES_FILE: on change only the adapters
+    whose entry changed are started, stopped or retuned (poll_seconds is
+    applied to the live instance, so its known-symbol state survives).
+    """
+    if adapters is None:
+        adapters = build_adapters(settings)
+    running: dict[str, dict] = {}   # cfg.key -> {"cfg", "adapter", "task"}
+
+    def start(ex, adapter_factory, adapter):
+        slot = running[ex.key] = {"cfg": ex, "adapter": adapter}
+
+        def factory(poll_seconds):
+            # crash restarts pick up the current config and stay visible to retunes
+            slot["adapter"] = adapter_factory(poll_seconds=slot["cfg"].poll_seconds)
+            return slot["adapter"]
+
         # log that we're launching
-        logger.info(f"[ADAPTER LAUNCH] {ex.name} ({ex.module})")
-        tasks.append(asyncio.create_task(run_adapter(adapter_factory, ex.poll_seconds, bot, db_sessionmaker(), ex.name)))
-    await asyncio.gather(*tasks)
\ No newline at end of file
+        logger.info("[ADAPTER LAUNCH] {name} ({adapter})", name=ex.name, adapter=ex.key)
+        slot["task"] = asyncio.create_task(
+            run_adapter(factory, ex.poll_seconds, bot, db_sessionmaker(), ex.name, adapter, edits, outbox),
+            name=f"[ADAPTER] {getattr(adapter, 'label', ex.name)}",
+        )
+
+    async def stop(key):
+        slot = running.pop(key)
+        slot["task"].cancel()
+        with suppress(asyncio.CancelledError):
+            await slot["task"]
+        logger.info("[ADAPTER STOP] {name} ({adapter})", name=slot["cfg"].name, adapter=key)
+
+    async def apply(exchanges):
+        wanted = {ex.key: ex for ex in exchanges if ex.enabled}
+        def identity(ex):
+            # anything but poll_seconds changed (name, inline spec) -> restart that adapter
+            return ex.model_dump(exclude={"poll_seconds"})
+
+        for key in [k for k in running if k not in wanted or identity(wanted[k]) != identity(running[k]["cfg"])]:
+            await stop(key)
+        for key, ex in wanted.items():
+            slot = running.get(key)
+            if slot is None:
+                try:
+                    start(*_build(ex))
+                except Exception as e:
+                    logger.exception("[ADAPTER LAUNCH ERROR] {name} ({adapter}): {error}",
+                                     name=ex.name, key=ex.key, adapter=ex.key, error=e)
+            elif slot["cfg"].poll_seconds != ex.poll_seconds:
+                logger.info("[ADAPTER RETUNE] {name} ({adapter}) poll_seconds {old} -> {new}",
+                            name=ex.name, adapter=key, old=slot["cfg"].poll_seconds, new=ex.poll_seconds)
+                slot["adapter"].poll_seconds = ex.poll_seconds
+                slot["cfg"] = ex
+            else:
+                slot["cfg"] = ex
+
+    for ex, adapter_factory, adapter in adapters:
+        start(ex, adapter_factory, adapter)
+
+    mtime = config_mtime(EXCHANGES_FILE)
+    try:
+        while True:
+            await asyncio.sleep(CONFIG_WATCH_SEC)
+            current = config_mtime(EXCHANGES_FILE)
+            if current is None or current == mtime:
+                continue
+            mtime = current
+            try:
+                exchanges = load_exchanges(EXCHANGES_FILE)
+            except Exception as e:
+                logger.error("[CONFIG] {path} rejected, keeping current adapters: {error}", path=EXCHANGES_FILE, error=e)
+                continue
+            if exchanges is None:
+                continue
+            logger.info("[CONFIG] {path} changed, reconciling adapters", path=EXCHANGES_FILE)
+            settings.exchanges = exchanges
+            await apply(exchanges)
+    finally:
+        for key in list(running):
+            await stop(key)
@@ -0,0 +1,102 @@
+# app/profiling.py
+"""
+On-demand cProfile sessions, coordinated through PROFILE_DIR.
+
+`/profile N` writes a request file; every process running `watch()` (the
+bot itself and any other process sharing PROFILE_DIR) profiles its event
+loop thread for N seconds and dumps `<id>-<pid>.pstats`. The requester then
+merges all dumps into `<id>.pstats` and reports the top functions by
+cumulative time.
+"""
+import asyncio
+import cProfile
+import json
+import os
+import pstats
+import secrets
+import time
+from pathlib import Path
+from typing import Optional
+
+from app.utils.logging import logger
+
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", "./profiles"))
+PROFILE_MAX_SEC = float(os.getenv("PROFILE_MAX_SEC", "120"))
+_REQUEST = "request.json"
+_WATCH_SEC = 1.0
+
+_busy = asyncio.Lock()
+
+
+async def profile(seconds: float, path: Path) -> Path:
+    """Profile this process's event-loop thread for `seconds`; dump pstats to `path`."""
+    if _busy.locked():
+        raise RuntimeError("a profile is already running in this process")
+    async with _busy:
+        prof = cProfile.Profile()
+        prof.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            prof.disable()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        prof.dump_stats(str(path))
+    return path
+
+
+def request(seconds: float) -> str:
+    """Ask every watching process to profile for `seconds`; returns the session id."""
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    # two requests within a second (or from two processes) must not share dumps
+    session = f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}"
+    tmp = PROFILE_DIR / f".{_REQUEST}.{os.getpid()}"
+    tmp.write_text(json.dumps({"id": session, "seconds": seconds, "created": time.time()}))
+    os.replace(tmp, PROFILE_DIR / _REQUEST)  # atomic for readers
+    return session
+
+
+async def watch() -> None:
+    """Serve profile requests written to PROFILE_DIR (one process or many)."""
+    req_file = PROFILE_DIR / _REQUEST
+    served: Optional[str] = None
+    while True:
+        await asyncio.sleep(_WATCH_SEC)
+        try:
+            req = json.loads(req_file.read_text())
+        except (OSError, ValueError):
+            continue
+        if req.get("id") == served:
+            continue
+        served = req.get("id")
+        seconds = float(req.get("seconds", 0))
+        # stale requests (older than the session itself) are ignored, e.g. after a restart
+        if time.time() - float(req.get("created", 0)) > seconds + _WATCH_SEC * 2:
+            continue
+        path = PROFILE_DIR / f"{served}-{os.getpid()}.pstats"
+        try:
+            await profile(seconds, path)
+            logger.info("[PROFILE] {session}: {seconds:.0f}s written to {path}", session=served, seconds=seconds, path=path)
+        except Exception as e:
+            logger.warning("[PROFILE] {session} skipped: {error}", session=served, error=e)
+
+
+def merge(session: str) -> tuple[Optional[pstats.Stats], int, Path]:
+    """Combine all per-process dumps of a session into `<session>.pstats`."""
+    parts = sorted(PROFILE_DIR.glob(f"{session}-*.pstats"))
+    out = PROFILE_DIR / f"{session}.pstats"
+    if not parts:
+        return None, 0, out
+    stats = pstats.Stats(str(parts[0]))
+    for p in parts[1:]:
+        stats.add(str(p))
+    stats.dump_stats(str(out))
+    return stats, len(parts), out
+
+
+def top(stats: pstats.Stats, n: int = 15) -> list[str]:
+    """'cumulative  own  calls  file:line(func)' rows, by cumulative time."""
+    rows = sorted(stats.stats.items(), key=lambda kv: kv[1][3], reverse=True)[:n]
+    return [
+        f"{ct:7.3f}s {tt:7.3f}s {nc:>7} {os.path.basename(file)}:{line}({func})"
+        for (file, line, func), (cc, nc, tt, ct, _) in rows
+    ]
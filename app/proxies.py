@@ -0,0 +1,190 @@
+# app/proxies.py
+"""
+Rotating egress proxy pool for the polling adapters.
+
+    PROXY_URLS="direct,http://user:pw@10.0.0.2:3128,http://10.0.0.3:3128"
+    PROXY_STRATEGY=round_robin | latency   (latency: fastest proxy with budget left)
+
+Each proxy gets its own rate bucket per exchange (`GATE@10.0.0.2:3128`), so
+the poll frequency an exchange's IP limit allows scales with the number of
+healthy egress IPs. Proxies are ejected after PROXY_EJECT_AFTER consecutive
+failures of their own (unreachable, refused tunnel, 407), never for the
+exchange's timeouts or 5xx, which the adapter's breaker handles; they are
+re-admitted by the periodic CONNECT health check. `direct`
+means no proxy (our own IP). With PROXY_URLS empty the pool is disabled and
+adapters behave as before.
+"""
+import asyncio
+import base64
+import itertools
+import os
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.metrics import inc
+from app.ratelimit import budget
+from app.utils.logging import logger
+
+PROXY_URLS = os.getenv("PROXY_URLS", "")
+PROXY_STRATEGY = os.getenv("PROXY_STRATEGY", "round_robin")
+PROXY_EJECT_AFTER = int(os.getenv("PROXY_EJECT_AFTER", "3"))
+PROXY_CHECK_SEC = float(os.getenv("PROXY_CHECK_SEC", "30"))
+PROXY_CHECK_TARGET = os.getenv("PROXY_CHECK_TARGET", "api.gateio.ws:443")
+_EWMA = 0.2
+_DEFAULT_PORTS = {"http": 80, "https": 443, "socks5": 1080, "socks5h": 1080}
+# raised for the hop to the proxy itself; anything else is the exchange's failure
+_PROXY_ERRORS = (httpx.ProxyError, httpx.ConnectError, httpx.ConnectTimeout)
+
+
+def _port(parts) -> Optional[int]:
+    return parts.port or _DEFAULT_PORTS.get(parts.scheme)
+
+
+class Proxy:
+    __slots__ = ("url", "label", "latency_ms", "requests", "errors", "failures", "ejected", "checked")
+
+    def __init__(self, url: str):
+        self.url = None if url == "direct" else url
+        parts = urlsplit(url)
+        self.label = "direct" if url == "direct" else f"{parts.hostname}:{_port(parts)}"  # no credentials
+        self.latency_ms: Optional[float] = None   # EWMA of successful requests
+        self.requests = 0
+        self.errors = 0
+        self.failures = 0                         # consecutive
+        self.ejected = False
+        self.checked: Optional[float] = None
+
+
+class ProxyPool:
+    def __init__(self, urls: list[str], strategy: str = PROXY_STRATEGY, eject_after: int = PROXY_EJECT_AFTER):
+        self.proxies = [Proxy(u) for u in urls]
+        self.strategy = strategy
+        self.eject_after = eject_after
+        self._rr = itertools.count()
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    @classmethod
+    def from_env(cls) -> "ProxyPool":
+        return cls([u.strip() for u in PROXY_URLS.split(",") if u.strip()])
+
+    def __bool__(self) -> bool:
+        return bool(self.proxies)
+
+    def healthy(self) -> list[Proxy]:
+        return [p for p in self.proxies if not p.ejected]
+
+    def pick(self, budget_key: Optional[str] = None, cost: float = 1.0) -> Proxy:
+        # with every proxy ejected keep trying all of them rather than stalling
+        candidates = self.healthy() or self.proxies
+        if self.strategy == "latency":
+            # unmeasured proxies first, so each gets probed
+            fastest = sorted(candidates, key=lambda p: -1.0 if p.latency_ms is None else p.latency_ms)
+            if budget_key is None:
+                return fastest[0]
+            # the fastest proxy whose own budget takes the request now, else the one freeing up first:
+            # adapters poll len(healthy) times faster than one budget allows (PollingAdapter.interval)
+            return min(fastest, key=lambda p: budget.wait_time(f"{budget_key}@{p.label}", cost))
+        return candidates[next(self._rr) % len(candidates)]
+
+    def client(self, proxy: Proxy) -> httpx.AsyncClient:
+        cx = self._clients.get(proxy.label)
+        if cx is None:
+            cx = self._clients[proxy.label] = httpx.AsyncClient(proxy=proxy.url, timeout=10)
+        return cx
+
+    # ---------- outcomes ----------
+    def record(self, proxy: Proxy, latency_ms: Optional[float], ok: bool, request: bool = True) -> None:
+        if request:
+            proxy.requests += 1
+        if ok:
+            proxy.failures = 0
+            if latency_ms is not None:
+                proxy.latency_ms = latency_ms if proxy.latency_ms is None else \
+                    (1 - _EWMA) * proxy.latency_ms + _EWMA * latency_ms
+            if proxy.ejected:
+                proxy.ejected = False
+                logger.info("[PROXY] {proxy} healthy again, re-admitted", proxy=proxy.label)
+            return
+        if request:
+            proxy.errors += 1
+        proxy.failures += 1
+        inc(f"proxy.{proxy.label}.errors")
+        if not proxy.ejected and proxy.failures >= self.eject_after:
+            proxy.ejected = True
+            inc(f"proxy.{proxy.label}.ejected")
+            logger.warning("[PROXY] {proxy} ejected after {failures} consecutive failures",
+                           proxy=proxy.label, key=proxy.label, failures=proxy.failures)
+
+    async def get(self, url: str, budget_key: str, cost: float = 1.0, **kwargs):
+        """GET through the next proxy under its own budget; returns (response, budget key used)."""
+        proxy = self.pick(budget_key, cost)
+        key = f"{budget_key}@{proxy.label}"
+        await budget.acquire(key, cost)
+        t0 = time.perf_counter()
+        try:
+            r = await self.client(proxy).get(url, **kwargs)
+        except httpx.HTTPError as e:
+            if proxy.url is not None and isinstance(e, _PROXY_ERRORS):
+                self.record(proxy, None, ok=False)
+            else:
+                proxy.requests += 1  # read timeouts, resets: an exchange outage must not eject the pool
+            raise
+        # only the proxy's own failures count: 5xx are the exchange's (breaker), 429 its limit on this IP (budget)
+        self.record(proxy, (time.perf_counter() - t0) * 1000, ok=r.status_code != 407)
+        return r, key
+
+    # ---------- health ----------
+    async def check(self, proxy: Proxy, target: str = PROXY_CHECK_TARGET, timeout: float = 5.0) -> bool:
+        """Open a CONNECT tunnel to `target` through the proxy; direct is always healthy."""
+        if proxy.url is None:
+            return True
+        parts = urlsplit(proxy.url)
+        writer = None
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(parts.hostname, _port(parts)), timeout
+            )
+            head = f"CONNECT {target} HTTP/1.1\r\nHost: {target}\r\n"
+            if parts.username:
+                cred = base64.b64encode(f"{parts.username}:{parts.password or ''}".encode()).decode()
+                head += f"Proxy-Authorization: Basic {cred}\r\n"
+            writer.write((head + "\r\n").encode())
+            await writer.drain()
+            status = await asyncio.wait_for(reader.readline(), timeout)
+            ok = status.split(b" ", 2)[1:2] == [b"200"]
+        except (OSError, asyncio.TimeoutError, IndexError):
+            ok = False
+        finally:
+            if writer is not None:
+                writer.close()
+        proxy.checked = time.time()
+        # tunnel setup time is not comparable to request latency; only health is taken from it
+        self.record(proxy, None, ok, request=False)
+        return ok
+
+    async def run(self, interval: float = PROXY_CHECK_SEC) -> None:
+        while True:
+            await asyncio.gather(*(self.check(p) for p in self.proxies))
+            await asyncio.sleep(interval)
+
+    async def aclose(self) -> None:
+        for cx in self._clients.values():
+            await cx.aclose()
+        self._clients.clear()
+
+    def snapshot(self) -> dict[str, dict]:
+        return {
+            p.label: {
+                "state": "ejected" if p.ejected else "ok",
+                "latency_ms": round(p.latency_ms, 1) if p.latency_ms is not None else None,
+                "requests": p.requests,
+                "errors": p.errors,
+            }
+            for p in self.proxies
+        }
+
+
+pool = ProxyPool.from_env()
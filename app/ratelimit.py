@@ -0,0 +1,203 @@
+# app/ratelimit.py
+"""
+Shared per-exchange request budget.
+
+Every adapter and announcement scraper draws from one token bucket per
+exchange (or per host, when a limit is configured for the host), so spot +
+futures adapters and scrapers of the same venue can never exceed its IP limit
+together. Limits start from the published ones below, scaled by RATE_SAFETY,
+and are tightened from rate-limit response headers when the exchange sends them.
+
+    RATE_LIMITS="GATE=200/10,api-futures.kucoin.com=2000/30"   # overrides
+    RATE_SAFETY=0.5                                            # use half of it
+    RATE_BUDGET=0                                              # disable
+"""
+import asyncio
+import os
+import time
+from typing import Callable, Mapping, Optional
+from urllib.parse import urlsplit
+
+from app.breaker import parse_retry_after
+from app.utils.logging import logger
+
+# Published public-REST limits per IP: (requests or weight, window seconds)
+DEFAULT_LIMITS: dict[str, tuple[float, float]] = {
+    "GATE": (200, 10),
+    "BINGX": (100, 10),
+    "BITGET": (20, 1),
+    "KUCOIN": (2000, 30),
+    "BINANCE": (6000, 60),            # request weight; spot exchangeInfo costs 20
+    "fapi.binance.com": (2400, 60),   # USDⓈ-M futures have their own weight pool
+    "OKX": (20, 2),
+    "MEXC": (20, 2),
+    "BYBIT": (600, 5),
+}
+FALLBACK_LIMIT = (10, 1)
+
+# header names (lower-case) carrying remaining quota / total quota
+_REMAINING = (
+    "x-gate-ratelimit-requests-remain",
+    "gw-ratelimit-remaining",
+    "x-bapi-limit-status",
+    "x-ratelimit-remaining",
+)
+_LIMIT = (
+    "x-gate-ratelimit-limit",
+    "gw-ratelimit-limit",
+    "x-bapi-limit",
+    "x-ratelimit-limit",
+)
+
+
+def _parse_limits(raw: str) -> dict[str, tuple[float, float]]:
+    out = {}
+    for part in raw.split(","):
+        key, _, spec = part.partition("=")
+        if not spec:
+            continue
+        n, _, window = spec.partition("/")
+        out[key.strip()] = (float(n), float(window or 1))
+    return out
+
+
+class _Bucket:
+    __slots__ = ("limit", "window", "rate", "capacity", "tokens", "updated", "paused_until", "demand")
+
+    def __init__(self, limit: float, window: float, safety: float, now: float):
+        self.limit = limit
+        self.window = window
+        self.rate = limit * safety / window       # tokens per second
+        self.capacity = max(1.0, limit * safety)
+        self.tokens = self.capacity
+        self.updated = now
+        self.paused_until = 0.0
+        self.demand = 0.0                        # summed cost of registered pollers
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class RateBudget:
+    def __init__(
+        self,
+        limits: Mapping[str, tuple[float, float]],
+        safety: float = 0.5,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.limits = dict(limits)
+        self.safety = safety
+        self.enabled = enabled
+        self.clock = clock
+        self._buckets: dict[str, _Bucket] = {}
+
+    @classmethod
+    def from_env(cls) -> "RateBudget":
+        limits = dict(DEFAULT_LIMITS)
+        limits.update(_parse_limits(os.getenv("RATE_LIMITS", "")))
+        return cls(
+            limits,
+            safety=float(os.getenv("RATE_SAFETY", "0.5")),
+            enabled=os.getenv("RATE_BUDGET", "1") == "1",
+        )
+
+    def key_for(self, exchange: str, url: str = "") -> str:
+        """Host-level limit if one is configured for the URL's host, else the exchange's."""
+        host = urlsplit(url).hostname or ""
+        return host if host in self.limits else exchange
+
+    def _bucket(self, key: str) -> _Bucket:
+        b = self._buckets.get(key)
+        if b is None:
+            # "GATE@10.0.0.2:3128": per-egress-IP bucket with the exchange's limit (app/proxies.py)
+            limit, window = self.limits.get(key) or self.limits.get(key.split("@", 1)[0], FALLBACK_LIMIT)
+            b = self._buckets[key] = _Bucket(limit, window, self.safety, self.clock())
+        return b
+
+    # ---------- pacing ----------
+    def register(self, key: str, cost: float = 1.0) -> None:
+        self._bucket(key).demand += cost
+
+    def unregister(self, key: str, cost: float = 1.0) -> None:
+        b = self._bucket(key)
+        b.demand = max(0.0, b.demand - cost)
+
+    def interval(self, key: str) -> float:
+        """Fastest poll interval that keeps every registered poller of `key` within budget."""
+        if not self.enabled:
+            return 0.0
+        b = self._bucket(key)
+        return b.demand / b.rate if b.rate > 0 else float("inf")
+
+    def wait_time(self, key: str, cost: float = 1.0) -> float:
+        """Seconds until acquire(key, cost) would go through; 0 = now."""
+        if not self.enabled:
+            return 0.0
+        b = self._bucket(key)
+        now = self.clock()
+        b.refill(now)
+        short = (cost - b.tokens) / b.rate if b.tokens < cost and b.rate > 0 else 0.0
+        return max(b.paused_until - now, short, 0.0)
+
+    async def acquire(self, key: str, cost: float = 1.0) -> None:
+        if not self.enabled:
+            return
+        b = self._bucket(key)
+        while True:
+            now = self.clock()
+            b.refill(now)
+            if now >= b.paused_until and b.tokens >= cost:
+                b.tokens -= cost
+                return
+            wait = max(b.paused_until - now, (cost - b.tokens) / b.rate if b.rate > 0 else 1.0)
+            await asyncio.sleep(max(wait, 0.01))
+
+    # ---------- learning ----------
+    def observe(self, key: str, headers: Mapping[str, str], status: Optional[int] = None) -> None:
+        """Tighten the bucket from rate-limit headers / a 429 response."""
+        if not self.enabled:
+            return
+        b = self._bucket(key)
+        h = {k.lower(): v for k, v in headers.items()}
+        limit = next((h[n] for n in _LIMIT if n in h), None)
+        remaining = next((h[n] for n in _REMAINING if n in h), None)
+        try:
+            if limit is not None and float(limit) != b.limit:
+                logger.info("[RATE] {key} limit learned from headers: {old:g} → {new:g} per {window:g}s",
+                            key=key, old=b.limit, new=float(limit), window=b.window)
+                b.limit = float(limit)
+                b.rate = b.limit * self.safety / b.window
+                b.capacity = max(1.0, b.limit * self.safety)
+            if remaining is not None:
+                b.refill(self.clock())
+                b.tokens = min(b.tokens, float(remaining) * self.safety)
+        except ValueError:
+            pass
+        if status in (429, 418):
+            retry = parse_retry_after(h.get("retry-after"))
+            self.penalize(key, retry if retry is not None else b.window)
+
+    def penalize(self, key: str, seconds: float) -> None:
+        b = self._bucket(key)
+        b.tokens = 0.0
+        b.paused_until = max(b.paused_until, self.clock() + seconds)
+        logger.warning("[RATE] {key} rate-limited; pausing all pollers for {seconds:.0f}s", key=key, seconds=seconds)
+
+    def snapshot(self) -> dict[str, dict]:
+        now = self.clock()
+        out = {}
+        for key, b in sorted(self._buckets.items()):
+            b.refill(now)
+            out[key] = {
+                "limit": f"{b.limit:g}/{b.window:g}s",
+                "tokens": round(b.tokens, 1),
+                "demand": round(b.demand, 1),
+                "interval": round(self.interval(key), 2),
+                "paused": round(max(0.0, b.paused_until - now), 1),
+            }
+        return out
+
+
+budget = RateBudget.from_env()
@@ -1,21 +1,42 @@
 # app/reconciler.py
 import asyncio
+from datetime import timezone
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from telegram import Bot
-from app.store import SeenItem
-from app.templates import spot_message, futures_message
+from app.clock import clocks
+from app.config import ANN_PRIMARY_RETRY_SEC, ANN_SOURCES
+from app.edit_queue import EditQueue
+from app.store import ListingTiming, Metric, OutboxItem, SeenItem
+from app.symbol_index import index
+from app.templates import futures_message, spot_message, with_start
 from app.utils.logging import logger
+from app.utils.time import now_utc
 
-async def reconcile_and_edit(bot: Bot, db: AsyncSession, ann):
+async def _backfill_timing(db: AsyncSession, dedupe_key: str, ann) -> None:
+    """The official time completes the alert's timeline: detection latency, and end-to-end once delivered."""
+    timing = (await db.execute(
+        select(ListingTiming).where(ListingTiming.dedupe_key == dedupe_key)
+    )).scalar_one_or_none()
+    if timing is None:
+        return
+    counted = timing.detect_ms is not None and timing.ack_at is not None  # _delivered wrote its Metric
+    official = ann.official_time if ann.official_time.tzinfo else ann.official_time.replace(tzinfo=timezone.utc)
+    timing.set_exchange_time(clocks.to_local(ann.exchange, official))
+    if timing.detect_ms is not None and timing.ack_at is not None and not counted:
+        ack_at = timing.ack_at if timing.ack_at.tzinfo else timing.ack_at.replace(tzinfo=timezone.utc)
+        db.add(Metric(exchange=ann.exchange, latency_ms=int((ack_at - timing.exchange_at).total_seconds() * 1000),
+                      created_at=now_utc()))
+
+async def reconcile_and_edit(bot: Bot, db: AsyncSession, ann, edits: EditQueue):
     """
     ann: Announcement(exchange, market_type, symbol, official_time, notice_url)
-    Find the posted message for the pair with missing/approx time and edit it.
+    Find the posted message for the pair with missing/approx time and queue an edit.
     """
+    # the first alert of a symbol owns the bare EXCHANGE:MARKET:BASE key;
+    # later status events (TRADING_OPEN, SUSPENDED, ...) carry suffixed keys
     q = select(SeenItem).where(
-        SeenItem.exchange == ann.exchange,
-        SeenItem.market_type == ann.market_type,
-        SeenItem.symbol == ann.symbol,
+        SeenItem.dedupe_key == f"{ann.exchange}:{ann.market_type}:{ann.symbol}",
     )
     res = await db.execute(q)
     row = res.scalar_one_or_none()
@@ -26,40 +47,87 @@ async def reconcile_and_edit(bot: Bot, db: AsyncSession, ann):
     if row.source_time is None or row.provisional:
         row.source_time = ann.official_time
         row.provisional = False
+
+        # Edit the message as posted (event header, cross line, grouped follow-ups) and swap only its time
+        posted = (await db.execute(
+            select(OutboxItem.text).where(OutboxItem.message_id == row.message_id).limit(1)
+        )).scalar()
+        if posted is not None:
+            msg_text = with_start(posted, row.source_time)
+            await db.execute(update(OutboxItem).where(OutboxItem.message_id == row.message_id).values(text=msg_text))
+        else:
+            # alerts posted before the outbox existed: no stored text, render afresh
+            msg_text = (
+                spot_message(ann.exchange, ann.symbol, row.source_time, 2, f"{ann.exchange} announcements", row.source_url, provisional=False)
+                if ann.market_type == "SPOT"
+                else futures_message(ann.exchange, ann.symbol, row.source_time, 2, f"{ann.exchange} announcements", row.source_url, provisional=False)
+            )
+        await _backfill_timing(db, row.dedupe_key, ann)
         await db.commit()
+        index.set_text(ann.symbol, row.message_id, msg_text)
+        edits.submit(row.message_id, msg_text)
+        logger.info("[EDIT QUEUED] {exchange} {market} {symbol} with official time",
+                    exchange=ann.exchange, market=ann.market_type, symbol=ann.symbol)
 
-        # Re-render message
-        msg_text = (
-            spot_message(ann.exchange, ann.symbol, row.source_time, 2, f"{ann.exchange} announcements", row.source_url, provisional=False)
-            if ann.market_type == "SPOT"
-            else futures_message(ann.exchange, ann.symbol, row.source_time, 2, f"{ann.exchange} announcements", row.source_url, provisional=False)
-        )
-        await bot.edit_message_text(
-            chat_id=bot._default_chat_id,
-            message_id=row.message_id,
-            text=msg_text,
-            disable_web_page_preview=True,
-        )
-        logger.info(f"[EDITED] {ann.exchange} {ann.market_type} {ann.symbol} with official time")
+async def follow_chain(name: str, chain: list, handle, interval_sec: float,
+                       primary_retry_sec: float = ANN_PRIMARY_RETRY_SEC):
+    """
+    Streams chain[0] into handle(ann), falling back along the chain when a feed fails.
+    While on a fallback, chain[0] is retried every primary_retry_sec (between announcements).
+    """
+    i = 0
+    while True:
+        feed = chain[i]
+        deadline = None
+        if i and primary_retry_sec > 0:
+            deadline = asyncio.get_running_loop().time() + primary_retry_sec
+        try:
+            async with asyncio.timeout_at(deadline) as window:
+                async for ann in feed.stream():
+                    window.reschedule(None)  # never cut a reconcile short
+                    await handle(ann)
+                    window.reschedule(deadline)
+        except Exception as e:
+            if deadline is not None and window.expired():
+                logger.info("[ANN] {name} retrying {primary} after {sec:.0f}s on {feed}",
+                            name=name, primary=type(chain[0]).__name__, sec=primary_retry_sec, feed=type(feed).__name__)
+                i = 0
+            elif i + 1 < len(chain):
+                i += 1
+                logger.warning("[ANN] {name} {feed} failed ({error}); falling back to {fallback}",
+                               name=name, key=name, feed=type(feed).__name__, error=e, fallback=type(chain[i]).__name__)
+            else:
+                logger.error("[ANN] {name} {feed} failed: {error}; retrying in {delay}s",
+                             name=name, key=name, feed=type(feed).__name__, error=e, delay=interval_sec)
+                await asyncio.sleep(interval_sec)
 
-async def run_announcements(bot: Bot, db_sessionmaker, interval_sec: int = 600):
+async def run_announcements(bot: Bot, db_sessionmaker, interval_sec: int = 600, edits: EditQueue | None = None,
+                            sources: dict[str, list[str]] | None = None,
+                            primary_retry_sec: float = ANN_PRIMARY_RETRY_SEC):
     """
-    Runs three announcement feeds concurrently and reconciles any matches.
+    Runs one announcement feed per exchange concurrently and reconciles any matches.
+    Sources come from ANN_SOURCES (API/RSS first, HTML scraping as fallback).
+    Edits go through the debounced EditQueue so a feed never waits on Telegram.
     """
-    from app.announcements import bitget
-    from app.announcements import bingx
+    from app.announcements.sources import build_feeds, parse_sources
 
-    async def loop_feed(feed):
-        async for ann in feed:
-            try:
-                async with db_sessionmaker() as db:
-                    await reconcile_and_edit(bot, db, ann)
-            except Exception as e:
-                logger.exception(f"[ANN RECONCILE ERROR] {ann.exchange}:{ann.symbol}: {e}")
+    async def reconcile(ann):
+        try:
+            async with db_sessionmaker() as db:
+                await reconcile_and_edit(bot, db, ann, edits)
+        except Exception as e:
+            logger.exception("[ANN RECONCILE ERROR] {exchange}:{symbol}: {error}",
+                             exchange=ann.exchange, key=ann.exchange, symbol=ann.symbol, error=e)
 
-    tasks = [
-        asyncio.create_task(loop_feed(bitget.stream(interval_sec))),
-        asyncio.create_task(loop_feed(bingx.stream_spot(interval_sec))),
-        asyncio.create_task(loop_feed(bingx.stream_futures(interval_sec))),
-    ]
+    own_queue = edits is None
+    if own_queue:
+        edits = EditQueue(bot)
+    chains = build_feeds(sources if sources is not None else parse_sources(ANN_SOURCES), interval_sec)
+    logger.info("Announcement feeds: {feeds}", feeds=", ".join(
+        f"{name}={'>'.join(type(f).__name__ for f in chain)}" for name, chain in chains.items()
+    ))
+    tasks = [asyncio.create_task(follow_chain(name, chain, reconcile, interval_sec, primary_retry_sec), name=f"[ANN] {name}")
+             for name, chain in chains.items()]
+    if own_queue:
+        tasks.append(asyncio.create_task(edits.run(), name="[EDITS]"))
     await asyncio.gather(*tasks)
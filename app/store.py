@@ -1,13 +1,22 @@
 # app/store.py
-from datetime import datetime
+import hashlib
+import os
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-from sqlalchemy import String, Integer, DateTime, UniqueConstraint, Boolean
+from sqlalchemy import event, inspect, BigInteger, String, Integer, Float, DateTime, UniqueConstraint, Boolean, Text, Index, select, delete
 from sqlalchemy.engine.url import make_url
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
+SQLITE_BUSY_TIMEOUT_SEC = float(os.getenv("SQLITE_BUSY_TIMEOUT_SEC", "30"))
+
+# Bump whenever a model/table is added or changed so init_db re-runs create_all.
+SCHEMA_VERSION = 6
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -42,11 +51,156 @@ class Metric(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
 
 
+class OutboxItem(Base):
+    """Alert waiting for delivery; written in the same transaction as its SeenItem claim."""
+    __tablename__ = "outbox"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    dedupe_key: Mapped[str] = mapped_column(String(255))
+    exchange: Mapped[str] = mapped_column(String(32))
+    market_type: Mapped[str] = mapped_column(String(16))
+    symbol: Mapped[str] = mapped_column(String(64))
+    event: Mapped[str] = mapped_column(String(16), default="LISTED")
+    chat_id: Mapped[str] = mapped_column(String(64))
+    text: Mapped[str] = mapped_column(Text)
+    status: Mapped[str] = mapped_column(String(16), default="pending")  # pending/sending/sent/failed
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    message_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    claimed_by: Mapped[str | None] = mapped_column(String(64), nullable=True)  # node sending it (cluster mode)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("dedupe_key", name="uq_outbox_dedupe"),
+        Index("ix_outbox_due", "status", "next_attempt_at"),
+    )
+
+
+class ListingTiming(Base):
+    """
+    One alert on our clock: exchange-reported and Telegram times are mapped
+    through app.clock offsets, so the *_ms spans are comparable across venues.
+    """
+    __tablename__ = "listing_timings"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    dedupe_key: Mapped[str] = mapped_column(String(255))
+    exchange: Mapped[str] = mapped_column(String(32))
+    market_type: Mapped[str] = mapped_column(String(16))
+    event: Mapped[str] = mapped_column(String(16), default="LISTED")
+    detected_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))                 # first seen by us
+    exchange_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)  # exchange/official time, corrected
+    offset_ms: Mapped[float | None] = mapped_column(Float, nullable=True)      # exchange clock - ours
+    offset_err_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    poll_gap_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)    # detection happened within this
+    ack_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)       # send acknowledged
+    telegram_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)  # message date, corrected
+    detect_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)      # exchange_at -> detected_at
+    deliver_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)     # detected_at -> ack_at
+
+    __table_args__ = (UniqueConstraint("dedupe_key", name="uq_timing_dedupe"),)
+
+    def set_exchange_time(self, exchange_at: datetime | None) -> None:
+        """
+        Exchange time already on our clock. detect_ms is left empty when it lies after the
+        detection by more than the clock error: a scheduled open, not an event we were late to.
+        """
+        self.exchange_at = exchange_at
+        self.detect_ms = None
+        if exchange_at is not None:
+            detected = self.detected_at if self.detected_at.tzinfo else self.detected_at.replace(tzinfo=timezone.utc)
+            lag = detected - exchange_at
+            if lag >= -timedelta(milliseconds=self.offset_err_ms or 1000):
+                self.detect_ms = int(lag.total_seconds() * 1000)
+
+
+def key_hash(dedupe_key: str) -> int:
+    """8-byte signed hash of a dedupe key (fits SQLite INTEGER)."""
+    return int.from_bytes(hashlib.blake2b(dedupe_key.encode(), digest_size=8).digest(), "big", signed=True)
+
+
+class ArchivedKey(Base):
+    """Dedupe key of a seen_items row moved to the cold archive (see app/archive.py)."""
+    __tablename__ = "archived_keys"
+
+    key_hash: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    day: Mapped[str] = mapped_column(String(10))  # archive partition, YYYY-MM-DD
+    # first alerts (bare EXCHANGE:MARKET:BASE keys) keep what the symbol index is warmed from
+    exchange: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    market_type: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    symbol: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    first_seen: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class Node(Base):
+    """A bot instance sharing this database (cluster mode, see app/cluster.py)."""
+    __tablename__ = "nodes"
+
+    node_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    host: Mapped[str] = mapped_column(String(255))
+    pid: Mapped[int] = mapped_column(Integer)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    heartbeat_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+
+class Detection(Base):
+    """One node's first sighting of a dedupe key; `won` = its claim created the alert."""
+    __tablename__ = "detections"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    dedupe_key: Mapped[str] = mapped_column(String(255))
+    node_id: Mapped[str] = mapped_column(String(64))
+    detected_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    won: Mapped[bool] = mapped_column(Boolean)
+
+    __table_args__ = (UniqueConstraint("dedupe_key", "node_id", name="uq_detection_node"),)
+
+
+class SchemaInfo(Base):
+    __tablename__ = "schema_info"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer)
+
+
+async def _schema_version(engine) -> int | None:
+    try:
+        async with engine.connect() as conn:
+            return (await conn.execute(select(SchemaInfo.version))).scalar()
+    except DBAPIError:
+        return None  # fresh DB: table does not exist yet
+
+
+def _add_missing_columns(conn) -> None:
+    """create_all only creates tables; add new nullable columns to existing ones."""
+    insp = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        have = {c["name"] for c in insp.get_columns(table.name)}
+        for col in table.columns:
+            if col.name not in have and col.nullable:
+                conn.exec_driver_sql(
+                    f"ALTER TABLE {table.name} ADD COLUMN {col.name} {col.type.compile(conn.dialect)}"
+                )
+
+
+def _sqlite_pragmas(dbapi_conn, _) -> None:
+    # several processes may share one file (cluster mode): readers don't block the writer
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.close()
+
+
 async def init_db(database_url: str):
     """
     Initialize async SQLAlchemy engine & sessionmaker.
     - Auto-creates parent directory for SQLite file URLs (e.g., /data/bot.db).
-    - Creates tables on first run.
+    - Creates tables on first run, or when SCHEMA_VERSION changed; otherwise
+      skips create_all (one cheap SELECT instead of a reflection pass per table).
+      New nullable columns of existing tables are added on the same occasion.
+    - SQLite runs in WAL mode with a busy timeout, so several processes can
+      share the file.
     """
     url = make_url(database_url)
 
@@ -56,13 +210,22 @@ async def init_db(database_url: str):
         if db_path and db_path != ":memory:":
             Path(db_path).expanduser().parent.mkdir(parents=True, exist_ok=True)
 
+    sqlite = url.drivername.startswith("sqlite")
     engine = create_async_engine(
         database_url,
         future=True,
         pool_pre_ping=True,  # helps recover from stale connections
+        # wait for another process's write lock instead of failing fast
+        connect_args={"timeout": SQLITE_BUSY_TIMEOUT_SEC} if sqlite else {},
     )
-
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    if sqlite:
+        event.listen(engine.sync_engine, "connect", _sqlite_pragmas)
+
+    if await _schema_version(engine) != SCHEMA_VERSION:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_add_missing_columns)
+            await conn.execute(delete(SchemaInfo))
+            await conn.execute(SchemaInfo.__table__.insert().values(id=1, version=SCHEMA_VERSION))
 
     return async_sessionmaker(engine, expire_on_commit=False)
@@ -0,0 +1,126 @@
+# app/symbol_index.py
+"""
+In-memory cross-exchange symbol index.
+
+Keyed by normalized base symbol, it answers in O(1) which venues
+("EXCHANGE MARKET") already list a coin and which one was first. Warmed from
+seen_items and archived first alerts on startup and updated on every listing.
+In grouping mode it also remembers the first alert's message so follow-up
+listings can be folded into it.
+"""
+import os
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import select
+
+from app.store import ArchivedKey, SeenItem
+
+GROUP_LISTINGS = os.getenv("GROUP_LISTINGS", "0") == "1"
+GROUP_WINDOW_SEC = float(os.getenv("GROUP_WINDOW_SEC", "3600"))
+
+_QUOTE_SUFFIXES = ("USDTM", "USDT")
+
+
+def normalize_base(symbol: str) -> str:
+    """'btc', 'BTC-USDT', 'BTC_USDT', 'BTCUSDTM' -> 'BTC'."""
+    s = symbol.strip().upper().replace("-", "").replace("_", "").replace("/", "")
+    for suffix in _QUOTE_SUFFIXES:
+        if s.endswith(suffix) and len(s) > len(suffix):
+            return s[: -len(suffix)]
+    return s
+
+
+def _utc(dt: datetime) -> datetime:
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+class _Entry:
+    __slots__ = ("venues", "first", "message_id", "text", "posted_at")
+
+    def __init__(self):
+        self.venues: dict[str, datetime] = {}   # venue -> first seen
+        self.first: Optional[str] = None
+        self.message_id: Optional[int] = None   # group head (grouping mode)
+        self.text: str = ""
+        self.posted_at: Optional[datetime] = None
+
+
+class SymbolIndex:
+    def __init__(self):
+        self._by_base: dict[str, _Entry] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_base)
+
+    def add(self, exchange: str, market_type: str, symbol: str, seen_at: datetime) -> bool:
+        """Record a venue for the symbol; returns True if the venue is new for it."""
+        entry = self._by_base.setdefault(normalize_base(symbol), _Entry())
+        venue = f"{exchange} {market_type}"
+        seen_at = _utc(seen_at)
+        known = entry.venues.get(venue)
+        if known is not None and known <= seen_at:
+            return False
+        entry.venues[venue] = seen_at
+        if entry.first is None or seen_at < entry.venues[entry.first]:
+            entry.first = venue
+        return known is None
+
+    def venues(self, symbol: str) -> dict[str, datetime]:
+        entry = self._by_base.get(normalize_base(symbol))
+        return dict(entry.venues) if entry else {}
+
+    def first(self, symbol: str) -> Optional[tuple[str, datetime]]:
+        entry = self._by_base.get(normalize_base(symbol))
+        if not entry or entry.first is None:
+            return None
+        return entry.first, entry.venues[entry.first]
+
+    def others(self, symbol: str, exchange: str, market_type: str) -> list[tuple[str, datetime]]:
+        """Venues other than this one that already list the symbol, earliest first."""
+        venue = f"{exchange} {market_type}"
+        return sorted(((v, t) for v, t in self.venues(symbol).items() if v != venue), key=lambda vt: vt[1])
+
+    # ---------- grouping ----------
+    def group_head(self, symbol: str, now: datetime) -> Optional[_Entry]:
+        entry = self._by_base.get(normalize_base(symbol))
+        if not entry or entry.message_id is None or entry.posted_at is None:
+            return None
+        if (now - entry.posted_at).total_seconds() > GROUP_WINDOW_SEC:
+            return None
+        return entry
+
+    def set_head(self, symbol: str, message_id: int, text: str, posted_at: datetime) -> None:
+        entry = self._by_base.setdefault(normalize_base(symbol), _Entry())
+        posted_at = _utc(posted_at)  # outbox rows come back from SQLite without tzinfo
+        if entry.message_id is None or entry.posted_at is None or \
+                (posted_at - entry.posted_at).total_seconds() > GROUP_WINDOW_SEC:
+            entry.message_id, entry.text, entry.posted_at = message_id, text, posted_at
+
+    def set_text(self, symbol: str, message_id: int, text: str) -> None:
+        """Keep the head's text in step when its message is edited elsewhere (reconciler)."""
+        entry = self._by_base.get(normalize_base(symbol))
+        if entry is not None and entry.message_id == message_id:
+            entry.text = text
+
+    async def warm(self, db_sessionmaker) -> int:
+        """Load first-alert rows (bare EXCHANGE:MARKET:BASE keys) from seen_items and archived_keys."""
+        async with db_sessionmaker() as db:
+            rows = await db.execute(
+                select(SeenItem.dedupe_key, SeenItem.exchange, SeenItem.market_type, SeenItem.symbol, SeenItem.seen_at)
+            )
+            n = 0
+            for key, exchange, market_type, symbol, seen_at in rows:
+                if key.count(":") == 2 and seen_at is not None:
+                    self.add(exchange, market_type, symbol, seen_at)
+                    n += 1
+            archived = await db.execute(
+                select(ArchivedKey.exchange, ArchivedKey.market_type, ArchivedKey.symbol, ArchivedKey.first_seen)
+                .where(ArchivedKey.first_seen.is_not(None))
+            )
+            for exchange, market_type, symbol, first_seen in archived:
+                self.add(exchange, market_type, symbol, first_seen)
+                n += 1
+        return n
+
+index = SymbolIndex()
@@ -25,26 +25,87 @@ def _time_cell(start_time: Optional[datetime], provisional: bool) -> str:
     )
 
 
-def spot_message(exchange, symbol, start_time, speed_tier, source_name, url, provisional=False):
-    tier_name, tier_desc = {1:("Tier 1","Webhook/push"), 2:("Tier 2","Fast API polling"), 3:("Tier 3","RSS/HTML")}[speed_tier]
-    time_cell = _time_cell(start_time, provisional)
-    return (
-        f"🚀 {exchange} SPOT LISTING ALERT\n"
-        f"📈 Pair: {symbol}/USDT\n"
-        f"⏱️ Start: {time_cell}\n"
-        f"⚡️ Speed tier: {tier_name} — {tier_desc}\n"
-        f"🛰 Source: {source_name}\n"
-        f"🔗 Link: {url}"
-    )
+_TIERS = {1: ("Tier 1", "Webhook/push"), 2: ("Tier 2", "Fast API polling"), 3: ("Tier 3", "RSS/HTML")}
 
-def futures_message(exchange, symbol, start_time, speed_tier, source_name, url, provisional=False):
-    tier_name, tier_desc = {1:("Tier 1","Webhook/push"), 2:("Tier 2","Fast API polling"), 3:("Tier 3","RSS/HTML")}[speed_tier]
-    time_cell = _time_cell(start_time, provisional)
-    return (
-        f"🚀 {exchange} FUTURES LISTING ALERT\n"
-        f"📈 Pair: {symbol}/USDT\n"
-        f"⏱️ Start: {time_cell}\n"
-        f"⚡️ Speed tier: {tier_name} — {tier_desc}\n"
-        f"🛰 Source: {source_name}\n"
-        f"🔗 Link: {url}"
-    )
\ No newline at end of file
+
+def fmt_duration(seconds: float) -> str:
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
+
+
+def _header(exchange: str, market: str, event: str, trading: bool) -> str:
+    if event == "TRADING_OPEN":
+        return f"🟢 {exchange} {market} TRADING OPEN"
+    if event == "SUSPENDED":
+        return f"⏸ {exchange} {market} TRADING SUSPENDED"
+    if event == "DELISTED":
+        return f"🛑 {exchange} {market} DELISTED"
+    if not trading:
+        return f"👀 {exchange} {market} LISTING ALERT (trading not open yet)"
+    return f"🚀 {exchange} {market} LISTING ALERT"
+
+
+def cross_line(others, now: datetime) -> str:
+    """'Already on' attribution from SymbolIndex.others(): [(venue, first_seen), ...] earliest first."""
+    if not others:
+        return "🥇 First listing among tracked exchanges"
+    seen = ", ".join(f"{venue} ({fmt_duration((now - t).total_seconds())} ago)" for venue, t in others)
+    return f"🌐 Already on: {seen} — first: {others[0][0]}"
+
+
+def follow_up_line(exchange, market, start: datetime, head_posted: datetime) -> str:
+    start_utc, _ = fmt_times(start)
+    return f"➕ Also on {exchange} {market}: {start_utc} UTC (+{fmt_duration((start - head_posted).total_seconds())})"
+
+
+def with_start(text: str, start_time: Optional[datetime], provisional: bool = False) -> str:
+    """Swap the start line of a posted alert; header, cross line and follow-ups are kept."""
+    start = f"⏱️ Start: {_time_cell(start_time, provisional)}"
+    return "\n".join(start if line.startswith("⏱️ Start:") else line for line in text.split("\n"))
+
+
+def _message(market, exchange, symbol, start_time, speed_tier, source_name, url, provisional,
+             event="LISTED", trading=True, open_after=None, cross=None):
+    tier_name, tier_desc = _TIERS[speed_tier]
+    if event == "TRADING_OPEN" and start_time is None:
+        time_cell = "Open now"
+    else:
+        time_cell = _time_cell(start_time, provisional)
+    lines = [
+        _header(exchange, market, event, trading),
+        f"📈 Pair: {symbol}/USDT",
+        f"⏱️ Start: {time_cell}",
+    ]
+    if open_after is not None:
+        lines.append(f"⏳ Opened {fmt_duration(open_after)} after first seen")
+    if cross:
+        lines.append(cross)
+    lines += [
+        f"⚡️ Speed tier: {tier_name} — {tier_desc}",
+        f"🛰 Source: {source_name}",
+        f"🔗 Link: {url}",
+    ]
+    return "\n".join(lines)
+
+
+def spot_message(exchange, symbol, start_time, speed_tier, source_name, url, provisional=False, **event):
+    return _message("SPOT", exchange, symbol, start_time, speed_tier, source_name, url, provisional, **event)
+
+def futures_message(exchange, symbol, start_time, speed_tier, source_name, url, provisional=False, **event):
+    return _message("FUTURES", exchange, symbol, start_time, speed_tier, source_name, url, provisional, **event)
+
+
+def listing_message(listing, cross: Optional[str] = None) -> str:
+    """Render any adapter event (Listing) with the template for its market/event type."""
+    render = spot_message if listing.market_type == "SPOT" else futures_message
+    return render(
+        listing.exchange, listing.symbol, listing.source_time, listing.speed_tier,
+        listing.source_name, listing.source_url, provisional=listing.provisional,
+        event=listing.event, trading=listing.trading, open_after=listing.open_after, cross=cross,
+    )
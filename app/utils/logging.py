@@ -1,5 +1,127 @@
-from loguru import logger
+# app/utils/logging.py
+"""
+Loguru setup.
+
+    LOG_FORMAT=text | json      one compact JSON object per line with json
+    LOG_SAMPLE_BURST=5          WARNING+ events per call site (and `key`) per window
+    LOG_SAMPLE_WINDOW_SEC=60
+    LOG_TAIL_SIZE=500           recent events kept in memory for /logs
+
+Hot paths log with brace templates (`logger.info("Sent {symbol}", symbol=s)`):
+the message is only formatted when some sink accepts the level, and the
+kwargs land in `extra` as structured fields. During an outage a failing call
+site emits LOG_SAMPLE_BURST events per window, only the first with a
+traceback; the rest are counted and reported as `suppressed` on the next one
+let through. Loguru formats the message before patchers run, so a suppressed
+event still costs its formatting; what sampling saves is the sink writes and
+the traceback rendering.
+"""
+import json
+import os
 import sys
+import threading
+import time
+from collections import deque
+
+from loguru import logger
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+LOG_SAMPLE_BURST = int(os.getenv("LOG_SAMPLE_BURST", "5"))
+LOG_SAMPLE_WINDOW_SEC = float(os.getenv("LOG_SAMPLE_WINDOW_SEC", "60"))
+LOG_TAIL_SIZE = int(os.getenv("LOG_TAIL_SIZE", "500"))
+_SAMPLED_FROM = 30  # WARNING
+
+
+class Sampler:
+    """
+    Per-key rate limit for repeated warnings/errors; used as a loguru patcher.
+    Patchers see the already formatted record, so dropped events only skip the sinks.
+    """
+
+    def __init__(self, burst: int = LOG_SAMPLE_BURST, window: float = LOG_SAMPLE_WINDOW_SEC):
+        self.burst = burst
+        self.window = window
+        self._keys: dict[tuple, list] = {}   # key -> [window start, emitted, suppressed]
+        self._lock = threading.Lock()
+        self.suppressed = 0
+
+    def __call__(self, record) -> None:
+        if record["level"].no < _SAMPLED_FROM or self.burst <= 0:
+            return
+        key = (record["name"], record["line"], record["extra"].get("key"))
+        now = time.monotonic()
+        with self._lock:
+            state = self._keys.get(key)
+            if state is None or now - state[0] >= self.window:
+                if len(self._keys) > 10_000:
+                    self._keys.clear()
+                carried = state[2] if state else 0
+                state = self._keys[key] = [now, 0, carried]
+            if state[1] >= self.burst:
+                state[2] += 1
+                self.suppressed += 1
+                record["extra"]["_drop"] = True
+                return
+            state[1] += 1
+            first, suppressed = state[1] == 1, state[2]
+            state[2] = 0
+        if suppressed:
+            record["extra"]["suppressed"] = suppressed
+            record["message"] += f" (+{suppressed} suppressed)"
+        if not first:
+            record["exception"] = None  # one traceback per key and window is enough
+
+
+def _keep(record) -> bool:
+    return not record["extra"].get("_drop")
+
+
+def _fields(record) -> dict:
+    return {k: v for k, v in record["extra"].items() if not k.startswith("_")}
+
+
+def _json_format(record) -> str:
+    event = {
+        "ts": record["time"].timestamp(),
+        "level": record["level"].name,
+        "msg": record["message"],
+        "src": f"{record['name']}:{record['function']}:{record['line']}",
+    }
+    event.update(_fields(record))
+    if record["exception"] is not None:
+        exc = record["exception"]
+        event["exc"] = f"{exc.type.__name__}: {exc.value}" if exc.type else None
+    record["extra"]["_json"] = json.dumps(event, default=str, ensure_ascii=False)
+    # loguru appends the traceback after "{exception}" only; JSON keeps the summary above
+    return "{extra[_json]}\n"
+
+
+class LogTail:
+    """Ring buffer of recent events for the /logs command."""
+
+    def __init__(self, size: int = LOG_TAIL_SIZE):
+        self.events: deque[dict] = deque(maxlen=size)
+
+    def write(self, message) -> None:
+        r = message.record
+        event = {"ts": r["time"].timestamp(), "level": r["level"].name, "no": r["level"].no, "msg": r["message"]}
+        if r["exception"] is not None and r["exception"].type:
+            event["exc"] = r["exception"].type.__name__
+        self.events.append(event)
+
+    def recent(self, n: int = 20, min_level: int = 0) -> list[dict]:
+        out = [e for e in reversed(self.events) if e["no"] >= min_level][:n]
+        return out[::-1]
+
+
+sampler = Sampler()
+tail = LogTail()
 
 logger.remove()
-logger.add(sys.stderr, level="INFO", enqueue=True, backtrace=True, diagnose=False)
\ No newline at end of file
+logger.configure(patcher=sampler)
+if LOG_FORMAT == "json":
+    logger.add(sys.stderr, level=LOG_LEVEL, enqueue=True, format=_json_format, filter=_keep)
+else:
+    logger.add(sys.stderr, level=LOG_LEVEL, enqueue=True, backtrace=True, diagnose=False, filter=_keep)
+logger.add(tail.write, level=LOG_LEVEL, format="{message}", filter=_keep, catch=False)
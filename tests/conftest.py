@@ -0,0 +1,13 @@
+import pytest
+
+from app.exchanges.base import Listing
+
+
+@pytest.fixture
+def make_listing():
+    """Listing factory: make_listing("ABC") -> first alert of TEST SPOT ABC."""
+    def make(symbol, exchange="TEST", market_type="SPOT", **fields):
+        fields.setdefault("dedupe_key", f"{exchange}:{market_type}:{symbol}")
+        return Listing(exchange=exchange, market_type=market_type, symbol=symbol, source_url="u",
+                       source_name="test API", speed_tier=1, **fields)
+    return make
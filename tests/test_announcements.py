@@ -0,0 +1,84 @@
+import asyncio
+
+from app.announcements.api import ApiFeed, BitgetFeed, KuCoinFeed, RssFeed
+from app.announcements.common import guess_symbol, is_listing, markets
+from app.announcements.sources import HtmlFeed, build_feeds, parse_sources
+
+
+def test_symbol_and_markets():
+    assert guess_symbol("Bitget Will List Pepe (PEPE) in the Innovation Zone") == "PEPE"
+    assert guess_symbol("New listing: ABC/USDT") == "ABC"
+    assert guess_symbol("BingX Lists XYZ") == "XYZ"
+    assert is_listing("Binance Will List Foo (FOO)") and not is_listing("System maintenance notice")
+    assert markets("Bitget will list FOO in spot and futures") == ["SPOT", "FUTURES"]
+    assert markets("FOOUSDT Perpetual Contract launched") == ["FUTURES"]
+    assert markets("Listing FOO", default="SPOT") == ["SPOT"]
+
+
+class _Scripted(ApiFeed):
+    name = "TEST"
+
+    def __init__(self, pages):
+        super().__init__()
+        self.pages = pages   # list of pages per poll, newest first
+        self.requests = 0
+
+    async def _page(self, cx, cursor):
+        self.requests += 1
+        page = cursor or 0
+        items = self.pages[page]
+        return items, (page + 1 if page + 1 < len(self.pages) else None)
+
+
+def _it(i):
+    return {"id": i, "title": f"Will list T{i} (TK{i})", "ts": 1_000 + i, "url": f"u{i}"}
+
+
+def test_incremental_pagination():
+    feed = _Scripted([[_it(5), _it(4)], [_it(3), _it(2)]])
+    first = asyncio.run(feed.poll(None))
+    assert [a.symbol for a in first] == ["TK5", "TK4"]    # backfill: one page only
+    assert feed.requests == 1
+
+    feed.pages = [[_it(7), _it(6)], [_it(5), _it(4)], [_it(3), _it(2)]]
+    feed.requests = 0
+    second = asyncio.run(feed.poll(None))
+    assert [a.symbol for a in second] == ["TK7", "TK6"]   # stops at the high-water mark
+    assert feed.requests == 2
+    assert second[0].dedupe_hint == "7" and second[0].official_time.timestamp() == 1.007
+
+    feed.requests = 0
+    assert asyncio.run(feed.poll(None)) == [] and feed.requests == 1
+
+
+def test_sources_and_fallback_chains():
+    sources = parse_sources("bitget=api|html, BINGX=html,KUCOIN=api,FOO=rss:https://foo/feed,NONE=api")
+    assert sources["BITGET"] == ["api", "html"]
+    chains = build_feeds(sources, 60)
+    assert [type(f) for f in chains["BITGET"]] == [BitgetFeed, HtmlFeed]
+    assert len(chains["BINGX"][0].streams) == 2
+    assert isinstance(chains["KUCOIN"][0], KuCoinFeed)
+    assert isinstance(chains["FOO"][0], RssFeed) and chains["FOO"][0].url == "https://foo/feed"
+    assert "NONE" not in chains
+
+
+def test_rss_feed_parses_entries():
+    xml = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>x</title>
+    <item><title>Foo Exchange Will List Bar (BAR)</title><link>https://foo/1</link>
+      <guid>1</guid><pubDate>Mon, 19 Oct 2026 10:00:00 GMT</pubDate></item>
+    <item><title>Maintenance</title><link>https://foo/2</link>
+      <guid>2</guid><pubDate>Sun, 18 Oct 2026 10:00:00 GMT</pubDate></item>
+    </channel></rss>"""
+
+    class _Resp:
+        headers, status_code, content = {}, 200, xml
+
+        def raise_for_status(self):
+            pass
+
+    class _Client:
+        async def get(self, url, **kw):
+            return _Resp()
+
+    anns = asyncio.run(RssFeed("FOO", "https://foo/feed").poll(_Client()))
+    assert [(a.exchange, a.symbol, a.notice_url) for a in anns] == [("FOO", "BAR", "https://foo/1")]
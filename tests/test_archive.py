@@ -0,0 +1,75 @@
+import asyncio
+import gzip
+import json
+from datetime import timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import func, select, update
+
+from app.archive import Archive
+from app.poller import handle_listing
+from app.store import ArchivedKey, OutboxItem, SeenItem, init_db, key_hash
+from app.symbol_index import SymbolIndex
+from app.templates import cross_line
+from app.utils.time import now_utc
+
+
+def test_archive_moves_old_rows_and_keeps_them_deduped(tmp_path, make_listing):
+    bot = SimpleNamespace(_default_chat_id="1")
+
+    async def run():
+        sm = await init_db(f"sqlite+aiosqlite:///{tmp_path}/a.db")
+        async with sm() as db:
+            for sym in ("OLD", "PROV", "NEW", "UNSENT"):
+                await handle_listing(bot, db, make_listing(sym))
+            ten_days_ago = now_utc() - timedelta(days=10)
+            await db.execute(update(SeenItem).where(SeenItem.symbol != "NEW").values(seen_at=ten_days_ago))
+            await db.execute(update(SeenItem).where(SeenItem.symbol.in_(("OLD", "UNSENT"))).values(provisional=False))
+            await db.execute(update(OutboxItem).where(OutboxItem.symbol != "UNSENT").values(status="sent"))
+            await db.commit()
+
+        archive = Archive(sm, tmp_path / "archive")
+        moved = await archive.run_once(after_days=7, max_age_days=30)
+        async with sm() as db:
+            hot = set((await db.execute(select(SeenItem.symbol))).scalars())
+            keys = (await db.execute(select(func.count()).select_from(ArchivedKey))).scalar()
+            await handle_listing(bot, db, make_listing("OLD"))   # archived: must not be claimed again
+            outbox = (await db.execute(select(func.count()).select_from(OutboxItem))).scalar()
+        found = await archive.search("OLD")
+        return moved, hot, keys, outbox, found, archive
+
+    moved, hot, keys, outbox, found, archive = asyncio.run(run())
+    # provisional rows stay until ARCHIVE_MAX_AGE_DAYS; undelivered alerts are never archived
+    assert moved == 1 and hot == {"PROV", "NEW", "UNSENT"} and keys == 1
+    assert outbox == 4
+    assert [(r["dedupe_key"], r["tier"]) for r in found] == [("TEST:SPOT:OLD", "archive")]
+    (path,) = archive.dir.glob("*.jsonl.gz")
+    with gzip.open(path, "rt") as f:
+        assert json.loads(f.readline())["dedupe_key"] == "TEST:SPOT:OLD"
+
+
+def test_key_hash_is_stable_8_bytes():
+    h = key_hash("GATE:SPOT:ABC")
+    assert h == key_hash("GATE:SPOT:ABC") and -2**63 <= h < 2**63 and h != key_hash("GATE:SPOT:ABD")
+
+
+def test_index_warms_from_archived_first_alerts(tmp_path, make_listing):
+    bot = SimpleNamespace(_default_chat_id="1")
+
+    async def run():
+        sm = await init_db(f"sqlite+aiosqlite:///{tmp_path}/w.db")
+        async with sm() as db:
+            await handle_listing(bot, db, make_listing("ABC", exchange="GATE"))
+            await handle_listing(bot, db, make_listing("ABC", exchange="GATE", dedupe_key="GATE:SPOT:ABC:SUSPENDED:1"))
+            await db.execute(update(SeenItem).values(seen_at=now_utc() - timedelta(days=10), provisional=False))
+            await db.execute(update(OutboxItem).values(status="sent"))
+            await db.commit()
+        moved = await Archive(sm, tmp_path / "archive").run_once(after_days=7, vacuum=False)
+        idx = SymbolIndex()   # a restart
+        warmed = await idx.warm(sm)
+        return moved, warmed, idx
+
+    moved, warmed, idx = asyncio.run(run())
+    assert moved == 2 and warmed == 1     # status-event keys are not first alerts
+    line = cross_line(idx.others("ABC", "MEXC", "SPOT"), now_utc())
+    assert line.startswith("🌐 Already on: GATE SPOT (240h") and line.endswith("first: GATE SPOT")
@@ -0,0 +1,56 @@
+from app.breaker import CircuitBreaker, retry_after_seconds, CLOSED, OPEN, HALF_OPEN
+
+
+class _Resp:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = _Resp(status_code, headers)
+
+
+class _Clock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def test_opens_after_threshold_then_half_open_and_closes():
+    clock = _Clock()
+    br = CircuitBreaker("T:SPOT", threshold=3, base_delay=2.0, clock=clock, rnd=lambda: 1.0)
+    assert br.failure(RuntimeError("x")) == 0.0
+    assert br.failure(RuntimeError("x")) == 0.0
+    assert br.state == CLOSED
+    cooldown = br.failure(RuntimeError("x"))
+    assert br.state == OPEN and cooldown == 2.0
+    assert br.delay() == 2.0
+
+    clock.t = 2.0
+    assert br.delay() == 0.0 and br.state == HALF_OPEN
+    # failed probe reopens with a longer cooldown
+    assert br.failure(RuntimeError("x")) == 4.0 and br.state == OPEN
+
+    clock.t = 10.0
+    assert br.delay() == 0.0
+    br.success()
+    assert br.state == CLOSED and br.failures == 0 and br.opens == 0
+
+
+def test_429_opens_immediately_and_honours_retry_after():
+    br = CircuitBreaker("T:SPOT", threshold=5, base_delay=1.0, clock=_Clock(), rnd=lambda: 0.0)
+    cooldown = br.failure(_HTTPError(429, {"Retry-After": "30"}))
+    assert br.state == OPEN and cooldown == 30.0
+
+
+def test_retry_after_parsing():
+    assert retry_after_seconds(_HTTPError(500)) is None
+    assert retry_after_seconds(_HTTPError(429)) == 0.0
+    assert retry_after_seconds(_HTTPError(429, {"Retry-After": "7"})) == 7.0
+    assert retry_after_seconds(_HTTPError(429, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0.0
+    assert retry_after_seconds(ValueError("no response")) is None
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta, timezone
+
+from app.clock import ClockSync
+
+
+def test_intervals_intersect_below_rtt():
+    clocks = ClockSync()
+    true_offset = 2.3456
+    # 200 ms round trips; remote stamps at various points inside each
+    for i, frac in enumerate((0.1, 0.9, 0.5, 0.02, 0.97)):
+        t0 = 1000.0 + i * 10
+        remote = t0 + 0.2 * frac + true_offset
+        clocks.observe("X", remote, t0, t0 + 0.2, resolution=0.001)
+    est, err = clocks.offset("X")
+    assert err < 0.05 and abs(est - true_offset) <= err
+
+
+def test_date_header_and_to_local():
+    clocks = ClockSync()
+    clocks.observe_date("X", "not a date", 0, 0)
+    assert clocks.offset("X") is None
+    base = datetime(2026, 10, 21, 7, 28, 5, tzinfo=timezone.utc).timestamp()
+    clocks.observe_date("X", "Wed, 21 Oct 2026 07:28:05 GMT", base - 3.4, base - 3.1)
+    est, err = clocks.offset("X")
+    assert 3.1 <= est <= 4.4 and err < 0.66  # 1 s resolution + 0.3 s RTT
+    remote = datetime(2026, 10, 21, 8, 0, tzinfo=timezone.utc)
+    assert clocks.to_local("X", remote) == remote - timedelta(seconds=est)
+    assert clocks.to_local("UNKNOWN", remote) == remote
+
+
+def test_clock_step_resets_bounds():
+    clocks = ClockSync()
+    clocks.observe("X", 1010.0, 1000.0, 1000.1)
+    clocks.observe("X", 1060.0, 1020.0, 1020.1)  # remote clock jumped by 30 s
+    est, _ = clocks.offset("X")
+    assert 39.8 < est < 40.1
+
+
+def test_detection_latency_end_to_end(tmp_path, monkeypatch):
+    import asyncio
+    import time
+    from types import SimpleNamespace
+
+    from sqlalchemy import select
+
+    import app.outbox as outbox_mod
+    import app.poller as poller_mod
+    import app.reconciler as reconciler_mod
+    from app.exchanges.base import Announcement, PollingAdapter, epoch_seconds
+    from app.outbox import Outbox
+    from app.poller import handle_listing
+    from app.reconciler import reconcile_and_edit
+    from app.store import ListingTiming, Metric, init_db
+    from app.symbol_index import SymbolIndex
+
+    opened_ms = int((time.time() - 2) * 1000)   # the API says trading opened 2 s before we look
+
+    class Venue(PollingAdapter):
+        name, market_type, source_name, trade_url = "TEST", "SPOT", "test API", "https://example/{base}"
+
+        def __init__(self):
+            super().__init__(poll_seconds=0)
+            self.snapshots = [[{"base": "AAA"}], [{"base": "AAA"}, {"base": "NEW", "open": opened_ms},
+                                                  {"base": "OLD"}]]
+
+        async def _fetch(self):
+            return self.snapshots.pop(0)
+
+        def _parse(self, it):
+            return it["base"], True, epoch_seconds(it.get("open"))
+
+    idx = SymbolIndex()
+    for mod in (poller_mod, outbox_mod, reconciler_mod):
+        monkeypatch.setattr(mod, "index", idx)
+    bot = SimpleNamespace(_default_chat_id="1")
+    edits = SimpleNamespace(submit=lambda message_id, text: None)
+
+    async def run():
+        sm = await init_db(f"sqlite+aiosqlite:///{tmp_path}/t.db")
+        outbox = Outbox(bot, sm)
+        venue = Venue()
+        await venue._seed()
+        async with sm() as db:
+            for n, listing in enumerate(await venue.poll(), start=1):
+                await handle_listing(bot, db, listing)
+                t1 = time.time()
+                await outbox._delivered(await outbox._claim(), SimpleNamespace(message_id=n, date=None), t1 - 0.1, t1)
+            # OLD had no API time: the announcement's official time completes its timeline
+            detected = (await db.execute(select(ListingTiming.detected_at)
+                                         .where(ListingTiming.dedupe_key == "TEST:SPOT:OLD"))).scalar()
+            official = detected.replace(tzinfo=timezone.utc) - timedelta(seconds=5)
+            await reconcile_and_edit(bot, db, Announcement(exchange="TEST", market_type="SPOT", symbol="OLD",
+                                                           official_time=official, notice_url="n"), edits)
+            timings = {t.dedupe_key: t.detect_ms for t in (await db.execute(select(ListingTiming))).scalars()}
+            metrics = [m.latency_ms for m in (await db.execute(select(Metric))).scalars()]
+        return timings, metrics
+
+    timings, metrics = asyncio.run(run())
+    assert 1900 <= timings["TEST:SPOT:NEW"] <= 3000
+    assert 4900 <= timings["TEST:SPOT:OLD"] <= 6000
+    assert len(metrics) == 2 and all(m >= 1900 for m in metrics)   # exchange time -> Telegram ack
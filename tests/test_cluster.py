@@ -0,0 +1,218 @@
+import asyncio
+import multiprocessing
+import random
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from sqlalchemy import func, select
+
+from app.cluster import cluster
+from app.outbox import Outbox
+from app.poller import handle_listing
+from app.store import Detection, OutboxItem, SeenItem, init_db
+
+KEYS = 20
+TRANSITIONS = 6   # C0..C5 also change status: trading opens (even) or is suspended (odd)
+
+
+class _FileBot:
+    _default_chat_id = "1"
+
+    def __init__(self, path):
+        self.path = path
+        self.n = 0
+
+    async def send_message(self, chat_id, text, **kw):
+        self.n += 1
+        with open(self.path, "a") as f:
+            f.write(text.replace("\n", " ") + "\n")
+        return SimpleNamespace(message_id=self.n, date=datetime.now(timezone.utc))
+
+
+def _node(node_id, url, sent_file, barrier, listings):
+    cluster.node_id = node_id
+
+    async def main():
+        sm = await init_db(url)
+        await cluster.heartbeat(sm)
+        bot = _FileBot(sent_file)
+        outbox = Outbox(bot, sm, workers=2)
+        worker = asyncio.create_task(outbox.run())
+        random.shuffle(listings)
+        barrier.wait()
+        async with sm() as db:
+            for listing in listings:
+                await handle_listing(bot, db, listing, outbox=outbox)
+        await asyncio.sleep(2)
+        worker.cancel()
+
+    asyncio.run(main())
+
+
+def test_nodes_sharing_a_database_alert_once(tmp_path, make_listing):
+    url = f"sqlite+aiosqlite:///{tmp_path}/shared.db"
+    asyncio.run(init_db(url))  # schema once, before the nodes race
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(3)
+    listings = [make_listing(f"C{i}") for i in range(KEYS)]
+    for i in range(TRANSITIONS):
+        event = "TRADING_OPEN" if i % 2 == 0 else "SUSPENDED"
+        listings.append(make_listing(f"C{i}", event=event, trading=event == "TRADING_OPEN",
+                                     dedupe_key=f"TEST:SPOT:C{i}:{event}"))
+    total = KEYS + TRANSITIONS
+    procs = [ctx.Process(target=_node, args=(f"n{i}", url, tmp_path / f"sent{i}.txt", barrier, listings))
+             for i in range(3)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+        assert p.exitcode == 0
+
+    sent = [line for f in tmp_path.glob("sent*.txt") for line in f.read_text().splitlines()]
+    assert len(sent) == total and all(any(f"C{i}" in s for s in sent) for i in range(KEYS))
+
+    async def check():
+        sm = await init_db(url)
+        async with sm() as db:
+            seen = (await db.execute(select(func.count()).select_from(SeenItem))).scalar()
+            transitions = set((await db.execute(
+                select(SeenItem.dedupe_key).where(SeenItem.dedupe_key.like("%:%:%:%"))
+            )).scalars())
+            statuses = set((await db.execute(select(OutboxItem.status))).scalars())
+            wins = dict((await db.execute(
+                select(Detection.dedupe_key, func.sum(Detection.won)).group_by(Detection.dedupe_key)
+            )).all())
+            sightings = (await db.execute(select(func.count()).select_from(Detection))).scalar()
+        cluster.node_id = "n0"
+        try:
+            stats = await cluster.stats(sm)
+        finally:
+            cluster.node_id = ""
+        return seen, transitions, statuses, wins, sightings, stats
+
+    seen, transitions, statuses, wins, sightings, stats = asyncio.run(check())
+    assert seen == total and statuses == {"sent"}
+    # every node numbered each transition the same way, whenever it saw it
+    assert transitions == {f"TEST:SPOT:C{i}:{'TRADING_OPEN' if i % 2 == 0 else 'SUSPENDED'}:1"
+                           for i in range(TRANSITIONS)}
+    assert len(wins) == total and set(wins.values()) == {1}   # exactly one winner per key
+    assert sightings == 3 * total                               # losers kept their detection time
+    assert set(stats) == {"n0", "n1", "n2"}
+    assert sum(v["won"] for v in stats.values()) == total and all(v["alive"] for v in stats.values())
+
+
+def test_archival_runs_on_leader_with_shared_dir_only(tmp_path, monkeypatch):
+    from datetime import timedelta
+
+    from app.archive import Archive
+    from app.cluster import Cluster
+
+    async def run():
+        sm = await init_db(f"sqlite+aiosqlite:///{tmp_path}/l.db")
+        monkeypatch.setattr(cluster, "node_id", "a")
+        monkeypatch.setattr(cluster, "started_at", cluster.started_at - timedelta(minutes=5))
+        await cluster.heartbeat(sm)
+        await Cluster("b").heartbeat(sm)
+        archive = Archive(sm, tmp_path / "archive_a")
+        local_only = await archive.blocked()
+        archive._marker("b").touch()            # b writes into the same directory: shared
+        shared = await archive.blocked()
+        monkeypatch.setattr(cluster, "node_id", "b")
+        follower = await archive.blocked()
+        return local_only, shared, follower
+
+    local_only, shared, follower = asyncio.run(run())
+    assert "not shared with node(s) b" in local_only
+    assert shared is None
+    assert follower == "archival runs on the leader node a"
+
+
+def test_lost_race_is_not_counted_as_a_win(tmp_path, monkeypatch, make_listing):
+    from app.metrics import counters
+
+    monkeypatch.setattr(cluster, "node_id", "a")
+    monkeypatch.setitem(counters, "cluster.won", 0)
+    monkeypatch.setitem(counters, "cluster.lost", 0)
+    bot = SimpleNamespace(_default_chat_id="1")
+
+    async def run():
+        sm = await init_db(f"sqlite+aiosqlite:///{tmp_path}/c.db")
+        async with sm() as db1, sm() as db2:
+            await handle_listing(bot, db1, make_listing("ABC"))
+            # the pre-check already ran on the other node when this one committed
+            real_execute = db2.execute
+
+            async def stale_precheck(stmt, *a, **kw):
+                res = await real_execute(stmt, *a, **kw)
+                return SimpleNamespace(first=lambda: None) if "seen_items" in str(stmt) else res
+
+            monkeypatch.setattr(db2, "execute", stale_precheck)
+            monkeypatch.setattr(cluster, "node_id", "b")
+            await handle_listing(bot, db2, make_listing("ABC"))
+
+    asyncio.run(run())
+    assert counters["cluster.won"] == 1 and counters["cluster.lost"] == 1
+
+
+def test_follow_up_folds_into_head_posted_by_another_node(tmp_path, monkeypatch, make_listing):
+    import app.outbox as outbox_mod
+    import app.poller as poller_mod
+    from app.symbol_index import SymbolIndex
+
+    monkeypatch.setattr(poller_mod, "GROUP_LISTINGS", True)
+    bot = SimpleNamespace(_default_chat_id="1")
+    edits = SimpleNamespace(submitted={})
+    edits.submit = lambda message_id, text: edits.submitted.__setitem__(message_id, text)
+
+    async def run():
+        sm = await init_db(f"sqlite+aiosqlite:///{tmp_path}/g.db")
+        # node a posts the first alert
+        monkeypatch.setattr(cluster, "node_id", "a")
+        for mod in (poller_mod, outbox_mod):
+            monkeypatch.setattr(mod, "index", SymbolIndex())
+        outbox = Outbox(bot, sm)
+        async with sm() as db:
+            await handle_listing(bot, db, make_listing("ABC", exchange="GATE"))
+        await outbox._delivered(await outbox._claim(), SimpleNamespace(message_id=7, date=None), 0.0, 1.0)
+        # node b: own memory, saw GATE lose its claim, then detects the follow-up first
+        monkeypatch.setattr(cluster, "node_id", "b")
+        for mod in (poller_mod, outbox_mod):
+            monkeypatch.setattr(mod, "index", SymbolIndex())
+        async with sm() as db:
+            await handle_listing(bot, db, make_listing("ABC", exchange="GATE"))
+            await handle_listing(bot, db, make_listing("ABC", exchange="MEXC"), edits=edits)
+            alerts = (await db.execute(select(func.count()).select_from(OutboxItem))).scalar()
+            stored = (await db.execute(select(OutboxItem.text).where(OutboxItem.message_id == 7))).scalar()
+        return alerts, stored
+
+    alerts, stored = asyncio.run(run())
+    assert alerts == 1                                   # no separate alert for MEXC
+    assert stored == edits.submitted[7] and stored.split("\n")[-1].startswith("➕ Also on MEXC SPOT")
+
+
+def test_transition_seen_seconds_apart_is_claimed_once(tmp_path, monkeypatch, make_listing):
+    from datetime import timedelta
+
+    import app.poller as poller_mod
+
+    bot = SimpleNamespace(_default_chat_id="1")
+    start = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+    clock = [start]
+    monkeypatch.setattr(poller_mod, "now_utc", lambda: clock[0])
+
+    def transition(event):
+        return make_listing("ABC", event=event, dedupe_key=f"TEST:SPOT:ABC:{event}")
+
+    async def run():
+        sm = await init_db(f"sqlite+aiosqlite:///{tmp_path}/t.db")
+        async with sm() as db:
+            for node, event, later in [("a", "SUSPENDED", 0), ("b", "SUSPENDED", 3),   # same transition
+                                       ("b", "TRADING_OPEN", 600), ("a", "TRADING_OPEN", 602),
+                                       ("a", "SUSPENDED", 1200)]:                   # a new suspension
+                monkeypatch.setattr(cluster, "node_id", node)
+                clock[0] = start + timedelta(seconds=later)
+                await handle_listing(bot, db, transition(event))
+            return list((await db.execute(select(OutboxItem.dedupe_key).order_by(OutboxItem.id))).scalars())
+
+    assert asyncio.run(run()) == ["TEST:SPOT:ABC:SUSPENDED:1", "TEST:SPOT:ABC:TRADING_OPEN:2",
+                                  "TEST:SPOT:ABC:SUSPENDED:3"]
@@ -0,0 +1,64 @@
+import asyncio
+import os
+import sys
+import types
+
+import app.poller as poller
+from app.config import ExchangeCfg, Settings, load_exchanges
+
+
+class _Idle:
+    instances = []
+
+    def __init__(self, poll_seconds):
+        self.poll_seconds = poll_seconds
+        _Idle.instances.append(self)
+
+    async def stream(self):
+        while True:
+            await asyncio.sleep(0.01)
+            if False:
+                yield
+
+
+def _write(path, body):
+    # bump mtime explicitly: coarse filesystem timestamps could hide a quick rewrite
+    mtime = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text("exchanges:\n" + body)
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+
+def test_reload_starts_stops_and_retunes_only_changed(tmp_path, monkeypatch):
+    for name in ("fake_a", "fake_b"):
+        mod = types.ModuleType(name)
+        mod.Adapter = _Idle
+        monkeypatch.setitem(sys.modules, name, mod)
+    cfg = tmp_path / "exchanges.yaml"
+    _write(cfg, "  - {name: A, module: fake_a, poll_seconds: 1}\n")
+    monkeypatch.setattr(poller, "EXCHANGES_FILE", str(cfg))
+    monkeypatch.setattr(poller, "CONFIG_WATCH_SEC", 0.02)
+    settings = Settings(BOT_TOKEN="", TARGET_CHAT_ID="", exchanges=load_exchanges(str(cfg)))
+
+    async def step(body):
+        _write(cfg, body)
+        await asyncio.sleep(0.1)
+
+    async def run():
+        task = asyncio.create_task(poller.run_all(settings, None, lambda: None))
+        await asyncio.sleep(0.05)
+        first = _Idle.instances[-1]
+        await step("  - {name: A, module: fake_a, poll_seconds: 5}\n  - {name: B, module: fake_b}\n")
+        retuned = first.poll_seconds
+        started = len(_Idle.instances)
+        await step("  - {name: A, module: fake_a, poll_seconds: 5}\n  - {name: B, module: fake_b, enabled: false}\n")
+        await step("  - {name: A, module: [broken\n")   # rejected, nothing changes
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return retuned, started
+
+    _Idle.instances.clear()
+    retuned, started = asyncio.run(run())
+    assert retuned == 5            # same instance, retuned in place
+    assert started == 2            # only B was created on reload
+    assert [ex.enabled for ex in settings.exchanges] == [True, False]
+    assert isinstance(settings.exchanges[0], ExchangeCfg)
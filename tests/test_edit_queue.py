@@ -0,0 +1,53 @@
+import asyncio
+
+from app.edit_queue import EditQueue
+
+
+class _Bot:
+    _default_chat_id = "-100"
+
+    def __init__(self, fail_with=None):
+        self.edits = []
+        self.fail_with = fail_with
+
+    async def edit_message_text(self, chat_id, message_id, text, **kw):
+        if self.fail_with:
+            exc, self.fail_with = self.fail_with, None
+            raise exc
+        self.edits.append((message_id, text))
+
+
+async def _drain(q: EditQueue, seconds: float = 0.2):
+    task = asyncio.create_task(q.run())
+    await asyncio.sleep(seconds)
+    task.cancel()
+
+
+def test_merges_per_message_and_skips_identical_text():
+    bot = _Bot()
+
+    async def run():
+        q = EditQueue(bot, window=0.05, min_interval=0)
+        q.submit(1, "v1")
+        q.submit(1, "v2")      # merged: last text wins
+        q.submit(2, "other")
+        await _drain(q)
+        q.submit(1, "v2")      # same hash as last sent -> skipped
+        await _drain(q)
+
+    asyncio.run(run())
+    assert sorted(bot.edits) == [(1, "v2"), (2, "other")]
+
+
+def test_not_modified_error_is_absorbed():
+    bot = _Bot(fail_with=RuntimeError("Bad Request: message is not modified"))
+
+    async def run():
+        q = EditQueue(bot, window=0, min_interval=0)
+        q.submit(7, "same")
+        await _drain(q, 0.05)
+        q.submit(7, "same")
+        await _drain(q, 0.05)
+
+    asyncio.run(run())
+    assert bot.edits == []
@@ -0,0 +1,49 @@
+import time
+from types import SimpleNamespace
+
+from app.utils.logging import LogTail, Sampler, _json_format
+
+
+def _record(line=1, key=None, level=40, message="boom"):
+    return {"level": SimpleNamespace(no=level, name="ERROR"), "name": "app.x", "line": line,
+            "extra": {"key": key} if key else {}, "message": message, "exception": object()}
+
+
+def test_sampler_bounds_repeated_errors_per_key():
+    sampler = Sampler(burst=2, window=0.05)
+    records = [_record(key="GATE") for _ in range(5)]
+    for r in records:
+        sampler(r)
+    assert [bool(r["extra"].get("_drop")) for r in records] == [False, False, True, True, True]
+    assert records[0]["exception"] is not None and records[1]["exception"] is None  # one traceback per window
+
+    other = _record(key="MEXC")
+    sampler(other)
+    assert not other["extra"].get("_drop")        # another exchange is not muted
+    info = _record(level=20)
+    for _ in range(5):
+        sampler(info)
+    assert not info["extra"].get("_drop")         # INFO is never sampled
+
+    time.sleep(0.06)
+    r = _record(key="GATE")
+    sampler(r)
+    assert r["extra"]["suppressed"] == 3 and r["message"].endswith("(+3 suppressed)")
+    assert sampler.suppressed == 3
+
+
+def test_tail_and_json_format():
+    tail = LogTail(size=3)
+    for i, no in enumerate((20, 40, 20, 30)):
+        rec = {"time": SimpleNamespace(timestamp=lambda: 0.0), "level": SimpleNamespace(no=no, name="X"),
+               "message": f"m{i}", "exception": None}
+        tail.write(SimpleNamespace(record=rec))
+    assert [e["msg"] for e in tail.recent(10)] == ["m1", "m2", "m3"]
+    assert [e["msg"] for e in tail.recent(1, min_level=30)] == ["m3"]
+
+    rec = {"time": SimpleNamespace(timestamp=lambda: 1.5), "level": SimpleNamespace(name="INFO"), "message": "Sent X",
+           "name": "app.outbox", "function": "_delivered", "line": 9, "exception": None,
+           "extra": {"symbol": "X", "_drop": False}}
+    assert _json_format(rec) == "{extra[_json]}\n"
+    assert rec["extra"]["_json"] == ('{"ts": 1.5, "level": "INFO", "msg": "Sent X", '
+                                     '"src": "app.outbox:_delivered:9", "symbol": "X"}')
@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+import pytest
+
+from app.loopmon import LoopMonitor
+
+
+def _block_until(cond, timeout: float = 5.0) -> None:
+    """Hold the loop thread (a synchronous call inside a coroutine step) until cond() holds."""
+    deadline = time.monotonic() + timeout
+    while not cond() and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+@pytest.mark.parametrize("started_before_monitor", [True, False])
+def test_blocked_loop_is_attributed_to_the_task(started_before_monitor):
+    monitor = LoopMonitor(interval=0.01, slow_ms=50)
+
+    async def blocking_step(go: asyncio.Event):
+        await go.wait()
+        _block_until(lambda: monitor._culprit is not None)   # released once the watchdog has looked
+
+    async def run():
+        go = asyncio.Event()
+        if started_before_monitor:
+            asyncio.create_task(blocking_step(go), name="[ADAPTER] TEST:SPOT")
+        mon = asyncio.create_task(monitor.run(), name="[LOOPMON]")
+        await asyncio.sleep(0)   # monitor installs its task factory
+        if not started_before_monitor:
+            asyncio.create_task(blocking_step(go), name="[ADAPTER] TEST:SPOT")
+        await asyncio.sleep(0)
+        inventory = monitor.inventory()
+        go.set()
+        deadline = time.monotonic() + 5
+        while not monitor.slow and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        mon.cancel()
+        return inventory
+
+    inventory = asyncio.run(run())
+    assert inventory["[ADAPTER]"] == 1 and inventory["[LOOPMON]"] == 1
+    _, ms, task, where = monitor.slow[0]
+    assert ms >= 50 and task == "[ADAPTER] TEST:SPOT" and "blocking_step" in where
+    assert monitor.snapshot()["max_ms"] >= 50
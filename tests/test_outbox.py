@@ -0,0 +1,110 @@
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from sqlalchemy import select
+
+import app.outbox as outbox_mod
+from app.outbox import Outbox
+from app.poller import handle_listing
+from app.store import ListingTiming, SeenItem, init_db
+
+
+class _FlakyBot:
+    _default_chat_id = "1"
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.sent = []
+
+    async def send_message(self, chat_id, text, **kw):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("network down")
+        self.sent.append(text)
+        return SimpleNamespace(message_id=len(self.sent), date=datetime.now(timezone.utc))
+
+
+def test_alert_survives_failed_send_and_is_claimed_once(tmp_path, monkeypatch, make_listing):
+    monkeypatch.setattr(outbox_mod, "retry_delay", lambda attempts: 0.05)
+    bot = _FlakyBot(failures=1)
+
+    async def run():
+        sm = await init_db(f"sqlite+aiosqlite:///{tmp_path}/outbox.db")
+        outbox = Outbox(bot, sm, workers=2)
+        async with sm() as db:
+            await handle_listing(bot, db, make_listing("ABC"), outbox=outbox)
+            await handle_listing(bot, db, make_listing("ABC"), outbox=outbox)  # duplicate
+        task = asyncio.create_task(outbox.run())
+        await asyncio.sleep(1.5)
+        task.cancel()
+        async with sm() as db:
+            message_id = (await db.execute(select(SeenItem.message_id))).scalar_one()
+            timing = (await db.execute(select(ListingTiming))).scalar_one()
+        return await outbox.backlog(), message_id, timing
+
+    backlog, message_id, timing = asyncio.run(run())
+    assert backlog == {"sent": 1}
+    assert len(bot.sent) == 1 and message_id == 1
+    assert timing.ack_at is not None and timing.deliver_ms >= 0 and timing.exchange_at is None
+
+
+def test_row_is_marked_sent_when_bookkeeping_fails(tmp_path, monkeypatch, make_listing):
+    monkeypatch.setattr(outbox_mod, "retry_delay", lambda attempts, **kw: 0.01)
+    bot = _FlakyBot(failures=0)
+
+    async def run():
+        sm = await init_db(f"sqlite+aiosqlite:///{tmp_path}/outbox.db")
+        broken = {"sessions": 0}
+
+        def sessions():
+            if broken["sessions"]:           # the first fresh-session retry fails too
+                broken["sessions"] -= 1
+                raise RuntimeError("database is locked")
+            return sm()
+
+        outbox = Outbox(bot, sessions, workers=1)
+
+        async def delivered(*a):
+            broken["sessions"] = 1
+            raise RuntimeError("db hiccup")
+
+        monkeypatch.setattr(outbox, "_delivered", delivered)
+        async with sm() as db:
+            await handle_listing(bot, db, make_listing("ABC"), outbox=outbox)
+        task = asyncio.create_task(outbox.run())
+        await asyncio.sleep(1.0)
+        task.cancel()
+        async with sm() as db:
+            message_id = (await db.execute(select(SeenItem.message_id))).scalar_one()
+        return await outbox.backlog(), message_id
+
+    backlog, message_id = asyncio.run(run())
+    # not left 'sending' (which a restart would resend), and sent exactly once
+    assert backlog == {"sent": 1} and message_id == 1 and len(bot.sent) == 1
+
+
+def test_notify_during_claim_is_not_lost(monkeypatch):
+    monkeypatch.setattr(outbox_mod, "OUTBOX_IDLE_SEC", 30)
+    outbox = Outbox(_FlakyBot(failures=0), None)
+    claims = []
+
+    async def claim():
+        claims.append(asyncio.get_running_loop().time())
+        if len(claims) == 1:
+            outbox.notify()   # handle_listing enqueues while the claim query is in flight
+        await asyncio.sleep(0)
+        return None
+
+    monkeypatch.setattr(outbox, "_claim", claim)
+
+    async def run():
+        worker = asyncio.create_task(outbox._worker(0))
+        for _ in range(100):
+            if len(claims) > 1:
+                break
+            await asyncio.sleep(0.01)
+        worker.cancel()
+
+    asyncio.run(run())
+    assert len(claims) > 1 and claims[1] - claims[0] < 1
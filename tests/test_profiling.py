@@ -0,0 +1,49 @@
+import asyncio
+import multiprocessing
+
+from app import profiling
+
+
+def _busy_process(profile_dir, ready):
+    profiling.PROFILE_DIR = profile_dir
+
+    async def main():
+        watcher = asyncio.create_task(profiling.watch())
+        ready.set()
+        end = asyncio.get_running_loop().time() + 4
+        while asyncio.get_running_loop().time() < end:
+            sum(i * i for i in range(20_000))
+            await asyncio.sleep(0)
+        watcher.cancel()
+
+    asyncio.run(main())
+
+
+def test_profile_request_is_served_by_every_process(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path)
+    ctx = multiprocessing.get_context("spawn")
+    ready = ctx.Event()
+    other = ctx.Process(target=_busy_process, args=(tmp_path, ready))
+    other.start()
+    assert ready.wait(30)
+
+    async def run():
+        watcher = asyncio.create_task(profiling.watch())
+        await asyncio.sleep(0.5)
+        session = profiling.request(1.0)
+        await asyncio.sleep(3.2)
+        watcher.cancel()
+        return session
+
+    session = asyncio.run(run())
+    other.join()
+    stats, processes, path = profiling.merge(session)
+    assert processes == 2 and path.exists()
+    assert any("genexpr" in row for row in profiling.top(stats, 30))
+
+
+def test_session_ids_are_unique_within_a_second(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path)
+    monkeypatch.setattr(profiling.time, "strftime", lambda fmt: "20261019-120000")
+    first, second = profiling.request(1.0), profiling.request(1.0)
+    assert first != second and first.startswith("20261019-120000-")
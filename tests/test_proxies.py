@@ -0,0 +1,178 @@
+import asyncio
+from urllib.parse import urlsplit
+
+import httpx
+
+import app.exchanges.base as base
+from app.exchanges.base import PollingAdapter
+from app.loadtest.mock_server import VENUES, MockExchange
+from app.proxies import ProxyPool
+
+
+class _StandInProxy:
+    """Local forward proxy: absolute-form HTTP requests and CONNECT (health checks only)."""
+
+    def __init__(self):
+        self.requests = 0
+        self._server = None
+
+    async def _handle(self, reader, writer):
+        upstream = None
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                method, target, _ = head.split(b"\r\n", 1)[0].decode().split(" ", 2)
+                if method == "CONNECT":
+                    writer.write(b"HTTP/1.1 200 Connection established\r\n\r\n")
+                    await writer.drain()
+                    return
+                self.requests += 1
+                u = urlsplit(target)
+                if upstream is None:
+                    upstream = await asyncio.open_connection(u.hostname, u.port)
+                up_reader, up_writer = upstream
+                path = u.path + (f"?{u.query}" if u.query else "")
+                up_writer.write(head.replace(target.encode(), path.encode(), 1))
+                await up_writer.drain()
+                resp = await up_reader.readuntil(b"\r\n\r\n")
+                length = next(int(line.split(b":", 1)[1]) for line in resp.split(b"\r\n")
+                              if line.lower().startswith(b"content-length:"))
+                writer.write(resp + await up_reader.readexactly(length))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            if upstream is not None:
+                upstream[1].close()
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self._server.sockets[0].getsockname()[1]}"
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+
+def _adapter(url):
+    class Gate(PollingAdapter):
+        name = "GATE"
+        endpoint = url
+
+        async def _fetch(self):
+            async with httpx.AsyncClient(timeout=5) as cx:
+                return (await self._get(cx, url)).json()
+
+        def _parse(self, it):
+            return it["id"].split("_", 1)[0], True
+
+    return Gate(poll_seconds=0)
+
+
+def test_requests_rotate_over_proxies_with_own_budgets(monkeypatch):
+    async def run():
+        mock = MockExchange(scale=0.01, latency_ms=0, jitter_ms=0)
+        url = f"http://127.0.0.1:{await mock.start()}{VENUES['gate_spot'][0]}"
+        proxies = [_StandInProxy(), _StandInProxy()]
+        pool = ProxyPool([await p.start() for p in proxies])
+        monkeypatch.setattr(base, "pool", pool)
+        ad = _adapter(url)
+        for _ in range(4):
+            await ad._fetch()
+        keys = set(base.budget.snapshot())
+        await pool.aclose()
+        for p in proxies:
+            await p.close()
+        await mock.close()
+        return proxies, pool, keys
+
+    proxies, pool, keys = asyncio.run(run())
+    assert [p.requests for p in proxies] == [2, 2]
+    assert all(v["requests"] == 2 and v["latency_ms"] is not None for v in pool.snapshot().values())
+    assert {f"GATE@{label}" for label in pool.snapshot()} <= keys
+
+
+def test_dead_proxy_is_ejected_and_health_checked():
+    async def run():
+        live = _StandInProxy()
+        live_url = await live.start()
+        dead = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+        dead_url = f"http://127.0.0.1:{dead.sockets[0].getsockname()[1]}"
+        dead.close()
+        await dead.wait_closed()
+
+        pool = ProxyPool([live_url, dead_url], eject_after=2)
+        dead_proxy = pool.proxies[1]
+        checks = [await pool.check(p, target="example.com:443") for p in pool.proxies]
+        checks.append(await pool.check(dead_proxy, target="example.com:443"))
+        picks = {pool.pick().label for _ in range(4)}
+        await live.close()
+        return pool, checks, picks
+
+    pool, checks, picks = asyncio.run(run())
+    assert checks == [True, False, False]
+    assert pool.snapshot()[pool.proxies[1].label]["state"] == "ejected"
+    assert picks == {pool.proxies[0].label}
+
+
+def test_latency_mode_spills_over_when_fastest_budget_is_spent(monkeypatch):
+    import app.proxies as proxies_mod
+    from app.ratelimit import RateBudget
+
+    async def run():
+        mock = MockExchange(scale=0.01, latency_ms=0, jitter_ms=0)
+        url = f"http://127.0.0.1:{await mock.start()}{VENUES['gate_spot'][0]}"
+        proxies = [_StandInProxy(), _StandInProxy()]
+        pool = ProxyPool([await p.start() for p in proxies], strategy="latency")
+        pool.proxies[0].latency_ms, pool.proxies[1].latency_ms = 1.0, 50.0
+        # 5 requests/s per egress IP, burst 5
+        monkeypatch.setattr(proxies_mod, "budget", RateBudget({"TST": (5, 1.0)}, safety=1.0))
+        loop = asyncio.get_running_loop()
+        t0 = loop.time()
+        for _ in range(20):
+            r, _ = await pool.get(url, "TST")
+            r.raise_for_status()
+        elapsed = loop.time() - t0
+        await pool.aclose()
+        for p in proxies:
+            await p.close()
+        await mock.close()
+        return proxies, elapsed
+
+    proxies, elapsed = asyncio.run(run())
+    # one bucket alone: 5 burst + 15 at 5/s = 3 s; both: 10 burst + 10 at 10/s = 1 s
+    assert elapsed < 2.0
+    assert proxies[0].requests >= 10 and proxies[1].requests >= 5
+
+
+def test_exchange_errors_do_not_eject_proxies(monkeypatch):
+    pool = ProxyPool(["http://10.0.0.2:3128", "http://user:pw@10.0.0.3"], strategy="latency", eject_after=1)
+    failures = iter([httpx.ReadTimeout("exchange slow"), httpx.ConnectError("proxy unreachable")])
+
+    def respond(request):
+        if request.url.path == "/5xx":
+            return httpx.Response(503)
+        raise next(failures)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+    monkeypatch.setattr(pool, "client", lambda proxy: client)
+
+    async def run():
+        r, _ = await pool.get("http://exchange/5xx", "TEST")
+        errors = []
+        for _ in range(2):
+            try:
+                await pool.get("http://exchange/x", "TEST")
+            except httpx.HTTPError as e:
+                errors.append(type(e).__name__)
+        await client.aclose()
+        return r.status_code, errors
+
+    status, errors = asyncio.run(run())
+    assert status == 503 and errors == ["ReadTimeout", "ConnectError"]
+    snap = pool.snapshot()
+    # the 503 and the read timeout were the exchange's; only the failed hop to the proxy counts
+    assert sum(v["state"] == "ejected" for v in snap.values()) == 1
+    assert sum(v["errors"] for v in snap.values()) == 1 and sum(v["requests"] for v in snap.values()) == 3
+    assert list(snap) == ["10.0.0.2:3128", "10.0.0.3:80"]   # scheme default port, no credentials
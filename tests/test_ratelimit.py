@@ -0,0 +1,97 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+
+import app.ratelimit as ratelimit
+from app.ratelimit import RateBudget, _parse_limits
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _fake_sleep(monkeypatch, clock, log):
+    real_sleep = asyncio.sleep
+
+    async def sleep(seconds):
+        log.append(seconds)
+        clock.now += seconds
+        await real_sleep(0)
+
+    monkeypatch.setattr(ratelimit, "asyncio", SimpleNamespace(sleep=sleep))
+
+
+def test_tokens_refill_at_the_safe_rate(monkeypatch):
+    clock, slept = _Clock(), []
+    _fake_sleep(monkeypatch, clock, slept)
+    budget = RateBudget({"X": (10, 1)}, safety=0.5, clock=clock)   # 5/s, burst 5
+
+    async def run():
+        for _ in range(5):
+            await budget.acquire("X")               # the burst goes through without waiting
+        assert slept == [] and abs(budget.wait_time("X") - 0.2) < 1e-9
+        await budget.acquire("X")                   # then one token per 0.2 s
+        clock.now += 0.5
+        partial = budget.wait_time("X", cost=5)     # 2.5 tokens back, 2.5 short
+        clock.now += 10
+        return partial, budget.wait_time("X", cost=5)
+
+    partial, full = asyncio.run(run())
+    assert abs(sum(slept) - 0.2) < 1e-9
+    assert abs(partial - 0.5) < 1e-9 and full == 0.0   # refill is capped at the burst size
+    budget.register("X")
+    budget.register("X")
+    assert budget.interval("X") == 0.4   # two pollers sharing 5/s
+    assert _parse_limits("GATE=200/10, x.com=5") == {"GATE": (200.0, 10.0), "x.com": (5.0, 1.0)}
+
+
+def test_limits_learned_from_headers():
+    clock = _Clock()
+    budget = RateBudget({"GATE": (200, 10)}, safety=0.5, clock=clock)
+    budget.register("GATE")
+    assert budget.interval("GATE") == 0.1   # 200/10s at half safety: 10 req/s
+    budget.observe("GATE", {"X-Gate-RateLimit-Limit": "100", "X-Gate-RateLimit-Requests-Remain": "4"}, 200)
+    snap = budget.snapshot()["GATE"]
+    assert snap["limit"] == "100/10s" and snap["interval"] == 0.2
+    assert snap["tokens"] == 2.0      # remaining quota, scaled by the safety factor
+
+
+def test_retry_after_forms():
+    budget = RateBudget({"GATE": (200, 10)}, safety=0.5, clock=_Clock())
+    budget.observe("GATE", {"Retry-After": "1.5"}, 429)
+    assert budget.snapshot()["GATE"]["paused"] == 1.5
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    budget.observe("BINGX", {"Retry-After": format_datetime(when, usegmt=True)}, 429)
+    assert 28 <= budget.snapshot()["BINGX"]["paused"] <= 30
+    budget.observe("MEXC", {"Retry-After": "soon"}, 429)   # unparseable: the whole window
+    assert budget.snapshot()["MEXC"]["paused"] == budget._bucket("MEXC").window
+
+
+def test_429_pauses_every_poller_sharing_the_key(monkeypatch):
+    clock, slept = _Clock(), []
+    _fake_sleep(monkeypatch, clock, slept)
+    budget = RateBudget({"GATE": (200, 10)}, safety=0.5, clock=clock)
+    # per-proxy buckets of the same exchange are separate IPs: not paused
+    other_ip = "GATE@10.0.0.2:3128"
+
+    async def run():
+        start = clock.now
+        budget.observe("GATE", {"Retry-After": "7"}, 429)
+        assert budget.wait_time(other_ip) == 0.0
+        done = []
+
+        async def poller(name):
+            await budget.acquire("GATE")
+            done.append((name, clock.now - start))
+
+        await asyncio.gather(poller("spot"), poller("futures"))
+        return done
+
+    done = asyncio.run(run())
+    assert {name for name, _ in done} == {"spot", "futures"}
+    assert all(t >= 7.0 for _, t in done)
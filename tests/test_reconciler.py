@@ -0,0 +1,97 @@
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from sqlalchemy import select
+
+import app.outbox as outbox_mod
+import app.poller as poller_mod
+import app.reconciler as reconciler_mod
+from app.exchanges.base import Announcement
+from app.outbox import Outbox
+from app.poller import handle_listing
+from app.reconciler import reconcile_and_edit
+from app.store import OutboxItem, init_db
+from app.symbol_index import SymbolIndex
+
+
+class _Edits:
+    def __init__(self):
+        self.submitted = {}
+
+    def submit(self, message_id, text):
+        self.submitted[message_id] = text
+
+
+def test_reconcile_keeps_grouped_head_text(tmp_path, monkeypatch, make_listing):
+    idx = SymbolIndex()
+    for mod in (poller_mod, outbox_mod, reconciler_mod):
+        monkeypatch.setattr(mod, "index", idx)
+    monkeypatch.setattr(poller_mod, "GROUP_LISTINGS", True)
+    bot = SimpleNamespace(_default_chat_id="1")
+    edits = _Edits()
+    official = datetime(2026, 10, 20, 12, 0, tzinfo=timezone.utc)
+
+    async def run():
+        sm = await init_db(f"sqlite+aiosqlite:///{tmp_path}/r.db")
+        outbox = Outbox(bot, sm)
+        async with sm() as db:
+            await handle_listing(bot, db, make_listing("ABC", exchange="GATE", trading=False))
+            row = await outbox._claim()
+            await outbox._delivered(row, SimpleNamespace(message_id=7, date=None), 0.0, 1.0)
+            await handle_listing(bot, db, make_listing("ABC", exchange="MEXC"), edits=edits)
+            folded = edits.submitted[7]
+            ann = Announcement(exchange="GATE", market_type="SPOT", symbol="ABC", official_time=official,
+                               notice_url="n")
+            await reconcile_and_edit(bot, db, ann, edits)
+            stored = (await db.execute(select(OutboxItem.text).where(OutboxItem.message_id == 7))).scalar()
+            # a later follow-up folds into the reconciled text, not the pre-reconcile one
+            await handle_listing(bot, db, make_listing("ABC", exchange="KUCOIN"), edits=edits)
+        return folded, stored
+
+    folded, stored = asyncio.run(run())
+    assert "➕ Also on MEXC SPOT" in folded
+    lines = stored.split("\n")
+    assert lines[0].endswith("(trading not open yet)")                  # event header kept
+    assert any(l.startswith("🥇 First listing") for l in lines)          # cross line kept
+    assert "⏱️ Start: 2026-10-20 12:00 UTC (2026-10-20 15:00 Europe/Kyiv)" in lines
+    assert lines[-1].startswith("➕ Also on MEXC SPOT")                  # follow-up kept
+    assert edits.submitted[7].startswith(stored + "\n➕ Also on KUCOIN SPOT")
+
+
+class _Feed:
+    def __init__(self, fail_first: int, item=None):
+        self.fail_first = fail_first
+        self.item = item
+        self.streams = 0
+
+    async def stream(self):
+        self.streams += 1
+        if self.streams <= self.fail_first:
+            raise RuntimeError("feed down")
+        if self.item is not None:
+            yield self.item
+        await asyncio.Event().wait()   # a quiet feed
+
+
+def test_fallback_hands_back_to_the_recovered_primary():
+    ann = Announcement(exchange="GATE", market_type="SPOT", symbol="ABC",
+                       official_time=datetime(2026, 10, 20, tzinfo=timezone.utc), notice_url="n")
+    primary, fallback = _Feed(fail_first=1, item=ann), _Feed(fail_first=0)
+    handled = []
+
+    async def handle(a):
+        handled.append(a)
+
+    async def run():
+        task = asyncio.create_task(reconciler_mod.follow_chain("GATE", [primary, fallback], handle, 1,
+                                                               primary_retry_sec=0.05))
+        for _ in range(200):
+            if handled:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+
+    asyncio.run(run())
+    assert handled == [ann]
+    assert primary.streams == 2 and fallback.streams == 1
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from app.config import ExchangeCfg
+from app.exchanges.spec import SPECS, AdapterSpec, adapter_for, compile_extractor, resolve
+from app.poller import _build
+
+
+def test_builtin_specs_extract_usdt_pairs():
+    binance = {"symbols": [
+        {"baseAsset": "BTC", "quoteAsset": "USDT", "status": "TRADING"},
+        {"baseAsset": "NEW", "quoteAsset": "USDT", "status": "PRE_TRADING"},
+        {"baseAsset": "ETH", "quoteAsset": "BTC", "status": "TRADING"},
+    ]}
+    assert compile_extractor(SPECS["binance_spot"])(binance) == [("BTC", True), ("NEW", False)]
+
+    okx = {"data": [{"ctValCcy": "SOL", "settleCcy": "USDT", "state": "preopen", "listTime": "1792411200000"},
+                    {"ctValCcy": "BTC", "settleCcy": "USD", "state": "live"}]}
+    assert compile_extractor(SPECS["okx_futures"])(okx) == [("SOL", False, 1792411200.0)]   # list time, ms -> s
+
+    mexc = {"data": [{"baseCoin": "PEPE", "settleCoin": "USDT", "state": 0}]}
+    assert compile_extractor(SPECS["mexc_futures"])(mexc) == [("PEPE", True)]
+
+    bybit = {"result": {"list": [
+        {"baseCoin": "ARB", "settleCoin": "USDT", "contractType": "LinearPerpetual", "status": "Trading"},
+        {"baseCoin": "ARB", "settleCoin": "USDT", "contractType": "LinearFutures", "status": "Trading"},
+    ]}}
+    assert compile_extractor(SPECS["bybit_futures"])(bybit) == [("ARB", True, None)]
+    assert compile_extractor(SPECS["bybit_spot"])({"result": None}) == []
+
+
+def test_inline_spec_with_symbol_suffix():
+    spec = resolve({"endpoint": "https://x", "items": "data", "symbol": "id", "suffix": "_USDT"}, "FOO")
+    extract = compile_extractor(spec)
+    assert extract({"data": [{"id": "ABC_USDT"}, {"id": "ABC_BTC"}, {"id": "_USDT"}]}) == [("ABC", True)]
+    with pytest.raises(ValueError):
+        compile_extractor(AdapterSpec(endpoint="https://x"))
+
+
+def test_spec_adapter_polls_like_hand_written():
+    cls = adapter_for(SPECS["okx_spot"])
+    docs = [
+        {"data": [{"baseCcy": "BTC", "quoteCcy": "USDT", "state": "live"}]},
+        {"data": [{"baseCcy": "BTC", "quoteCcy": "USDT", "state": "live"},
+                  {"baseCcy": "NEW", "quoteCcy": "USDT", "state": "preopen"}]},
+    ]
+
+    class Scripted(cls):
+        async def _fetch(self):
+            return docs.pop(0)
+
+    ad = Scripted(poll_seconds=0)
+
+    async def run():
+        await ad._seed()
+        return await ad.poll()
+
+    (listing,) = asyncio.run(run())
+    assert (listing.exchange, listing.market_type, listing.symbol, listing.trading) == ("OKX", "SPOT", "NEW", False)
+    assert listing.source_url == "https://www.okx.com/trade-spot/NEW-USDT"
+
+
+def test_config_entry_builds_spec_adapter():
+    ex = ExchangeCfg(name="BYBIT", spec="bybit_spot", poll_seconds=3)
+    cfg, _, adapter = _build(ex)
+    assert ex.key == "spec:bybit_spot"
+    assert adapter.label == "BYBIT:SPOT" and adapter.poll_seconds == 3
@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+import app.store as store
+from app.exchanges.base import PollingAdapter
+from app.metrics import StartupTimeline
+
+
+def test_schema_version_skips_create_all(tmp_path, monkeypatch):
+    calls = []
+    create_all = store.Base.metadata.create_all
+    monkeypatch.setattr(store.Base.metadata, "create_all", lambda conn: (calls.append(1), create_all(conn)))
+    url = f"sqlite+aiosqlite:///{tmp_path}/s.db"
+
+    asyncio.run(store.init_db(url))
+    asyncio.run(store.init_db(url))
+    assert len(calls) == 1                       # second start: one SELECT, no create_all
+    monkeypatch.setattr(store, "SCHEMA_VERSION", store.SCHEMA_VERSION + 1)
+    asyncio.run(store.init_db(url))
+    assert len(calls) == 2
+
+
+def test_timeline_phases_and_readiness(tmp_path, monkeypatch):
+    ready_file = tmp_path / "ready"
+    monkeypatch.setenv("READY_FILE", str(ready_file))
+    tl = StartupTimeline()
+    with tl.phase("db"):
+        time.sleep(0.01)
+    with tl.phase("seed"):
+        pass
+    tl.expect(["GATE:SPOT", "MEXC:SPOT"])
+    tl.first_poll("GATE:SPOT")
+    tl.first_poll("GATE:SPOT")
+    assert tl.ready_after is None and not tl.ready.is_set()
+    tl.first_poll("MEXC:SPOT")
+
+    assert [name for name, _, _ in tl.phases] == ["db", "seed"]
+    start, end = tl.phases[0][1:]
+    assert end - start >= 0.01
+    assert tl.ready.is_set() and tl.ready_after >= tl.first_polls["GATE:SPOT"]
+    assert float(ready_file.read_text()) == round(tl.ready_after, 3)
+    assert "first poll   MEXC:SPOT" in tl.summary()
+
+
+class _Snapshots(PollingAdapter):
+    name = "TEST"
+    market_type = "SPOT"
+    source_name = "test API"
+    trade_url = "https://example/{base}"
+
+    def __init__(self, snapshots):
+        super().__init__(poll_seconds=0)
+        self.snapshots = list(snapshots)
+
+    async def _fetch(self):
+        return [{"base": b} for b in self.snapshots.pop(0)]
+
+    def _parse(self, it):
+        return it["base"], True
+
+
+def test_seeded_adapter_does_not_alert_existing_symbols():
+    ad = _Snapshots([["AAA", "BBB"], ["AAA", "BBB", "NEW"]])
+
+    async def run():
+        assert await ad.seed()
+        stream = ad.stream()
+        first = await asyncio.wait_for(stream.__anext__(), 5)
+        await stream.aclose()
+        return first
+
+    first = asyncio.run(run())
+    assert (first.symbol, first.event) == ("NEW", "LISTED")
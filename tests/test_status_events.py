@@ -0,0 +1,96 @@
+import asyncio
+
+from app.exchanges.base import PollingAdapter
+from app.templates import listing_message
+
+
+class _Scripted(PollingAdapter):
+    name = "TEST"
+    market_type = "SPOT"
+    source_name = "test API"
+    trade_url = "https://example/{base}"
+
+    def __init__(self, snapshots):
+        super().__init__(poll_seconds=0)
+        self.snapshots = list(snapshots)
+
+    async def _fetch(self):
+        return self.snapshots.pop(0)
+
+    def _parse(self, it):
+        return it["base"], it["tradable"]
+
+
+def _items(**bases):
+    return [{"base": b, "tradable": t} for b, t in bases.items()]
+
+
+def test_status_transitions_emit_typed_events():
+    ad = _Scripted([
+        _items(AAA=True, BBB=True, CCC=True),              # seed
+        _items(AAA=True, BBB=True, CCC=True, NEW=False),   # NEW listed, not trading
+        _items(AAA=True, BBB=False, CCC=True, NEW=True),   # NEW opens, BBB suspended
+        _items(AAA=True, BBB=True, NEW=True),              # BBB resumes, CCC delisted
+    ])
+    ad.status_dwell = 0  # polls are back to back; hysteresis is covered below
+
+    async def run():
+        await ad._seed()
+        return [await ad.poll() for _ in range(3)]
+
+    first, second, third = asyncio.run(run())
+
+    assert [(e.symbol, e.event, e.trading) for e in first] == [("NEW", "LISTED", False)]
+    assert first[0].dedupe_key == "TEST:SPOT:NEW"
+
+    events = {e.symbol: e for e in second}
+    assert events["NEW"].event == "TRADING_OPEN" and events["NEW"].open_after is not None
+    assert events["NEW"].dedupe_key == "TEST:SPOT:NEW:TRADING_OPEN"   # numbered by handle_listing
+    assert events["BBB"].event == "SUSPENDED"
+
+    assert {(e.symbol, e.event) for e in third} == {("BBB", "TRADING_OPEN"), ("CCC", "DELISTED")}
+    assert next(e for e in third if e.symbol == "BBB").open_after is None
+
+
+def test_flapping_symbol_is_damped(monkeypatch):
+    script = [  # (time, snapshot)
+        (1, _items(AAA=True, BBB=True, NEW=False)),      # NEW listed
+        (2, _items(AAA=True, BBB=True, NEW=True)),       # ... and opens right away
+        (10, _items(AAA=True, BBB=False, NEW=True)),     # BBB starts flapping
+        (20, _items(AAA=True, BBB=True, NEW=True)),
+        (30, _items(AAA=True, BBB=False, NEW=True)),
+        (40, _items(AAA=True, BBB=True, NEW=True)),
+        (400, _items(AAA=True, BBB=True, NEW=True)),     # window over: BBB is trading again
+        (800, _items(AAA=True, BBB=False, NEW=True)),
+        (810, _items(AAA=True, BBB=True, NEW=True)),
+        (820, _items(AAA=True, BBB=False, NEW=True)),
+        (1200, _items(AAA=True, BBB=False, NEW=True)),   # window over: still what was announced
+    ]
+    ad = _Scripted([_items(AAA=True, BBB=True)] + [snap for _, snap in script])
+    ad.status_dwell = 300
+    now = [0]
+    monkeypatch.setattr("app.exchanges.base.time.time", lambda: now[0])
+
+    async def run():
+        await ad._seed()
+        out = []
+        for t, _ in script:
+            now[0] = t
+            out.append([(e.symbol, e.event) for e in await ad.poll()])
+        return out
+
+    polls = asyncio.run(run())
+    assert polls[:3] == [[("NEW", "LISTED")], [("NEW", "TRADING_OPEN")], [("BBB", "SUSPENDED")]]
+    assert polls[3:6] == [[], [], []]                    # flips inside the window are only tracked
+    assert polls[6] == [("BBB", "TRADING_OPEN")]         # then the settled status goes out once
+    assert polls[7:] == [[("BBB", "SUSPENDED")], [], [], []]
+
+
+def test_event_templates():
+    ad = _Scripted([_items(XYZ=False)])
+    listing = asyncio.run(ad.poll())[0]
+    assert "LISTING ALERT (trading not open yet)" in listing_message(listing)
+
+    opened = listing.model_copy(update={"event": "TRADING_OPEN", "trading": True, "open_after": 312})
+    msg = listing_message(opened)
+    assert "TEST SPOT TRADING OPEN" in msg and "Opened 5m 12s after first seen" in msg
@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta, timezone
+
+from app.symbol_index import SymbolIndex, normalize_base
+from app.templates import cross_line
+
+
+def test_normalize_base():
+    assert normalize_base("btc") == "BTC"
+    assert normalize_base("BTC-USDT") == "BTC"
+    assert normalize_base("BTC_USDT") == "BTC"
+    assert normalize_base("XBTUSDTM") == "XBT"
+    assert normalize_base("USDT") == "USDT"
+
+
+def test_first_listed_attribution():
+    t0 = datetime(2025, 10, 18, 12, 0, tzinfo=timezone.utc)
+    idx = SymbolIndex()
+    assert idx.add("KUCOIN", "SPOT", "ABC", t0 + timedelta(minutes=5))
+    assert idx.add("GATE", "SPOT", "ABC", t0)
+    assert not idx.add("GATE", "SPOT", "abc", t0 + timedelta(minutes=9))
+
+    assert idx.first("ABC-USDT") == ("GATE SPOT", t0)
+    others = idx.others("ABC", "BINGX", "FUTURES")
+    assert [v for v, _ in others] == ["GATE SPOT", "KUCOIN SPOT"]
+
+    line = cross_line(others, t0 + timedelta(minutes=10))
+    assert "GATE SPOT (10m 00s ago)" in line and line.endswith("first: GATE SPOT")
+    assert cross_line([], t0).startswith("🥇")